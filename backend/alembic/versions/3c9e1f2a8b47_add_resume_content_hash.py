@@ -0,0 +1,32 @@
+"""add_resume_content_hash_and_analysis_version
+
+Revision ID: 3c9e1f2a8b47
+Revises: 7bb65ff35ff3
+Create Date: 2026-10-18 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1f2a8b47'
+down_revision: Union[str, Sequence[str], None] = '7bb65ff35ff3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('resumes', sa.Column('content_hash', sa.String(), nullable=True))
+    op.add_column('resumes', sa.Column('analysis_version', sa.String(), nullable=True))
+    op.create_index(op.f('ix_resumes_content_hash'), 'resumes', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_resumes_content_hash'), table_name='resumes')
+    op.drop_column('resumes', 'analysis_version')
+    op.drop_column('resumes', 'content_hash')
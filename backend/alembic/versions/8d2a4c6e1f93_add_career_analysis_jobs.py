@@ -0,0 +1,47 @@
+"""add_career_analysis_jobs
+
+Revision ID: 8d2a4c6e1f93
+Revises: 3c9e1f2a8b47
+Create Date: 2026-10-18 14:05:47.218530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2a4c6e1f93'
+down_revision: Union[str, Sequence[str], None] = '3c9e1f2a8b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('career_analysis_jobs',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('target_role', sa.String(), nullable=False),
+    sa.Column('location', sa.String(), nullable=False),
+    sa.Column('resume_text', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('stage_results', sa.JSON(), nullable=True),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_career_analysis_jobs_status'), 'career_analysis_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_career_analysis_jobs_user_id'), 'career_analysis_jobs', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_career_analysis_jobs_user_id'), table_name='career_analysis_jobs')
+    op.drop_index(op.f('ix_career_analysis_jobs_status'), table_name='career_analysis_jobs')
+    op.drop_table('career_analysis_jobs')
@@ -0,0 +1,94 @@
+"""add_interview_messages
+
+Revision ID: b5f7e3d91c20
+Revises: 8d2a4c6e1f93
+Create Date: 2026-10-18 15:41:09.863214
+
+"""
+import uuid
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5f7e3d91c20'
+down_revision: Union[str, Sequence[str], None] = '8d2a4c6e1f93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BACKFILL_BATCH = 500
+
+
+def upgrade() -> None:
+    """Upgrade schema and backfill messages from interview_sessions.chat_history."""
+    messages = op.create_table('interview_messages',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('session_id', sa.String(), nullable=False),
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('role', sa.String(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['interview_sessions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_interview_messages_session_seq', 'interview_messages', ['session_id', 'seq'], unique=True)
+
+    sessions = sa.table(
+        'interview_sessions',
+        sa.column('id', sa.String()),
+        sa.column('chat_history', sa.JSON()),
+        sa.column('created_at', sa.DateTime(timezone=True)),
+    )
+    bind = op.get_bind()
+    rows = []
+    for session_id, history, created_at in bind.execute(
+        sa.select(sessions.c.id, sessions.c.chat_history, sessions.c.created_at)
+        .where(sessions.c.chat_history.isnot(None))
+    ):
+        for seq, msg in enumerate(history or [], start=1):
+            if not isinstance(msg, dict) or msg.get('content') is None:
+                continue
+            rows.append({
+                'id': str(uuid.uuid4()),
+                'session_id': session_id,
+                'seq': seq,
+                'role': msg.get('role') or 'candidate',
+                'content': str(msg['content']),
+                'created_at': created_at or datetime.now(timezone.utc),
+            })
+            if len(rows) >= _BACKFILL_BATCH:
+                op.bulk_insert(messages, rows)
+                rows = []
+    if rows:
+        op.bulk_insert(messages, rows)
+
+
+def downgrade() -> None:
+    """Fold messages back into interview_sessions.chat_history, then drop the table."""
+    bind = op.get_bind()
+    messages = sa.table(
+        'interview_messages',
+        sa.column('session_id', sa.String()),
+        sa.column('seq', sa.Integer()),
+        sa.column('role', sa.String()),
+        sa.column('content', sa.Text()),
+    )
+    sessions = sa.table(
+        'interview_sessions',
+        sa.column('id', sa.String()),
+        sa.column('chat_history', sa.JSON()),
+    )
+    histories: dict[str, list] = {}
+    for session_id, role, content in bind.execute(
+        sa.select(messages.c.session_id, messages.c.role, messages.c.content)
+        .order_by(messages.c.session_id, messages.c.seq)
+    ):
+        histories.setdefault(session_id, []).append({'role': role, 'content': content})
+    for session_id, history in histories.items():
+        bind.execute(sessions.update().where(sessions.c.id == session_id).values(chat_history=history))
+
+    op.drop_index('ix_interview_messages_session_seq', table_name='interview_messages')
+    op.drop_table('interview_messages')
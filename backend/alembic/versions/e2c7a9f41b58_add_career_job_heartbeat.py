@@ -0,0 +1,30 @@
+"""add_career_job_heartbeat
+
+Revision ID: e2c7a9f41b58
+Revises: b5f7e3d91c20
+Create Date: 2026-10-18 20:41:26.507318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c7a9f41b58'
+down_revision: Union[str, Sequence[str], None] = 'b5f7e3d91c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('career_analysis_jobs') as batch_op:
+        batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('career_analysis_jobs') as batch_op:
+        batch_op.drop_column('heartbeat_at')
@@ -0,0 +1,302 @@
+"""
+Agent Execution Pool — runs blocking AutoGen chats off the event loop.
+
+AutoGen's `initiate_chat` / `generate_reply` are synchronous and can take
+20–60 s per LLM round-trip. Every agent endpoint submits its chat here so the
+uvicorn event loop stays free for health checks, websockets and other requests.
+
+  - A bounded ThreadPoolExecutor (AGENT_POOL_SIZE workers) runs the chats.
+  - Per-provider semaphores (AGENT_PROVIDER_LIMITS) cap concurrent LLM calls
+    so a burst cannot blow through Groq/OpenAI/Azure rate limits.
+  - Queue depth + wait-time counters are exposed via `agent_pool.stats()`.
+
+Endpoints call `run_agent_chat(...)`, which picks the execution mode per
+endpoint (AGENT_EXECUTION_MODES): "thread" runs AutoGen's `initiate_chat` on
+the pool, "async" runs the agent natively on asyncio via `app.agents.llm`.
+One-shot agents call `run_one_shot(...)`, which additionally supports
+"single": one direct completion returned with its token usage.
+"""
+import asyncio
+import functools
+import threading
+import time
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable
+
+from loguru import logger
+
+from app.core.config import settings
+
+
+class AgentPool:
+    """Bounded worker pool for synchronous agent chats."""
+
+    def __init__(self, max_workers: int, provider_limits: dict[str, int]):
+        self.max_workers = max_workers
+        self.provider_limits = provider_limits
+        self._executor: ThreadPoolExecutor | None = None
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+
+        # ── Metrics ──────────────────────────────────────────────────────────
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._in_flight: dict[str, int] = {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="agent-worker",
+            )
+        return self._executor
+
+    def _get_semaphore(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._semaphores:
+            limit = self.provider_limits.get(provider, self.max_workers)
+            self._semaphores[provider] = asyncio.Semaphore(limit)
+        return self._semaphores[provider]
+
+    def _record_start(self, submitted_at: float, provider: str) -> None:
+        waited = time.perf_counter() - submitted_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._in_flight[provider] = self._in_flight.get(provider, 0) + 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    def _record_finish(self, provider: str, failed: bool) -> None:
+        with self._lock:
+            self._running -= 1
+            self._in_flight[provider] -= 1
+            if failed:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    @asynccontextmanager
+    async def reserve(self, provider: str | None = None):
+        """
+        Hold one slot under the provider cap (with the usual queue/wait metrics)
+        for the duration of the block. Used by the native asyncio paths, which
+        need no worker thread — including streams that yield while holding it.
+        """
+        provider = provider or settings.LLM_PROVIDER
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+        started = False
+        try:
+            async with self._get_semaphore(provider):
+                started = True
+                self._record_start(submitted_at, provider)
+                failed = True
+                try:
+                    yield
+                    failed = False
+                finally:
+                    self._record_finish(provider, failed)
+        finally:
+            if not started:
+                with self._lock:
+                    self._queued -= 1
+
+    async def submit_async(self, coro_fn: Callable[..., Any], *args, provider: str | None = None, **kwargs) -> Any:
+        """
+        Await `coro_fn(*args, **kwargs)` under the same provider cap + metrics as `submit`.
+
+        Used by the native asyncio path — no worker thread is held.
+        """
+        async with self.reserve(provider):
+            return await coro_fn(*args, **kwargs)
+
+    def _run(self, state: dict, provider: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Executed on a worker thread."""
+        state["started"] = True
+        self._record_start(state["submitted_at"], provider)
+        failed = True
+        try:
+            result = fn(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            self._record_finish(provider, failed)
+
+    async def submit(self, fn: Callable[..., Any], *args, provider: str | None = None, **kwargs) -> Any:
+        """
+        Run `fn(*args, **kwargs)` on the agent pool and await its result.
+
+        Waits for a free slot under the provider's concurrency cap first, so
+        queued work never pins a worker thread while it waits.
+        """
+        provider = provider or settings.LLM_PROVIDER
+        state = {"submitted_at": time.perf_counter(), "started": False}
+        with self._lock:
+            self._queued += 1
+        try:
+            async with self._get_semaphore(provider):
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self._get_executor(),
+                    functools.partial(self._run, state, provider, fn, *args, **kwargs),
+                )
+        finally:
+            # Cancelled (or rejected) before a worker picked it up
+            if not state["started"]:
+                with self._lock:
+                    self._queued -= 1
+
+    def stats(self) -> dict:
+        """Snapshot of pool utilisation for /metrics."""
+        with self._lock:
+            started = self._completed + self._failed + self._running
+            return {
+                "pool_size": self.max_workers,
+                "provider_limits": dict(self.provider_limits),
+                "queue_depth": self._queued,
+                "running": self._running,
+                "in_flight_by_provider": dict(self._in_flight),
+                "completed": self._completed,
+                "failed": self._failed,
+                "avg_wait_ms": round(self._wait_total / started * 1000, 2) if started else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 2),
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            logger.info("Shutting down agent worker pool...")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Single global instance
+agent_pool = AgentPool(
+    max_workers=settings.AGENT_POOL_SIZE,
+    provider_limits=settings.agent_provider_limits,
+)
+
+
+def _last_reply(user_proxy, agent) -> str:
+    """Return the agent's final reply content from a finished proxy → agent chat."""
+    try:
+        last_msg = user_proxy.last_message(agent)
+        return (last_msg.get("content") or "" if last_msg else "").strip()
+    except Exception:
+        # Fallback — scan chat_messages manually
+        messages = user_proxy.chat_messages.get(agent, [])
+        return next(
+            (m["content"].strip() for m in reversed(messages) if (m.get("content") or "").strip()),
+            "",
+        )
+
+
+async def _cached_reply(endpoint: str, agent, message: str) -> tuple[str | None, str | None]:
+    """Return (cache_key, cached_reply) — both None when the endpoint isn't cached."""
+    if endpoint not in settings.llm_cache_endpoints:
+        return None, None
+    from app.core.llm_cache import llm_cache, make_cache_key
+    cache_key = make_cache_key(
+        agent.name,
+        agent.system_message,
+        [{"role": "user", "content": message}],
+        settings.active_model,
+        settings.llm_config.get("temperature"),
+    )
+    cached = await llm_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"{endpoint}: LLM cache hit for {agent.name}")
+    return cache_key, cached
+
+
+async def _store_reply(cache_key: str | None, agent, reply: str) -> None:
+    if cache_key and reply:
+        from app.core.llm_cache import llm_cache
+        await llm_cache.set(cache_key, agent.name, reply)
+
+
+async def run_agent_chat(endpoint: str, user_proxy, agent, message: str, **chat_kwargs) -> str:
+    """
+    Run a User_Proxy → agent chat using the endpoint's configured execution mode.
+
+    Returns the agent's final text reply ("" if it produced none).
+    `chat_kwargs` (max_turns, ...) are forwarded to `initiate_chat` in thread mode.
+    Endpoints listed in LLM_CACHE_ENDPOINTS are answered from the LLM response
+    cache when the same agent has already seen the same prompt.
+    """
+    cache_key, cached = await _cached_reply(endpoint, agent, message)
+    if cached is not None:
+        return cached
+
+    if settings.execution_mode(endpoint) in ("async", "single"):
+        from app.agents.llm import arun_agent
+        reply = await agent_pool.submit_async(arun_agent, agent, message, executor=user_proxy)
+    else:
+        await agent_pool.submit(user_proxy.initiate_chat, agent, message=message, **chat_kwargs)
+        reply = _last_reply(user_proxy, agent)
+
+    await _store_reply(cache_key, agent, reply)
+    return reply
+
+
+async def run_one_shot(
+    endpoint: str, user_proxy, agent, message: str, json_mode: bool = False, **chat_kwargs
+):
+    """
+    Run a one-shot agent (resume, roadmap, linkedin) and return an `AgentCompletion`.
+
+    In "single" mode this is one direct completion — no chat bookkeeping — and
+    the result carries token usage. Other modes go through `run_agent_chat`
+    (usage is then unknown and left empty).
+    """
+    from app.agents.llm import AgentCompletion, acomplete
+
+    if settings.execution_mode(endpoint) != "single":
+        reply = await run_agent_chat(endpoint, user_proxy, agent, message, **chat_kwargs)
+        return AgentCompletion(content=reply, model=settings.active_model)
+
+    cache_key, cached = await _cached_reply(endpoint, agent, message)
+    if cached is not None:
+        return AgentCompletion(content=cached, model=settings.active_model, cached=True)
+
+    completion = await agent_pool.submit_async(acomplete, agent, message, json_mode=json_mode)
+    logger.info(f"{endpoint}: single completion for {agent.name} — usage={completion.usage}")
+    await _store_reply(cache_key, agent, completion.content)
+    return completion
+
+
+async def stream_one_shot(endpoint: str, agent, message: str, json_mode: bool = False) -> AsyncIterator[str]:
+    """
+    Stream a one-shot agent's reply as text deltas.
+
+    Always uses the native asyncio client (thread-mode chats cannot stream).
+    A cached reply is replayed as a single chunk; a completed stream is
+    stored in the LLM cache like any other reply.
+    """
+    from app.agents.llm import astream
+
+    cache_key, cached = await _cached_reply(endpoint, agent, message)
+    if cached is not None:
+        yield cached
+        return
+
+    parts: list[str] = []
+    async with agent_pool.reserve():
+        async for delta in astream(agent, message, json_mode=json_mode):
+            parts.append(delta)
+            yield delta
+    await _store_reply(cache_key, agent, "".join(parts).strip())
+
+
+async def stream_agent_reply(agent, messages: list[dict]) -> AsyncIterator[str]:
+    """Stream an agent's next reply to a running conversation (interview turns), under a pool slot."""
+    from app.agents.llm import astream_messages
+
+    async with agent_pool.reserve():
+        async for delta in astream_messages(agent, messages):
+            yield delta
@@ -0,0 +1,88 @@
+"""
+Incremental JSON Parser — pulls complete items out of a streaming agent reply.
+
+Agents answer with one top-level JSON container, possibly after a markdown
+fence or a line of preamble. Fed the reply chunk by chunk, `JSONStreamParser`
+returns each top-level item the moment it closes:
+
+  - array  `[ {...}, {...} ]`   → each element            (roadmap weeks)
+  - object `{ "k": v, ... }`    → each `(key, value)` pair (resume fields)
+
+Only the new text is scanned on every `feed`, so a reply costs O(n) overall.
+"""
+import json
+from typing import Any
+
+from loguru import logger
+
+
+class JSONStreamParser:
+    """Scan a streamed JSON reply and yield its top-level items as they complete."""
+
+    def __init__(self):
+        self.kind: str | None = None   # "array" | "object" once the container opens
+        self.done = False
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item_start: int | None = None
+
+    def _emit(self, end: int, items: list) -> None:
+        start, self._item_start = self._item_start, None
+        fragment = self._buffer[start:end].strip()
+        if not fragment:
+            return
+        try:
+            if self.kind == "object":
+                items.extend(json.loads("{" + fragment + "}").items())
+            else:
+                items.append(json.loads(fragment))
+        except json.JSONDecodeError as exc:
+            logger.warning(f"json stream: skipping unparsable item — {exc}. item={fragment[:200]}")
+
+    def feed(self, chunk: str) -> list[Any]:
+        """Add streamed text; return the items (or `(key, value)` pairs) completed by it."""
+        items: list[Any] = []
+        self._buffer += chunk
+        while self._pos < len(self._buffer) and not self.done:
+            ch = self._buffer[self._pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif self.kind is None:
+                # Skip fences / preamble until the top-level container opens
+                if ch in "[{":
+                    self.kind = "array" if ch == "[" else "object"
+                    self._depth = 1
+                    self._item_start = self._pos + 1
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "[{":
+                self._depth += 1
+            elif ch in "]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    # Container closed — flush a trailing scalar item, if any
+                    if self._item_start is not None:
+                        self._emit(self._pos, items)
+                    self.done = True
+                elif self._depth == 1 and self._item_start is not None:
+                    # A nested value just closed — its item is complete
+                    self._emit(self._pos + 1, items)
+            elif ch == "," and self._depth == 1:
+                if self._item_start is not None:
+                    self._emit(self._pos, items)
+                self._item_start = self._pos + 1
+            self._pos += 1
+        return items
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return self._buffer
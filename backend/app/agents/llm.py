@@ -0,0 +1,196 @@
+"""
+Async LLM Client — native asyncio execution path for registry agents.
+
+AutoGen 0.x `a_initiate_chat` still runs every completion on an executor
+thread, so it does not help once hundreds of LLM waits are in flight. This
+module talks to the same OpenAI-compatible endpoint (Groq / OpenAI / Azure)
+through `openai.AsyncOpenAI`, reusing each agent's system message and any
+tools registered on it, so an in-flight call costs a coroutine, not a thread.
+"""
+import asyncio
+import inspect
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+from app.core.config import settings
+
+_client = None
+
+_usage_lock = threading.Lock()
+_usage_totals = {"completions": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+
+@dataclass
+class AgentCompletion:
+    """Raw result of a single-call agent run."""
+    content: str
+    usage: dict = field(default_factory=dict)
+    model: str = ""
+    cached: bool = False
+
+
+def _record_usage(usage) -> dict:
+    """Normalise an OpenAI usage object to a dict and add it to the running totals."""
+    if usage is None:
+        return {}
+    counts = {
+        "prompt_tokens": usage.prompt_tokens or 0,
+        "completion_tokens": usage.completion_tokens or 0,
+        "total_tokens": usage.total_tokens or 0,
+    }
+    with _usage_lock:
+        _usage_totals["completions"] += 1
+        for key, value in counts.items():
+            _usage_totals[key] += value
+    return counts
+
+
+def usage_stats() -> dict:
+    """Token usage accumulated by direct completions, for /metrics."""
+    with _usage_lock:
+        return dict(_usage_totals)
+
+
+def get_async_client():
+    """Lazily build one shared async client for the active provider."""
+    global _client
+    if _client is None:
+        from openai import AsyncAzureOpenAI, AsyncOpenAI
+
+        config = settings.llm_config["config_list"][0]
+        timeout = settings.llm_config.get("timeout", 120)
+        if config.get("api_type") == "azure":
+            _client = AsyncAzureOpenAI(
+                api_key=config["api_key"],
+                azure_endpoint=config["base_url"],
+                api_version=settings.AZURE_OPENAI_API_VERSION,
+                timeout=timeout,
+            )
+        else:
+            _client = AsyncOpenAI(
+                api_key=config["api_key"],
+                base_url=config.get("base_url"),
+                timeout=timeout,
+            )
+    return _client
+
+
+async def _execute_tool_call(tool_call, executor) -> dict:
+    """Run one tool call via the executor agent's registered function map."""
+    name = tool_call.function.name
+    func = executor.function_map.get(name) if executor is not None else None
+    if func is None:
+        content = f"Error: function '{name}' is not available."
+    else:
+        try:
+            arguments = json.loads(tool_call.function.arguments or "{}")
+            if inspect.iscoroutinefunction(func):
+                content = await func(**arguments)
+            else:
+                # Sync tools (e.g. blocking web search) must not stall the loop
+                content = await asyncio.to_thread(func, **arguments)
+        except Exception as exc:
+            logger.warning(f"llm: tool '{name}' failed — {exc}")
+            content = f"Error: {exc}"
+    return {"role": "tool", "tool_call_id": tool_call.id, "content": str(content)}
+
+
+async def arun_agent(agent, message: str, executor=None, max_llm_calls: int = 5) -> str:
+    """
+    Run a single-prompt conversation against an AutoGen AssistantAgent natively on asyncio.
+
+    The loop ends as soon as the model answers without tool calls, so one-shot
+    agents cost exactly one completion; tool-using agents get up to
+    `max_llm_calls`. Tool calls are executed with `executor.function_map`,
+    i.e. the same functions `register_function(..., executor=user_proxy)` wired up.
+
+    Returns the agent's final text reply ("" if it produced none).
+    """
+    client = get_async_client()
+    config = settings.llm_config["config_list"][0]
+    tools = (agent.llm_config or {}).get("tools") or None
+
+    messages: list[dict[str, Any]] = [
+        {"role": "system", "content": agent.system_message},
+        {"role": "user", "content": message},
+    ]
+    content = ""
+    for _ in range(max(1, max_llm_calls)):
+        kwargs = {"tools": tools} if tools else {}
+        response = await client.chat.completions.create(
+            model=config["model"],
+            messages=messages,
+            temperature=settings.llm_config.get("temperature"),
+            **kwargs,
+        )
+        _record_usage(getattr(response, "usage", None))
+        choice = response.choices[0].message
+        content = (choice.content or "").strip()
+        if not choice.tool_calls:
+            break
+
+        messages.append(choice.model_dump(exclude_none=True))
+        results = await asyncio.gather(*(_execute_tool_call(tc, executor) for tc in choice.tool_calls))
+        messages.extend(results)
+
+    return content
+
+
+async def acomplete(agent, message: str, json_mode: bool = False) -> AgentCompletion:
+    """
+    One prompt → one completion for a one-shot registry agent.
+
+    No User_Proxy, no chat history, no tool loop: the agent's system message
+    and `message` are sent once and the raw completion comes back with its
+    token usage. `json_mode` asks the provider for a JSON object response.
+    """
+    client = get_async_client()
+    config = settings.llm_config["config_list"][0]
+    kwargs = {"response_format": {"type": "json_object"}} if json_mode else {}
+    response = await client.chat.completions.create(
+        model=config["model"],
+        messages=[
+            {"role": "system", "content": agent.system_message},
+            {"role": "user", "content": message},
+        ],
+        temperature=settings.llm_config.get("temperature"),
+        **kwargs,
+    )
+    return AgentCompletion(
+        content=(response.choices[0].message.content or "").strip(),
+        usage=_record_usage(response.usage),
+        model=response.model or config["model"],
+    )
+
+
+async def astream(agent, message: str, json_mode: bool = False) -> AsyncIterator[str]:
+    """
+    Same request as `acomplete`, but yields the completion's text deltas as
+    the provider streams them.
+    """
+    async for delta in astream_messages(agent, [{"role": "user", "content": message}], json_mode=json_mode):
+        yield delta
+
+
+async def astream_messages(agent, messages: list[dict], json_mode: bool = False) -> AsyncIterator[str]:
+    """Stream the agent's next reply to an existing conversation (`messages` excludes the system message)."""
+    client = get_async_client()
+    config = settings.llm_config["config_list"][0]
+    kwargs = {"response_format": {"type": "json_object"}} if json_mode else {}
+    stream = await client.chat.completions.create(
+        model=config["model"],
+        messages=[{"role": "system", "content": agent.system_message}, *messages],
+        temperature=settings.llm_config.get("temperature"),
+        stream=True,
+        **kwargs,
+    )
+    async for chunk in stream:
+        # Providers that report usage put it on the final chunk
+        if getattr(chunk, "usage", None) is not None:
+            _record_usage(chunk.usage)
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
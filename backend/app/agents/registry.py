@@ -2,6 +2,10 @@
 Agent Registry — Microsoft AutoGen agents for AI Career Mentor.
 """
 import random
+import threading
+import time
+from contextlib import contextmanager
+
 from app.core.config import settings
 
 
@@ -15,6 +19,11 @@ def get_user_proxy():
     )
 
 
+# Bump whenever the Resume_Analyst system message or the /resume/analyze prompt
+# changes — cached analyses stored under an older version are ignored.
+RESUME_ANALYST_PROMPT_VERSION = "2"
+
+
 def get_resume_analyst():
     """Resume analysis agent — returns structured JSON."""
     from autogen import AssistantAgent
@@ -105,7 +114,7 @@ def get_market_researcher():
             "You are a Senior Job Market Intelligence Analyst specializing in tech hiring trends across global and Indian markets.\n\n"
 
             "TASK: For the given role and location, perform targeted research using the 'search_job_trends' tool. "
-            "Run AT LEAST 3 searches:\n"
+            "Call it once with a `queries` list of AT LEAST 3 searches (they run in parallel):\n"
             "  1. '{role} jobs {location} 2025 salary'\n"
             "  2. 'top companies hiring {role} {location} 2025'\n"
             "  3. '{role} in-demand skills {location} hiring trend'\n\n"
@@ -188,21 +197,27 @@ _BEHAVIORAL_THEMES = [
     "a project you'd build differently today",
 ]
 
-# Pick fresh topics on every agent instantiation
-def _pick_interview_topics() -> tuple[str, str, str, str]:
-    """Pick a fresh topic set for each interview session."""
-    q3_topic = random.choice(_DSA_TOPICS)
-    q4_topic = random.choice([topic for topic in _DSA_TOPICS if topic != q3_topic])
-    design_topic = random.choice(_SYSTEM_DESIGN_TOPICS)
-    behavioral_theme = random.choice(_BEHAVIORAL_THEMES)
+# Pick fresh topics per session — seeded by the session id, so an agent rebuilt
+# after the session is evicted from memory keeps the same plan
+def _pick_interview_topics(session_id: str | None = None) -> tuple[str, str, str, str]:
+    """Pick the topic set for an interview session (random when no session id is given)."""
+    rng = random.Random(session_id)
+    q3_topic = rng.choice(_DSA_TOPICS)
+    q4_topic = rng.choice([topic for topic in _DSA_TOPICS if topic != q3_topic])
+    design_topic = rng.choice(_SYSTEM_DESIGN_TOPICS)
+    behavioral_theme = rng.choice(_BEHAVIORAL_THEMES)
     return behavioral_theme, design_topic, q3_topic, q4_topic
 
 
 
-def get_interview_agent(target_role: str = "Software Engineer", target_company: str = "A Top Tech Company"):
+def get_interview_agent(
+    target_role: str = "Software Engineer",
+    target_company: str = "A Top Tech Company",
+    session_id: str | None = None,
+):
     """Mock technical interview agent."""
     from autogen import AssistantAgent
-    behavioral_theme, design_topic, q3_topic, q4_topic = _pick_interview_topics()
+    behavioral_theme, design_topic, q3_topic, q4_topic = _pick_interview_topics(session_id)
     return AssistantAgent(
         name="Interviewer",
         llm_config=settings.llm_config,
@@ -254,3 +269,113 @@ def get_interview_agent(target_role: str = "Software Engineer", target_company:
     "  - If still stuck: reveal the approach, deduct 2 points from that question's score.\n"
 ),
     )
+
+
+# ── Reusable agent pool ───────────────────────────────────────────────────────
+# Building an AssistantAgent creates a fresh OpenAI client wrapper and
+# re-validates llm_config (and for the market agent, re-registers the search
+# tool). Hot endpoints instead check out a pre-built User_Proxy + agent pair,
+# which is reset on checkout and returned afterwards.
+
+def _build_market_pair():
+    from autogen import register_function
+    from app.tools.market_search import search_job_trends
+
+    user_proxy = get_user_proxy()
+    market_agent = get_market_researcher()
+    register_function(
+        search_job_trends,
+        caller=market_agent,
+        executor=user_proxy,
+        name="search_job_trends",
+        description="Search the web for live job market trends, salaries, top skills, and hiring companies for a specific role and location. Pass several queries at once; they run in parallel."
+    )
+    # Terminate the conversation automatically if the agent returns the JSON schema
+    user_proxy._is_termination_msg = lambda x: bool(
+        x.get("content") and "top_skills" in x.get("content", "") and "market_trend" in x.get("content", "")
+    )
+    return user_proxy, market_agent
+
+
+_AGENT_BUILDERS = {
+    "resume": lambda: (get_user_proxy(), get_resume_analyst()),
+    "roadmap": lambda: (get_user_proxy(), get_career_coach()),
+    "market": _build_market_pair,
+    "linkedin": lambda: (get_user_proxy(), get_linkedin_reviewer()),
+}
+
+
+class AgentInstancePool:
+    """Bounded per-type pool of (User_Proxy, agent) pairs with checkout metrics."""
+
+    def __init__(self, max_idle: int):
+        self.max_idle = max_idle
+        self._idle: dict[str, list] = {kind: [] for kind in _AGENT_BUILDERS}
+        self._lock = threading.Lock()
+        self._metrics = {
+            kind: {"reused": 0, "built": 0, "discarded": 0, "checkout_s_total": 0.0, "checkout_s_max": 0.0}
+            for kind in _AGENT_BUILDERS
+        }
+
+    def _acquire(self, kind: str):
+        started = time.perf_counter()
+        with self._lock:
+            pair = self._idle[kind].pop() if self._idle[kind] else None
+        if pair is None:
+            pair = _AGENT_BUILDERS[kind]()
+            reused = False
+        else:
+            for agent in pair:
+                agent.reset()
+            reused = True
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            m = self._metrics[kind]
+            m["reused" if reused else "built"] += 1
+            m["checkout_s_total"] += elapsed
+            m["checkout_s_max"] = max(m["checkout_s_max"], elapsed)
+        return pair
+
+    def _release(self, kind: str, pair) -> None:
+        with self._lock:
+            if len(self._idle[kind]) < self.max_idle:
+                self._idle[kind].append(pair)
+            else:
+                self._metrics[kind]["discarded"] += 1
+
+    @contextmanager
+    def checkout(self, kind: str):
+        """
+        Yield a reset (user_proxy, agent) pair for `kind` and return it afterwards.
+
+        A pair whose chat raised (or was cancelled) is discarded rather than
+        returned, since its worker thread may still be using it.
+        """
+        pair = self._acquire(kind)
+        try:
+            yield pair
+        except BaseException:
+            with self._lock:
+                self._metrics[kind]["discarded"] += 1
+            raise
+        self._release(kind, pair)
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = {}
+            for kind, m in self._metrics.items():
+                checkouts = m["reused"] + m["built"]
+                out[kind] = {
+                    "idle": len(self._idle[kind]),
+                    "reused": m["reused"],
+                    "built": m["built"],
+                    "discarded": m["discarded"],
+                    "avg_checkout_ms": round(m["checkout_s_total"] / checkouts * 1000, 3) if checkouts else 0.0,
+                    "max_checkout_ms": round(m["checkout_s_max"] * 1000, 3),
+                }
+            return {"max_idle_per_type": self.max_idle, "types": out}
+
+
+# Single global instance
+agent_instances = AgentInstancePool(max_idle=settings.AGENT_INSTANCE_POOL_SIZE)
@@ -2,9 +2,21 @@
 AutoGen GroupChat Orchestration — Day 6.
 
 Runs Resume Analyst + Market Researcher + Career Coach as a
-collaborative multi-agent pipeline via AutoGen GroupChat.
+collaborative multi-agent pipeline, in one of two modes (CAREER_PIPELINE):
+
+  - "groupchat" → one AutoGen GroupChat, agents speak strictly in turn.
+  - "dag"       → resume analysis and market research run concurrently
+                  (market research never needed the resume), the Career
+                  Coach starts once both are done. Latency ≈ max(resume,
+                  market) + coach, and per-stage timings are reported.
 """
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable
+
 from autogen import GroupChat, GroupChatManager
+from loguru import logger
 
 from app.agents.registry import (
     get_career_coach,
@@ -13,14 +25,22 @@ from app.agents.registry import (
     get_user_proxy,
 )
 from app.core.config import settings
+from app.core.resume_condense import condense_resume
+
+# The Career_Coach's output contract (keys come from its system message) — shared
+# by both modes so the roadmap has the same shape whichever CAREER_PIPELINE runs
+_COACH_INSTRUCTION = (
+    "Career_Coach MUST deeply analyze the gaps and provide an incredibly detailed, advanced 8-week roadmap "
+    "with specific mini-projects. Return pure JSON array."
+)
+_NO_CHIT_CHAT = "When outputting your JSON, DO NOT append any extra chit-chat."
 
 
-def run_full_career_analysis(resume_text: str, target_role: str, location: str) -> list[dict]:
+def _build_full_analysis_chat(resume_text: str, target_role: str, location: str):
     """
-    Orchestrates all 3 agents to produce a complete career analysis.
+    Builds the GroupChat for the full career analysis.
 
-    Returns the full GroupChat message history (list of role/content dicts).
-    Implemented on Day 6.
+    Returns (user_proxy, manager, groupchat, opening_message).
     """
     user_proxy = get_user_proxy()
     resume_analyst = get_resume_analyst()
@@ -36,7 +56,7 @@ def run_full_career_analysis(resume_text: str, target_role: str, location: str)
         caller=market_researcher,
         executor=user_proxy,
         name="search_job_trends",
-        description="Search job market trends for a role and location."
+        description="Search job market trends for a role and location. Pass several queries at once; they run in parallel."
     )
 
     def custom_speaker_selection(last_speaker, groupchat):
@@ -72,18 +92,159 @@ def run_full_career_analysis(resume_text: str, target_role: str, location: str)
         llm_config=settings.llm_config,
     )
 
-    user_proxy.initiate_chat(
-        manager,
-        message=(
-            f"Resume:\n{resume_text}\n\n"
-            f"Target Role: {target_role}\n\n"
-            f"Location: {location}\n\n"
-            "INSTRUCTIONS:\n"
-            "1. Resume_Analyst MUST extract detailed tech skills and highly robust, advanced skill gaps. Return pure JSON.\n"
-            f"2. Market_Researcher MUST use 'search_job_trends' (role='{target_role}', location='{location}'). Return pure JSON.\n"
-            "3. Career_Coach MUST deeply analyze the gaps and provide an incredibly detailed, advanced 8-week roadmap with specific mini-projects. Return pure JSON array.\n"
-            "When outputting your JSON, DO NOT append any extra chit-chat."
-        ),
+    message = (
+        f"Resume:\n{condense_resume(resume_text)}\n\n"
+        f"Target Role: {target_role}\n\n"
+        f"Location: {location}\n\n"
+        "INSTRUCTIONS:\n"
+        "1. Resume_Analyst MUST extract detailed tech skills and highly robust, advanced skill gaps. Return pure JSON.\n"
+        f"2. Market_Researcher MUST use 'search_job_trends' (role='{target_role}', location='{location}'). Return pure JSON.\n"
+        f"3. {_COACH_INSTRUCTION}\n"
+        f"{_NO_CHIT_CHAT}"
     )
+    return user_proxy, manager, groupchat, message
+
+
+def run_full_career_analysis(resume_text: str, target_role: str, location: str) -> list[dict]:
+    """
+    Orchestrates all 3 agents to produce a complete career analysis.
 
+    Returns the full GroupChat message history (list of role/content dicts).
+    Implemented on Day 6.
+    """
+    user_proxy, manager, groupchat, message = _build_full_analysis_chat(resume_text, target_role, location)
+    user_proxy.initiate_chat(manager, message=message)
     return groupchat.messages
+
+
+# ── DAG pipeline ──────────────────────────────────────────────────────────────
+
+def _parse_json_reply(raw: str):
+    cleaned = raw.strip()
+    if "```json" in cleaned:
+        cleaned = cleaned.split("```json")[1].split("```")[0].strip()
+    elif "```" in cleaned:
+        cleaned = cleaned.split("```")[1].split("```")[0].strip()
+    return json.loads(cleaned)
+
+
+async def _timed(stage: str, timings: dict, coro, on_stage=None):
+    started = time.perf_counter()
+    try:
+        result = await coro
+    finally:
+        timings[f"{stage}_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    if on_stage is not None:
+        await on_stage(stage, result, timings[f"{stage}_ms"])
+    return result
+
+
+async def _resume_stage(resume_text: str) -> str:
+    from app.agents.executor import run_one_shot
+    from app.agents.registry import agent_instances
+
+    message = (
+        "Analyze the following resume text and return ONLY a valid JSON object "
+        "(no extra commentary, no markdown) with keys: technical_skills, soft_skills, "
+        "years_of_experience, top_strengths (exactly 3), skill_gaps (exactly 5 advanced, specific gaps).\n\n"
+        f"Resume:\n{condense_resume(resume_text)}"
+    )
+    with agent_instances.checkout("resume") as (user_proxy, analyst):
+        completion = await run_one_shot("resume", user_proxy, analyst, message, json_mode=True, max_turns=2)
+    return completion.content
+
+
+async def _market_stage(target_role: str, location: str) -> dict:
+    from app.agents.executor import run_agent_chat
+    from app.agents.registry import agent_instances
+    from app.core.market_cache import career_market_cache, normalize_market_key
+    from app.core.single_flight import single_flight
+
+    async def research() -> dict:
+        message = (
+            f"Target Role: {target_role}\nLocation: {location}\n\n"
+            "Call 'search_job_trends' ONCE with a `queries` list of at least 3 targeted searches, then "
+            "return ONLY a raw JSON object with keys 'top_skills' (5 strings), 'salary_range' (string), "
+            "'top_companies' (5–8 strings) and 'market_trend' ('Growing', 'Stable' or 'Declining' + reason)."
+        )
+        with agent_instances.checkout("market") as (user_proxy, researcher):
+            raw = await run_agent_chat("market", user_proxy, researcher, message=message, max_turns=5)
+        return _parse_json_reply(raw)
+
+    # Own cache + single-flight namespace: this prompt differs from /market/trends'
+    data, _ = await career_market_cache.get_or_compute(
+        target_role,
+        location,
+        lambda: single_flight.do("career_market", normalize_market_key(target_role, location), research),
+    )
+    return data
+
+
+async def _coach_stage(target_role: str, resume_analysis: dict, market: dict) -> str:
+    from app.agents.executor import run_one_shot
+    from app.agents.registry import agent_instances
+
+    gaps = resume_analysis.get("skill_gaps") or []
+    message = (
+        f"Target Role: {target_role}\n\n"
+        f"Candidate's Skill Gaps: {json.dumps(gaps, ensure_ascii=False)}\n"
+        f"Candidate's Current Skills: {json.dumps(resume_analysis.get('technical_skills') or [], ensure_ascii=False)}\n"
+        f"Market In-Demand Skills: {json.dumps(market.get('top_skills') or [], ensure_ascii=False)}\n"
+        f"Market Trend: {market.get('market_trend', 'Unknown')}\n\n"
+        "INSTRUCTIONS:\n"
+        f"{_COACH_INSTRUCTION}\n"
+        f"{_NO_CHIT_CHAT}"
+    )
+    with agent_instances.checkout("roadmap") as (user_proxy, coach):
+        completion = await run_one_shot("roadmap", user_proxy, coach, message, max_turns=2)
+    return completion.content
+
+
+async def arun_career_pipeline(
+    resume_text: str,
+    target_role: str,
+    location: str,
+    on_stage: Callable[[str, Any, float], Awaitable[None]] | None = None,
+) -> tuple[list[dict], dict]:
+    """
+    DAG variant of the full career analysis.
+
+    Returns (messages, stage_timings). `messages` mirrors the GroupChat
+    history shape ({"name", "role", "content"} per agent), so callers parse
+    both modes the same way; `stage_timings` holds resume_ms, market_ms,
+    coach_ms and total_ms. `on_stage(stage, output, ms)` is awaited as each
+    stage finishes (raw reply for resume/coach, parsed dict for market).
+    """
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+
+    resume_raw, market = await asyncio.gather(
+        _timed("resume", timings, _resume_stage(resume_text), on_stage),
+        _timed("market", timings, _market_stage(target_role, location), on_stage),
+        return_exceptions=True,
+    )
+    # The coach cannot work without the resume; it can without market data
+    if isinstance(resume_raw, BaseException):
+        raise resume_raw
+    if isinstance(market, BaseException):
+        logger.warning(f"career pipeline: market stage failed — {market}")
+        market = {}
+
+    try:
+        resume_analysis = _parse_json_reply(resume_raw)
+    except (json.JSONDecodeError, IndexError):
+        logger.warning(f"career pipeline: resume stage returned non-JSON. raw={resume_raw[:300]}")
+        resume_analysis = {}
+    if not isinstance(resume_analysis, dict):
+        resume_analysis = {}
+
+    coach_raw = await _timed("coach", timings, _coach_stage(target_role, resume_analysis, market), on_stage)
+    timings["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"career pipeline: stage timings {timings}")
+
+    messages = [
+        {"name": "Resume_Analyst", "role": "assistant", "content": resume_raw},
+        {"name": "Market_Researcher", "role": "assistant", "content": json.dumps(market, ensure_ascii=False) if market else ""},
+        {"name": "Career_Coach", "role": "assistant", "content": coach_raw},
+    ]
+    return messages, timings
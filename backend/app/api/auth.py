@@ -1,36 +1,46 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.models.models import User
 from app.models.schemas import UserRegister, UserLogin, TokenResponse
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.security import create_access_token, needs_rehash, password_hasher
 
 router = APIRouter()
 
 @router.post("/register", response_model=TokenResponse)
-def register(user: UserRegister, db: Session = Depends(get_db)):
+async def register(user: UserRegister, db: AsyncSession = Depends(get_db)):
     email_clean = user.email.strip().lower()
     
-    db_user = db.query(User).filter(User.email == email_clean).first()
+    result = await db.execute(select(User).where(User.email == email_clean))
+    db_user = result.scalars().first()
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
         
-    hashed_pw = get_password_hash(user.password)
+    # bcrypt is CPU-bound — runs in the dedicated hashing process pool
+    hashed_pw = await password_hasher.hash(user.password)
     new_user = User(name=user.name, email=email_clean, hashed_pw=hashed_pw)
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     access_token = create_access_token(data={"sub": str(new_user.id)})
     return {"access_token": access_token, "token_type": "bearer", "name": new_user.name}
 
 @router.post("/login", response_model=TokenResponse)
-def login(user: UserLogin, db: Session = Depends(get_db)):
+async def login(user: UserLogin, db: AsyncSession = Depends(get_db)):
     email_clean = user.email.strip().lower()
     
-    db_user = db.query(User).filter(User.email == email_clean).first()
-    if not db_user or not verify_password(user.password, db_user.hashed_pw):
+    result = await db.execute(select(User).where(User.email == email_clean))
+    db_user = result.scalars().first()
+    if not db_user or not await password_hasher.verify(user.password, db_user.hashed_pw):
         raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    # Transparently upgrade hashes created with an older cost factor
+    if needs_rehash(db_user.hashed_pw):
+        db_user.hashed_pw = await password_hasher.hash(user.password)
+        await db.commit()
+        password_hasher.record_rehash()
         
     access_token = create_access_token(data={"sub": str(db_user.id)})
     return {"access_token": access_token, "token_type": "bearer", "name": db_user.name}
@@ -1,7 +1,11 @@
 import json
-from fastapi import APIRouter, HTTPException
+import time
+from fastapi import APIRouter, Depends, HTTPException
 from loguru import logger
 
+from app.api.deps import get_current_user
+from app.core.sse import sse_event, sse_response
+from app.models.models import User
 from app.models.schemas import FullAnalysisRequest, FullAnalysisResponse
 
 router = APIRouter()
@@ -35,23 +39,38 @@ def _extract_json_from_agent_messages(messages, agent_name: str):
         return {}
 
 
-@router.post(
-    "/full-analysis",
-    response_model=FullAnalysisResponse,
-    summary="Run all 3 agents (Resume Analyst, Market, Career Coach) via GroupChat"
-)
-async def run_full_analysis(request: FullAnalysisRequest) -> FullAnalysisResponse:
-    from app.agents.workflow import run_full_career_analysis
-    
-    logger.info(f"career/full-analysis: Started for role='{request.target_role}'")
-    
-    try:
-        # 1. Run the GroupChat orchestration
-        messages = run_full_career_analysis(request.resume_text, request.target_role, request.location)
-    except Exception as exc:
-        logger.exception("Full career analysis GroupChat failed")
-        raise HTTPException(status_code=500, detail=str(exc))
-        
+async def run_career_analysis(
+    resume_text: str, target_role: str, location: str, on_stage=None
+) -> FullAnalysisResponse:
+    """
+    Run the full analysis in the configured pipeline mode and assemble the response.
+    Shared by the synchronous endpoint and the background job workers;
+    `on_stage` is called per stage in DAG mode, and once ("groupchat", with
+    the agents that replied) when the GroupChat finishes.
+    """
+    from app.agents.executor import agent_pool
+    from app.agents.workflow import arun_career_pipeline, run_full_career_analysis
+    from app.core.config import settings
+
+    stage_timings = None
+    # 1. Run the pipeline — concurrent DAG, or the sequential GroupChat
+    if settings.career_pipeline == "dag":
+        messages, stage_timings = await arun_career_pipeline(
+            resume_text, target_role, location, on_stage=on_stage
+        )
+    else:
+        started = time.perf_counter()
+        messages = await agent_pool.submit(
+            run_full_career_analysis, resume_text, target_role, location
+        )
+        if on_stage is not None:
+            agents = list(dict.fromkeys(m["name"] for m in messages if m.get("name") and m.get("content")))
+            await on_stage(
+                "groupchat",
+                {"agents": agents, "messages": len(messages)},
+                round((time.perf_counter() - started) * 1000, 1),
+            )
+
     # 2. Extract specific agent outputs
     resume_data = _extract_json_from_agent_messages(messages, "Resume_Analyst")
     market_data = _extract_json_from_agent_messages(messages, "Market_Researcher")
@@ -75,6 +94,87 @@ async def run_full_analysis(request: FullAnalysisRequest) -> FullAnalysisRespons
     return FullAnalysisResponse(
         resume_analysis=resume_data if resume_data else {"technical_skills": [], "soft_skills": [], "skill_gaps": [], "top_strengths": [], "years_of_experience": 0},
         market_trends=market_data if market_data else {"top_skills": [], "salary_range": "Unknown", "top_companies": [], "market_trend": "Unknown"},
-        roadmap={"target_role": request.target_role, "weeks": coach_data} if isinstance(coach_data, list) else {"target_role": request.target_role, "weeks": []},
-        agent_logs=messages
+        roadmap={"target_role": target_role, "weeks": coach_data} if isinstance(coach_data, list) else {"target_role": target_role, "weeks": []},
+        agent_logs=messages,
+        stage_timings=stage_timings,
     )
+
+
+@router.post(
+    "/full-analysis",
+    response_model=FullAnalysisResponse,
+    summary="Run all 3 agents (Resume Analyst, Market, Career Coach) as a DAG or GroupChat"
+)
+async def run_full_analysis(request: FullAnalysisRequest) -> FullAnalysisResponse:
+    logger.info(f"career/full-analysis: Started for role='{request.target_role}'")
+    
+    try:
+        return await run_career_analysis(request.resume_text, request.target_role, request.location)
+    except Exception as exc:
+        logger.exception("Full career analysis failed")
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+# ── Background jobs ───────────────────────────────────────────────────────────
+
+async def _owned_job(job_id: str, user):
+    from app.core.career_jobs import career_jobs
+
+    job = await career_jobs.get(job_id)
+    if job is None or job.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+
+@router.post(
+    "/full-analysis/jobs",
+    status_code=202,
+    summary="Queue a full career analysis and return a job id immediately"
+)
+async def submit_full_analysis_job(
+    request: FullAnalysisRequest,
+    current_user: User = Depends(get_current_user),
+):
+    from app.core.career_jobs import QueueFull, career_jobs
+
+    try:
+        job = await career_jobs.submit(
+            user_id=current_user.id,
+            target_role=request.target_role,
+            location=request.location,
+            resume_text=request.resume_text,
+        )
+    except QueueFull as exc:
+        logger.warning(f"career/full-analysis/jobs: rejected — {exc}")
+        raise HTTPException(status_code=503, detail="Too many analyses queued. Please retry shortly.")
+
+    logger.info(f"career/full-analysis/jobs: queued {job.id} for role='{request.target_role}'")
+    return {"job_id": job.id, "status": job.status}
+
+
+@router.get("/full-analysis/jobs/{job_id}", summary="Poll a queued full career analysis")
+async def get_full_analysis_job(job_id: str, current_user: User = Depends(get_current_user)):
+    from app.core.career_jobs import job_snapshot
+
+    return job_snapshot(await _owned_job(job_id, current_user))
+
+
+@router.get(
+    "/full-analysis/jobs/{job_id}/events",
+    summary="Subscribe to a full career analysis job as Server-Sent Events"
+)
+async def stream_full_analysis_job(job_id: str, current_user: User = Depends(get_current_user)):
+    """
+    Sends the current job snapshot, then one event per stage / status change
+    until the job is completed or failed (or a "timeout" event after
+    CAREER_JOB_STREAM_TIMEOUT seconds).
+    """
+    from app.core.career_jobs import career_jobs
+
+    await _owned_job(job_id, current_user)
+
+    async def events():
+        async for event in career_jobs.subscribe(job_id):
+            yield sse_event(event["status"], event)
+
+    return sse_response(events())
@@ -1,20 +1,30 @@
+import asyncio
+import base64
 import json
+import struct
 from datetime import datetime, timezone
 import re
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
 from app.core.database import get_db
+from app.core.interview_context import build_llm_messages, question_score
+from app.core.interview_sessions import interview_sessions
+from app.core.interview_transcript import append_message, load_history
 from app.models.models import InterviewSession, User
+from app.agents.executor import agent_pool, stream_agent_reply
 from app.agents.registry import get_interview_agent
-from app.core.voice_engine import INTERVIEW_TTS_VOICE, generate_audio_base64
+from app.core.voice_engine import INTERVIEW_TTS_VOICE, SpeechPipeline, synthesize
 
 router = APIRouter()
 
-active_sessions = {}
 TOTAL_INTERVIEW_QUESTIONS = 7
 
+# Binary audio frame header (framing=binary): connection-wide frame seq, then
+# the clip's index within its reply (0 for a whole-reply clip). MP3 bytes follow.
+AUDIO_FRAME_HEADER = struct.Struct(">IH")
+
 
 def _extract_interview_score(msg_content: str) -> float:
     """Normalize final interview scores to a 0-100 scale."""
@@ -43,93 +53,227 @@ def _extract_interview_score(msg_content: str) -> float:
 
     return 80.0
 
+
+class _InterviewSocket:
+    """
+    Outbound side of one interview websocket.
+
+    Text and control always go out as JSON frames. Audio depends on the
+    negotiated framing: "json" embeds it base64-encoded in the frame, "binary"
+    sends the raw MP3 as its own binary frame and the JSON refers to it by
+    `audio_seq`. Sends are serialised because audio chunks go out from a
+    background task while deltas may still be streaming.
+    """
+
+    def __init__(self, websocket: WebSocket, framing: str):
+        self.websocket = websocket
+        self.binary = framing == "binary"
+        self._lock = asyncio.Lock()
+        self._audio_seq = 0
+
+    async def send(self, frame: dict) -> None:
+        async with self._lock:
+            await self.websocket.send_json(frame)
+
+    async def send_audio(self, audio: bytes, part: int = 0) -> dict:
+        """Ship a clip; returns the fields a JSON frame uses to carry or reference it."""
+        if not self.binary:
+            return {"audio": base64.b64encode(audio).decode("utf-8") if audio else ""}
+        if not audio:
+            return {"audio": None}
+        async with self._lock:
+            seq = self._audio_seq
+            self._audio_seq += 1
+            await self.websocket.send_bytes(AUDIO_FRAME_HEADER.pack(seq, part) + audio)
+        return {"audio": None, "audio_seq": seq}
+
+
+async def _interviewer_reply(send, interviewer, messages: list[dict], stream: bool, on_text=None) -> str:
+    """
+    Generate the Interviewer's next message. With `stream`, each token batch is
+    forwarded as a {"type": "delta"} frame while the reply is still being written.
+    `on_text` sees the reply as it arrives (in one piece when not streaming).
+    """
+    if stream:
+        parts: list[str] = []
+        try:
+            async for delta in stream_agent_reply(interviewer, messages):
+                parts.append(delta)
+                if on_text:
+                    on_text(delta)
+                await send({"type": "delta", "role": "interviewer", "content": delta})
+            return "".join(parts)
+        except WebSocketDisconnect:
+            raise
+        except Exception as e:
+            if parts:
+                raise
+            # Nothing sent yet — fall back to the blocking path
+            logger.warning(f"Interviewer streaming failed, falling back to generate_reply: {e}")
+
+    reply = await agent_pool.submit(interviewer.generate_reply, messages=messages)
+    msg_content = reply if isinstance(reply, str) else reply.get("content", "")
+    if on_text:
+        on_text(msg_content)
+    return msg_content
+
+
+class _SpokenReply:
+    """
+    Audio for one interviewer message, used as `async with` around the turn.
+
+    "full" — one clip, attached to the final frame.
+    "pipelined" — sentence clips are synthesised while the reply is still
+    being written and sent as ordered {"type": "audio", "seq": n} frames;
+    `final_audio()` waits for the last chunk, so every clip precedes "final".
+    """
+
+    def __init__(self, socket: _InterviewSocket, tts: str):
+        self._socket = socket
+        self._speech = SpeechPipeline(INTERVIEW_TTS_VOICE) if tts == "pipelined" else None
+        self._sender: asyncio.Task | None = None
+
+    async def __aenter__(self):
+        if self._speech is not None:
+            self._sender = asyncio.create_task(self._send_chunks())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._speech is None:
+            return
+        if exc_type is None:
+            await self._sender
+        else:
+            self._speech.cancel()
+            self._sender.cancel()
+
+    async def _send_chunks(self) -> None:
+        async for seq, audio in self._speech.chunks():
+            fields = await self._socket.send_audio(audio, part=seq)
+            if not self._socket.binary:
+                await self._socket.send({"type": "audio", "role": "interviewer", "seq": seq, **fields})
+
+    def feed(self, text: str) -> None:
+        if self._speech is not None:
+            self._speech.feed(text)
+
+    async def final_audio(self, content: str) -> dict:
+        """
+        Audio fields for the final frame. When pipelined, "audio" is None — the
+        chunks carry it — and this returns once the last chunk has been sent.
+        """
+        if self._speech is None:
+            return await self._socket.send_audio(await synthesize(content, INTERVIEW_TTS_VOICE))
+        self._speech.close()
+        await self._sender
+        return {"audio": None}
+
+
 @router.websocket("/ws/{session_id}")
 async def websocket_endpoint(
     websocket: WebSocket, 
     session_id: str, 
     role: str = "Software Engineer", 
     company: str = "A top tech company", 
-    db: Session = Depends(get_db)
+    stream: bool = False,
+    tts: str = "full",
+    framing: str = "json",
+    db: AsyncSession = Depends(get_db)
 ):
     await websocket.accept()
+
+    socket = _InterviewSocket(websocket, framing)
+    send = socket.send
     
-    session = db.query(InterviewSession).filter(InterviewSession.id == session_id).first()
+    session = await db.get(InterviewSession, session_id)
     if not session:
         # Create dummy user if not exists
-        user = db.query(User).filter(User.id == "dummy").first()
+        user = await db.get(User, "dummy")
         if not user:
             user = User(id="dummy", email="dummy@test.com", name="Dummy User", hashed_pw="dummy")
             db.add(user)
-            db.commit()
+            await db.commit()
 
         # Create session fallback
         session = InterviewSession(id=session_id, user_id="dummy", target_role=role)
         db.add(session)
-        db.commit()
-        db.refresh(session)
+        await db.commit()
+        await db.refresh(session)
         
-    chat_history = session.chat_history or []
-    question_count = len([m for m in chat_history if m["role"] == "interviewer"])
-    
-    if session_id not in active_sessions:
-        active_sessions[session_id] = {
+    async def _build_session_data() -> dict:
+        chat_history, last_seq = await load_history(db, session_id)
+        return {
             "history": chat_history,
-            "question_count": question_count,
-            "agent": get_interview_agent(target_role=role, target_company=company)
+            "seq": last_seq,
+            "question_count": len([m for m in chat_history if m["role"] == "interviewer"]),
+            "agent": get_interview_agent(target_role=role, target_company=company, session_id=session_id),
         }
-        
-    session_data = active_sessions[session_id]
-    
-    if not session_data["history"]:
-        interviewer = session_data["agent"]
-        reply = interviewer.generate_reply(messages=[{"role": "user", "content": f"I am a candidate for the {role} position at {company}. Let's start the interview. Ask me the first question."}])
-        msg_content = reply if isinstance(reply, str) else reply.get("content", "")
-        
-        session_data["history"].append({"role": "interviewer", "content": msg_content})
-        session_data["question_count"] += 1
-        
-        session.chat_history = session_data["history"]
-        db.commit()
-        
-        audio_data = await generate_audio_base64(msg_content, voice=INTERVIEW_TTS_VOICE)
-        await websocket.send_json({"role": "interviewer", "content": msg_content, "audio": audio_data})
-
-    try:
-        while True:
-            data = await websocket.receive_text()
-            
-            session_data["history"].append({"role": "candidate", "content": data})
-            session.chat_history = session_data["history"]
-            db.commit()
-            
-            llm_messages = []
-            for msg in session_data["history"]:
-                r = "assistant" if msg["role"] == "interviewer" else "user"
-                llm_messages.append({"role": r, "content": msg["content"]})
-                
-            interviewer = session_data["agent"]
-            reply = interviewer.generate_reply(messages=llm_messages)
-            msg_content = reply if isinstance(reply, str) else reply.get("content", "")
-            
-            session_data["history"].append({"role": "interviewer", "content": msg_content})
-            session_data["question_count"] += 1
-            session.chat_history = session_data["history"]
-            
-            # Simple score extraction if final summary is given
-            if session_data["question_count"] >= TOTAL_INTERVIEW_QUESTIONS + 1:
-                session.status = "completed"
-                session.completed_at = datetime.now(timezone.utc)
-                # The interviewer may report totals out of 50, 10, or 100.
-                session.score = _extract_interview_score(msg_content)
-            
-            db.commit()
-            
-            audio_data = await generate_audio_base64(msg_content, voice=INTERVIEW_TTS_VOICE)
-            await websocket.send_json({"role": "interviewer", "content": msg_content, "audio": audio_data})
-            
-            if session.status == "completed":
-                await websocket.send_json({"role": "system", "content": "Interview Completed.", "score": session.score})
-                break
-                
-    except WebSocketDisconnect:
-        logger.info(f"WebSocket disconnected for session {session_id}")
+
+    async with interview_sessions.attach(session_id, _build_session_data) as entry:
+        session_data = entry.data
+
+        # The lock serialises whole turns — a second socket on this id waits its turn
+        async with entry.lock:
+            if not session_data["history"]:
+                async with _SpokenReply(socket, tts) as spoken:
+                    msg_content = await _interviewer_reply(
+                        send,
+                        session_data["agent"],
+                        [{"role": "user", "content": f"I am a candidate for the {role} position at {company}. Let's start the interview. Ask me the first question."}],
+                        stream,
+                        on_text=spoken.feed,
+                    )
+
+                    session_data["history"].append({"role": "interviewer", "content": msg_content})
+                    session_data["question_count"] += 1
+                    session_data["seq"] += 1
+                    await append_message(db, session_id, session_data["seq"], "interviewer", msg_content)
+
+                    audio = await spoken.final_audio(msg_content)
+                    await send({"type": "final", "role": "interviewer", "content": msg_content, **audio, "score": None})
+
+        try:
+            while True:
+                data = await websocket.receive_text()
+
+                async with entry.lock:
+                    session_data["history"].append({"role": "candidate", "content": data})
+                    session_data["seq"] += 1
+                    await append_message(db, session_id, session_data["seq"], "candidate", data)
+
+                    llm_messages = build_llm_messages(session_data)
+
+                    async with _SpokenReply(socket, tts) as spoken:
+                        msg_content = await _interviewer_reply(send, session_data["agent"], llm_messages, stream, on_text=spoken.feed)
+
+                        session_data["history"].append({"role": "interviewer", "content": msg_content})
+                        session_data["question_count"] += 1
+                        session_data["seq"] += 1
+                        # Committed together with the completion fields below
+                        await append_message(db, session_id, session_data["seq"], "interviewer", msg_content, commit=False)
+
+                        # Simple score extraction if final summary is given
+                        if session_data["question_count"] >= TOTAL_INTERVIEW_QUESTIONS + 1:
+                            session.status = "completed"
+                            session.completed_at = datetime.now(timezone.utc)
+                            # The interviewer may report totals out of 50, 10, or 100.
+                            session.score = _extract_interview_score(msg_content)
+
+                        await db.commit()
+
+                        audio = await spoken.final_audio(msg_content)
+                        # Final frame: the complete reply plus the score it awarded (0-100 once the interview is over)
+                        score = session.score if session.status == "completed" else question_score(msg_content)
+                        await send({
+                            "type": "final", "role": "interviewer", "content": msg_content, **audio, "score": score,
+                        })
+
+                if session.status == "completed":
+                    await send({"role": "system", "content": "Interview Completed.", "score": session.score})
+                    break
+
+        except WebSocketDisconnect:
+            logger.info(f"WebSocket disconnected for session {session_id}")
+
+    if session.status == "completed":
+        interview_sessions.discard(session_id)
@@ -1,11 +1,12 @@
 import json
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
 from app.core.database import get_db
-from app.agents.registry import get_user_proxy, get_linkedin_reviewer
+from app.agents.executor import run_one_shot
+from app.agents.registry import agent_instances
 
 router = APIRouter()
 
@@ -13,13 +14,10 @@ class LinkedInRequest(BaseModel):
     profile_text: str
 
 @router.post("/review")
-async def review_linkedin(req: LinkedInRequest, db: Session = Depends(get_db)):
+async def review_linkedin(req: LinkedInRequest, db: AsyncSession = Depends(get_db)):
     if not req.profile_text or len(req.profile_text.strip()) < 50:
         raise HTTPException(status_code=400, detail="Profile text is too short. Please provide more text.")
 
-    user_proxy = get_user_proxy()
-    reviewer = get_linkedin_reviewer()
-
     prompt = f"""
     Please review the following LinkedIn profile text and provide constructive feedback in valid JSON format.
     
@@ -28,20 +26,23 @@ async def review_linkedin(req: LinkedInRequest, db: Session = Depends(get_db)):
     """
     
     try:
-        chat_res = user_proxy.initiate_chat(
-            reviewer,
-            message=prompt,
-            summary_method="last_msg"
-        )
-        
-        content = chat_res.summary
+        with agent_instances.checkout("linkedin") as (user_proxy, reviewer):
+            completion = await run_one_shot(
+                "linkedin",
+                user_proxy,
+                reviewer,
+                message=prompt,
+                json_mode=True,
+                summary_method="last_msg"
+            )
+        content = completion.content
         
         # Parse JSON
         start_idx = content.find('{')
         end_idx = content.rfind('}')
         if start_idx != -1 and end_idx != -1:
             json_str = content[start_idx:end_idx+1]
-            return {"analysis": json.loads(json_str)}
+            return {"analysis": json.loads(json_str), "usage": completion.usage}
         else:
             raise ValueError("No JSON object found in response")
 
@@ -1,6 +1,8 @@
 import json
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from loguru import logger
+from app.core.market_cache import market_trends_cache, normalize_market_key
+from app.core.single_flight import single_flight
 from app.models.schemas import MarketTrendsResponse
 
 router = APIRouter()
@@ -22,98 +24,92 @@ def _parse_agent_json(raw: str) -> dict:
 
     return parsed
 
+async def _research_market(role: str, location: str) -> dict:
+    """Run the Market_Researcher agent (with web search) and return its parsed JSON."""
+    from app.agents.executor import run_agent_chat
+    from app.agents.registry import agent_instances
+
+    prompt = (
+f"Target Role: {role}\n"
+f"Location: {location}\n\n"
+
+"## YOUR TASK\n"
+"Use the 'search_job_trends' tool to research the job market for the above role and location. "
+"Important: call it ONCE with a `queries` list of at least 3 targeted searches — they run in parallel.\n"
+"For example:\n"
+f"  - '{role} jobs {location} 2025 salary'\n"
+f"  - 'top companies hiring {role} {location}'\n"
+f"  - '{role} in-demand skills {location} market trend'\n\n"
+
+"## SYNTHESIS RULES\n"
+"After searching, combine the search results with your own knowledge to produce grounded, specific answers:\n"
+"1. **top_skills**: 5 skills that are ACTUALLY IN DEMAND for this role in this location right now — not generic skills. "
+"Prioritize skills appearing in real job postings or hiring trends.\n"
+"2. **salary_range**: Give a realistic range in local currency with experience brackets if possible "
+"(e.g., '₹8–14 LPA for 0–2 yrs, ₹18–28 LPA for 3–5 yrs' for India). Do NOT give vague global averages.\n"
+"3. **top_companies**: List 5–8 real companies actively hiring for this role in the given location. "
+"Prioritize companies with recent job postings, not just famous names.\n"
+"4. **market_trend**: One of — 'Growing', 'Stable', or 'Declining'. "
+"Base this on hiring volume, layoff news, and industry signals from your search. Add a 1-sentence reason.\n\n"
+
+"## OUTPUT FORMAT\n"
+"Return ONLY a raw JSON dictionary — no markdown, no explanation, no preamble.\n"
+"Exact keys required:\n"
+"  'top_skills': [list of 5 strings],\n"
+"  'salary_range': string (location-specific, experience-aware),\n"
+"  'top_companies': [list of 5–8 strings],\n"
+"  'market_trend': string ('Growing', 'Stable', or 'Declining — reason in one sentence')\n"
+)
+
+    try:
+        # Pooled pair: search tool + termination check are registered once at build time
+        with agent_instances.checkout("market") as (user_proxy, market_agent):
+            raw_content = await run_agent_chat(
+                "market",
+                user_proxy,
+                market_agent,
+                message=prompt,
+                max_turns=5,  # Allow enough turns for tool calling
+            )
+    except Exception as exc:
+        logger.exception("market: AutoGen chat failed")
+        raise HTTPException(status_code=500, detail=f"Agent error: {str(exc)}")
+
+    if not raw_content:
+        raise HTTPException(status_code=500, detail="Market agent returned no response.")
+
+    try:
+        data = _parse_agent_json(raw_content)
+    except ValueError as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+    return data
+
+
 @router.get(
     "/trends",
     response_model=MarketTrendsResponse,
     summary="Fetch live job market trends for a role and location",
 )
 async def get_market_trends(
+    response: Response,
     role: str = Query(..., description="Target job role, e.g., 'Data Scientist'"),
     location: str = Query(..., description="Target location, e.g., 'United States' or 'Remote'"),
 ) -> MarketTrendsResponse:
     try:
         logger.info(f"market/trends: role='{role}' | location='{location}'")
 
-        from app.agents.registry import get_market_researcher, get_user_proxy
-        from app.tools.market_search import search_job_trends
-        from autogen import register_function
-
-        user_proxy = get_user_proxy()
-        market_agent = get_market_researcher()
-
-        # Register the search tool for the agents
-        register_function(
-            search_job_trends,
-            caller=market_agent,
-            executor=user_proxy,
-            name="search_job_trends",
-            description="Search the web for live job market trends, salaries, top skills, and hiring companies for a specific role and location."
+        # Fresh hits return directly; stale hits return immediately and refresh in the background.
+        # Concurrent misses for the same (role, location) share one agent run.
+        data, cache_status = await market_trends_cache.get_or_compute(
+            role,
+            location,
+            lambda: single_flight.do(
+                "market", normalize_market_key(role, location), lambda: _research_market(role, location)
+            ),
         )
-
-        prompt = (
-    f"Target Role: {role}\n"
-    f"Location: {location}\n\n"
-
-    "## YOUR TASK\n"
-    "Use the 'search_job_trends' tool to research the job market for the above role and location. "
-    "Important: perform at least 3 searches total before answering.\n"
-    "Run AT LEAST 2–3 targeted searches such as:\n"
-    f"  - '{role} jobs {location} 2025 salary'\n"
-    f"  - 'top companies hiring {role} {location}'\n"
-    f"  - '{role} in-demand skills {location} market trend'\n\n"
-
-    "## SYNTHESIS RULES\n"
-    "After searching, combine the search results with your own knowledge to produce grounded, specific answers:\n"
-    "1. **top_skills**: 5 skills that are ACTUALLY IN DEMAND for this role in this location right now — not generic skills. "
-    "Prioritize skills appearing in real job postings or hiring trends.\n"
-    "2. **salary_range**: Give a realistic range in local currency with experience brackets if possible "
-    "(e.g., '₹8–14 LPA for 0–2 yrs, ₹18–28 LPA for 3–5 yrs' for India). Do NOT give vague global averages.\n"
-    "3. **top_companies**: List 5–8 real companies actively hiring for this role in the given location. "
-    "Prioritize companies with recent job postings, not just famous names.\n"
-    "4. **market_trend**: One of — 'Growing', 'Stable', or 'Declining'. "
-    "Base this on hiring volume, layoff news, and industry signals from your search. Add a 1-sentence reason.\n\n"
-
-    "## OUTPUT FORMAT\n"
-    "Return ONLY a raw JSON dictionary — no markdown, no explanation, no preamble.\n"
-    "Exact keys required:\n"
-    "  'top_skills': [list of 5 strings],\n"
-    "  'salary_range': string (location-specific, experience-aware),\n"
-    "  'top_companies': [list of 5–8 strings],\n"
-    "  'market_trend': string ('Growing', 'Stable', or 'Declining — reason in one sentence')\n"
-)
-
-        # Terminate the conversation automatically if the agent returns the JSON schema
-        user_proxy._is_termination_msg = lambda x: (
-            x.get("content") and "top_skills" in x.get("content", "") and "market_trend" in x.get("content", "")
-        )
-
-        try:
-            user_proxy.initiate_chat(
-                market_agent,
-                message=prompt,
-                max_turns=5,  # Allow enough turns for tool calling
-            )
-        except Exception as exc:
-            logger.exception("market: AutoGen chat failed")
-            raise HTTPException(status_code=500, detail=f"Agent error: {str(exc)}")
-
-        try:
-            last_msg = user_proxy.last_message(market_agent)
-            raw_content = (last_msg.get("content") or "" if last_msg else "").strip()
-        except Exception:
-            messages = user_proxy.chat_messages.get(market_agent, [])
-            raw_content = next(
-                (m["content"] for m in reversed(messages) if (m.get("content") or "").strip()),
-                "",
-            )
-
-        if not raw_content:
-            raise HTTPException(status_code=500, detail="Market agent returned no response.")
-
-        try:
-            data = _parse_agent_json(raw_content)
-        except ValueError as exc:
-            raise HTTPException(status_code=500, detail=str(exc))
+        response.headers["X-Cache"] = cache_status.upper()
+        logger.info(f"market/trends: cache {cache_status} for role='{role}' | location='{location}'")
 
         return MarketTrendsResponse(
             role=role,
@@ -1,31 +1,65 @@
 """
 Resume API
-  POST /resume/upload  → Save PDF + extract text (no AI)
-  POST /resume/analyze → Upload PDF + run Resume Analyst Agent + return JSON
+  POST /resume/upload         → Save PDF + extract text (no AI)
+  POST /resume/analyze        → Upload PDF + run Resume Analyst Agent + return JSON
+  POST /resume/analyze/stream → Same analysis as Server-Sent Events: extraction
+                                stats first, then each top-level field as it completes
 """
+import hashlib
 import json
-import os
-import tempfile
-import uuid
 
-import pdfplumber
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.pdf_extraction import PDFExtractionTimeout, pdf_extractor
+from app.core.resume_condense import condense_resume
+from app.core.resume_cache import resume_cache
+from app.core.sse import sse_event, sse_response
+from app.models.models import User
 
 # Agents imported lazily inside endpoint to avoid slow startup
 
 router = APIRouter()
 
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024   # 5 MB
+_READ_CHUNK_BYTES = 64 * 1024
+
+
+async def _ingest_upload(file: UploadFile) -> tuple[bytearray, str]:
+    """
+    Stream the upload in chunks, enforcing the size limit and hashing as we go.
+
+    `file.size` is often missing (chunked uploads, some proxies), so the limit
+    is checked against the bytes actually read. Returns (pdf bytes, sha256 hex)
+    — chunks are appended into one buffer, so the upload is never held twice.
+    """
+    if file.size and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=400, detail="File too large. Max 5 MB.")
+
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    await file.seek(0)
+    while chunk := await file.read(_READ_CHUNK_BYTES):
+        if len(buffer) + len(chunk) > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=400, detail="File too large. Max 5 MB.")
+        digest.update(chunk)
+        buffer += chunk
+
+    return buffer, digest.hexdigest()
+
 
-def _extract_text_from_pdf(file_path: str) -> str:
-    """Extract plain text from a PDF file using pdfplumber."""
-    text_parts = []
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            t = page.extract_text()
-            if t:
-                text_parts.append(t)
-    return "\n".join(text_parts).strip()
+async def _extract_text_from_pdf(pdf_bytes: bytes | bytearray) -> str:
+    """Extract plain text from PDF bytes on the process-pooled extractor."""
+    try:
+        return await pdf_extractor.extract_text(pdf_bytes)
+    except PDFExtractionTimeout:
+        raise HTTPException(
+            status_code=422,
+            detail="PDF took too long to process. Try a smaller or simpler file.",
+        )
 
 
 def _parse_agent_response(raw: str) -> dict:
@@ -47,30 +81,48 @@ def _parse_agent_response(raw: str) -> dict:
         return {"raw_response": raw, "parse_error": "Could not parse JSON from agent"}
 
 
+def _build_analysis_prompt(resume_text: str) -> str:
+    """Resume_Analyst prompt (shared by the JSON + streaming analyze endpoints)."""
+    return (
+        "Analyze the following resume text and return ONLY a valid JSON object "
+        "(no extra commentary, no markdown). Include these core keys:\n"
+        "  technical_skills   : list of skill strings\n"
+        "  soft_skills        : list of soft-skill strings\n"
+        "  years_of_experience: float\n"
+        "  top_strengths      : list of exactly 3 strings\n"
+        "  skill_gaps         : list of exactly 5 strings\n"
+        "You may also include ATS-related fields if helpful, but the response must stay valid JSON.\n\n"
+        f"Resume:\n{condense_resume(resume_text)}"
+    )
+
+
 # ── POST /resume/upload ────────────────────────────────────────────────────────
 @router.post("/upload", summary="Upload PDF resume — extract text only (no AI)")
-async def upload_resume(file: UploadFile = File(...)):
+async def upload_resume(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Step 1 — Light endpoint: upload a PDF and get back the extracted raw text.
     No AI agent is called. Useful for a preview / word-count step.
+    Re-uploads of identical bytes are served from the content-hash cache.
     """
     try:
         if not file.filename or not file.filename.lower().endswith(".pdf"):
             raise HTTPException(status_code=400, detail="Only PDF files are accepted.")
 
-        if file.size and file.size > 5 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File too large. Max 5 MB.")
-
-        tmp_path = os.path.join(tempfile.gettempdir(), f"resume_{uuid.uuid4().hex}.pdf")
-        try:
-            contents = await file.read()
-            with open(tmp_path, "wb") as f:
-                f.write(contents)
-
-            resume_text = _extract_text_from_pdf(tmp_path)
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        pdf_bytes, content_hash = await _ingest_upload(file)
+        user_id = current_user.id
+        cached_row = await resume_cache.lookup(db, content_hash, user_id)
+        resume_text = resume_cache.cached_text(cached_row)
+        if not resume_text:
+            resume_text = await _extract_text_from_pdf(pdf_bytes)
+            if resume_text:
+                await resume_cache.store(
+                    db, user_id=user_id, filename=file.filename,
+                    content_hash=content_hash, raw_text=resume_text,
+                )
 
         if not resume_text:
             raise HTTPException(
@@ -81,6 +133,7 @@ async def upload_resume(file: UploadFile = File(...)):
         logger.info(f"resume/upload: extracted {len(resume_text)} chars from '{file.filename}'")
         return {
             "filename": file.filename,
+            "content_hash": content_hash,
             "char_count": len(resume_text),
             "preview": resume_text[:500],   # first 500 chars as a quick preview
             "full_text": resume_text,
@@ -94,31 +147,41 @@ async def upload_resume(file: UploadFile = File(...)):
 
 # ── POST /resume/analyze ───────────────────────────────────────────────────────
 @router.post("/analyze", summary="Upload PDF resume and get AI analysis")
-async def analyze_resume(file: UploadFile = File(...)):
+async def analyze_resume(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Upload a PDF resume → extract text → run Resume Analyst Agent → return JSON.
+    Extraction and analysis are served from the content-hash cache when the
+    same PDF was seen before (analysis only under the current prompt version).
     """
     try:
         # ── Validate file type ──────────────────────────────────────────────────
         if not file.filename or not file.filename.lower().endswith(".pdf"):
             raise HTTPException(status_code=400, detail="Only PDF files are accepted.")
 
-        if file.size and file.size > 5 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File too large. Max 5MB.")
+        # ── Stream + hash upload, then check the content-hash cache ─────────────
+        pdf_bytes, content_hash = await _ingest_upload(file)
+        user_id = current_user.id
+        cached_row = await resume_cache.lookup(db, content_hash, user_id)
+        resume_text = resume_cache.cached_text(cached_row)
 
-        # ── Save to temp file ───────────────────────────────────────────────────
-        tmp_path = os.path.join(tempfile.gettempdir(), f"resume_{uuid.uuid4().hex}.pdf")
-        try:
-            contents = await file.read()
-            with open(tmp_path, "wb") as f:
-                f.write(contents)
+        cached = resume_cache.cached_analysis(cached_row)
+        if resume_text and cached:
+            logger.info(f"resume/analyze: cache hit for '{file.filename}' ({content_hash[:12]})")
+            return {
+                "filename": file.filename,
+                "content_hash": content_hash,
+                "char_count": len(resume_text),
+                "analysis": cached,
+                "cached": True,
+            }
 
-            # ── Extract text ────────────────────────────────────────────────────
-            resume_text = _extract_text_from_pdf(tmp_path)
-        finally:
-            # Clean up temp file immediately after extraction (before agent call)
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        # ── Extract on the PDF process pool ─────────────────────────────────────
+        if not resume_text:
+            resume_text = await _extract_text_from_pdf(pdf_bytes)
 
         if not resume_text:
             raise HTTPException(
@@ -129,55 +192,123 @@ async def analyze_resume(file: UploadFile = File(...)):
         logger.info(f"resume/analyze: extracted {len(resume_text)} chars from '{file.filename}'")
 
         # ── Run Resume Analyst Agent ────────────────────────────────────────────
-        from app.agents.registry import get_resume_analyst, get_user_proxy  # lazy import
-        user_proxy = get_user_proxy()
-        analyst   = get_resume_analyst()
-
-        user_proxy.initiate_chat(
-            analyst,
-            message=(
-                "Analyze the following resume text and return ONLY a valid JSON object "
-                "(no extra commentary, no markdown). Include these core keys:\n"
-                "  technical_skills   : list of skill strings\n"
-                "  soft_skills        : list of soft-skill strings\n"
-                "  years_of_experience: float\n"
-                "  top_strengths      : list of exactly 3 strings\n"
-                "  skill_gaps         : list of exactly 5 strings\n"
-                "You may also include ATS-related fields if helpful, but the response must stay valid JSON.\n\n"
-                f"Resume:\n{resume_text[:6000]}"
-            ),
-            # max_turns=2: turn-1 = proxy sends message, turn-2 = agent replies
-            max_turns=2,
-        )
+        from app.agents.executor import run_one_shot
+        from app.agents.registry import agent_instances  # lazy import
 
-        # ── Extract response ────────────────────────────────────────────────────
-        try:
-            last_msg_obj = user_proxy.last_message(analyst)
-            last_agent_msg = last_msg_obj.get("content", "").strip() if last_msg_obj else None
-        except Exception:
-            # Fallback: scan manually for the agent's reply (role="user" in this context)
-            messages = user_proxy.chat_messages.get(analyst, [])
-            last_agent_msg = next(
-                (
-                    m["content"]
-                    for m in reversed(messages)
-                    if m.get("role") == "user" and m.get("content", "").strip()
-                ),
-                None,
+        with agent_instances.checkout("resume") as (user_proxy, analyst):
+            completion = await run_one_shot(
+                "resume",
+                user_proxy,
+                analyst,
+                message=_build_analysis_prompt(resume_text),
+                json_mode=True,
+                # max_turns=2: turn-1 = proxy sends message, turn-2 = agent replies
+                max_turns=2,
             )
+        last_agent_msg = completion.content
 
         if not last_agent_msg:
             raise HTTPException(status_code=500, detail="Agent did not return a response.")
 
         analysis = _parse_agent_response(last_agent_msg)
 
+        # Only well-formed analyses are worth serving again
+        await resume_cache.store(
+            db, user_id=user_id, filename=file.filename, content_hash=content_hash,
+            raw_text=resume_text, analysis=None if "parse_error" in analysis else analysis,
+        )
+
         return {
             "filename": file.filename,
+            "content_hash": content_hash,
             "char_count": len(resume_text),
             "analysis": analysis,
+            "cached": False,
+            "usage": completion.usage,
         }
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error in analyze_resume: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred while analyzing the resume.")
+
+
+# ── POST /resume/analyze/stream ────────────────────────────────────────────────
+@router.post("/analyze/stream", summary="Upload PDF resume and stream the AI analysis field by field")
+async def analyze_resume_stream(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Same input as /resume/analyze. Events:
+      stats → {"filename", "content_hash", "char_count", "cached"} — sent immediately
+      field → {"key", "value"} — one per top-level analysis key, as soon as it closes
+      done  → {"field_count"}
+      error → {"detail"}
+    Upload validation and extraction errors are still plain HTTP errors.
+    """
+    if not file.filename or not file.filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="Only PDF files are accepted.")
+
+    pdf_bytes, content_hash = await _ingest_upload(file)
+    user_id = current_user.id
+    filename = file.filename
+    cached_row = await resume_cache.lookup(db, content_hash, user_id)
+    resume_text = resume_cache.cached_text(cached_row)
+    cached = resume_cache.cached_analysis(cached_row) if resume_text else None
+    if not resume_text:
+        resume_text = await _extract_text_from_pdf(pdf_bytes)
+    if not resume_text:
+        raise HTTPException(
+            status_code=422,
+            detail="Could not extract text from PDF. Make sure it's not a scanned image.",
+        )
+    logger.info(f"resume/analyze/stream: {len(resume_text)} chars from '{filename}' (cached={bool(cached)})")
+
+    from app.agents.executor import stream_one_shot
+    from app.agents.json_stream import JSONStreamParser
+    from app.agents.registry import agent_instances  # lazy import
+
+    async def events():
+        yield sse_event("stats", {
+            "filename": filename,
+            "content_hash": content_hash,
+            "char_count": len(resume_text),
+            "cached": bool(cached),
+        })
+        try:
+            if cached:
+                for key, value in cached.items():
+                    yield sse_event("field", {"key": key, "value": value})
+                yield sse_event("done", {"field_count": len(cached)})
+                return
+
+            parser = JSONStreamParser()
+            sent = set()
+            with agent_instances.checkout("resume") as (_, analyst):
+                async for delta in stream_one_shot(
+                    "resume", analyst, _build_analysis_prompt(resume_text), json_mode=True
+                ):
+                    for key, value in parser.feed(delta):
+                        sent.add(key)
+                        yield sse_event("field", {"key": key, "value": value})
+
+            # Whatever the incremental scan missed (e.g. unparsable reply) comes from the full parse
+            analysis = _parse_agent_response(parser.text)
+            for key, value in analysis.items():
+                if key not in sent:
+                    yield sse_event("field", {"key": key, "value": value})
+
+            # The request-scoped session may already be closed while streaming
+            async with AsyncSessionLocal() as store_db:
+                await resume_cache.store(
+                    store_db, user_id=user_id, filename=filename, content_hash=content_hash,
+                    raw_text=resume_text, analysis=None if "parse_error" in analysis else analysis,
+                )
+            yield sse_event("done", {"field_count": len(analysis)})
+        except Exception as exc:
+            logger.error(f"Error in analyze_resume_stream: {exc}")
+            yield sse_event("error", {"detail": "An error occurred while analyzing the resume."})
+
+    return sse_response(events())
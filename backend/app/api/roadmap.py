@@ -1,13 +1,18 @@
 """
 Roadmap API
-  POST /roadmap/generate → Given target_role + skill_gaps, run Career Coach Agent
-                           and return a structured week-by-week learning plan.
+  POST /roadmap/generate        → Given target_role + skill_gaps, run Career Coach Agent
+                                  and return a structured week-by-week learning plan.
+  POST /roadmap/generate/stream → Same plan as Server-Sent Events, one `week` event
+                                  as soon as each week's JSON object closes.
 """
 import json
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from loguru import logger
 
+from app.core.single_flight import single_flight
+from app.core.sse import sse_event, sse_response
 # Agents imported lazily inside the endpoint to avoid slow startup
 from app.models.schemas import RoadmapRequest, RoadmapResponse, RoadmapWeek
 
@@ -113,6 +118,60 @@ def _normalise_week(raw_week: dict, idx: int) -> RoadmapWeek:
     )
 
 
+def _validate_request(body: RoadmapRequest) -> tuple[str, list[str]]:
+    """Strip inputs and reject empty role / gap lists with a 400."""
+    target_role = body.target_role.strip()
+    skill_gaps = [s.strip() for s in body.skill_gaps if s.strip()]
+
+    if not target_role:
+        raise HTTPException(status_code=400, detail="target_role must not be empty.")
+    if not skill_gaps:
+        raise HTTPException(status_code=400, detail="skill_gaps list must not be empty.")
+
+    return target_role, skill_gaps
+
+
+def _request_key(target_role: str, skill_gaps: list[str]) -> tuple:
+    """Normalized request identity for single-flight coalescing (gap order kept — it shapes the prompt)."""
+    def norm(value: str) -> str:
+        return " ".join(value.lower().split())
+    return norm(target_role), tuple(norm(g) for g in skill_gaps)
+
+
+def _build_prompt(target_role: str, skill_gaps: list[str]) -> str:
+    """Career_Coach prompt for an 8-week roadmap (shared by the JSON + streaming endpoints)."""
+    gaps_formatted = "\n".join(f"  {i+1}. {g}" for i, g in enumerate(skill_gaps))
+    return (
+        f"Target Role: {target_role}\n\n"
+        f"Candidate's Skill Gaps:\n{gaps_formatted}\n\n"
+
+        "## TASK\n"
+        "Generate a HYPER-SPECIFIC, DEEPLY PERSONALIZED 8-week learning roadmap to close the above skill gaps for the given Target Role.\n\n"
+
+        "## MANDATORY RULES — VIOLATING ANY DISQUALIFIES YOUR RESPONSE:\n"
+        "1. **NO GENERIC CONTENT**: Never suggest broad topics like 'Learn Python' or 'Study Databases'. "
+        "Always go deep — e.g., 'Async task queues with Celery + Redis Beat for scheduled jobs' or 'Row-level security in PostgreSQL using RLS policies'.\n"
+        "2. **WEEK-OVER-WEEK PROGRESSION**: Each week must build upon the last. Week 1 should lay foundations; Week 8 should be near production-level mastery.\n"
+        "3. **REAL, PRECISE RESOURCE LINKS**: Provide actual URLs to specific tutorials, GitHub repos, conference talks, or advanced documentation sections — NOT generic homepages.\n"
+        "   Good examples: 'https://www.youtube.com/watch?v=<id>', 'https://github.com/owner/repo', 'https://docs.framework.com/advanced/specific-topic'\n"
+        "4. **UNIQUE MINI-PROJECTS**: Every week must have a mini-project that is directly tied to that week's topic AND the Target Role. No vague tasks like 'build a CRUD app'.\n"
+        "5. **DIVERSE LEARNING FORMATS**: Rotate between: deep-dive articles, open-source code reading, video walkthroughs, hands-on labs, and paper reading.\n"
+        "6. **SKILLS GAP ALIGNMENT**: Every week must directly address at least one skill gap listed above. Annotate which gap is being addressed.\n\n"
+
+        "## OUTPUT FORMAT\n"
+        "Return ONLY a raw JSON array — no markdown fences, no explanation, no preamble.\n"
+        "Each element must have exactly these keys:\n"
+        "  - 'week' (int): Week number 1–8\n"
+        "  - 'topic' (str): Hyper-specific topic title, NOT a category name\n"
+        "  - 'skill_gap_addressed' (str): Which skill gap from the list above this week targets\n"
+        "  - 'resource_url' (str): Direct link to a specific, high-quality resource\n"
+        "  - 'learning_format' (str): One of — 'video', 'article', 'github-repo', 'interactive-lab', 'paper'\n"
+        "  - 'estimated_hours' (int): Realistic hours for that week (between 6–15)\n"
+        "  - 'mini_project' (str): A concrete, role-relevant deliverable for that week\n"
+        "  - 'success_criteria' (str): How the candidate knows they've mastered this week's content\n"
+    )
+
+
 # ── POST /roadmap/generate ─────────────────────────────────────────────────────
 @router.post(
     "/generate",
@@ -126,82 +185,40 @@ async def generate_roadmap(body: RoadmapRequest) -> RoadmapResponse:
     Output : RoadmapResponse with structured weekly milestones
     """
     try:
-        # ── Validate input ─────────────────────────────────────────────────────────
-        target_role = body.target_role.strip()
-        skill_gaps = [s.strip() for s in body.skill_gaps if s.strip()]
-
-        if not target_role:
-            raise HTTPException(status_code=400, detail="target_role must not be empty.")
-        if not skill_gaps:
-            raise HTTPException(status_code=400, detail="skill_gaps list must not be empty.")
+        target_role, skill_gaps = _validate_request(body)
 
         logger.info(
             f"roadmap/generate: role='{target_role}' | gaps={skill_gaps}"
         )
 
-        # ── Build prompt ────────────────────────────────────────────────────────────
-        gaps_formatted = "\n".join(f"  {i+1}. {g}" for i, g in enumerate(skill_gaps))
-        prompt = (
-    f"Target Role: {target_role}\n\n"
-    f"Candidate's Skill Gaps:\n{gaps_formatted}\n\n"
-
-    "## TASK\n"
-    "Generate a HYPER-SPECIFIC, DEEPLY PERSONALIZED 8-week learning roadmap to close the above skill gaps for the given Target Role.\n\n"
-
-    "## MANDATORY RULES — VIOLATING ANY DISQUALIFIES YOUR RESPONSE:\n"
-    "1. **NO GENERIC CONTENT**: Never suggest broad topics like 'Learn Python' or 'Study Databases'. "
-    "Always go deep — e.g., 'Async task queues with Celery + Redis Beat for scheduled jobs' or 'Row-level security in PostgreSQL using RLS policies'.\n"
-    "2. **WEEK-OVER-WEEK PROGRESSION**: Each week must build upon the last. Week 1 should lay foundations; Week 8 should be near production-level mastery.\n"
-    "3. **REAL, PRECISE RESOURCE LINKS**: Provide actual URLs to specific tutorials, GitHub repos, conference talks, or advanced documentation sections — NOT generic homepages.\n"
-    "   Good examples: 'https://www.youtube.com/watch?v=<id>', 'https://github.com/owner/repo', 'https://docs.framework.com/advanced/specific-topic'\n"
-    "4. **UNIQUE MINI-PROJECTS**: Every week must have a mini-project that is directly tied to that week's topic AND the Target Role. No vague tasks like 'build a CRUD app'.\n"
-    "5. **DIVERSE LEARNING FORMATS**: Rotate between: deep-dive articles, open-source code reading, video walkthroughs, hands-on labs, and paper reading.\n"
-    "6. **SKILLS GAP ALIGNMENT**: Every week must directly address at least one skill gap listed above. Annotate which gap is being addressed.\n\n"
-
-    "## OUTPUT FORMAT\n"
-    "Return ONLY a raw JSON array — no markdown fences, no explanation, no preamble.\n"
-    "Each element must have exactly these keys:\n"
-    "  - 'week' (int): Week number 1–8\n"
-    "  - 'topic' (str): Hyper-specific topic title, NOT a category name\n"
-    "  - 'skill_gap_addressed' (str): Which skill gap from the list above this week targets\n"
-    "  - 'resource_url' (str): Direct link to a specific, high-quality resource\n"
-    "  - 'learning_format' (str): One of — 'video', 'article', 'github-repo', 'interactive-lab', 'paper'\n"
-    "  - 'estimated_hours' (int): Realistic hours for that week (between 6–15)\n"
-    "  - 'mini_project' (str): A concrete, role-relevant deliverable for that week\n"
-    "  - 'success_criteria' (str): How the candidate knows they've mastered this week's content\n"
-)
+        prompt = _build_prompt(target_role, skill_gaps)
 
         # ── Run Career Coach Agent ──────────────────────────────────────────────────
-        from app.agents.registry import get_career_coach, get_user_proxy  # lazy import
-        user_proxy = get_user_proxy()
-        coach = get_career_coach()
+        from app.agents.executor import run_one_shot
+        from app.agents.registry import agent_instances  # lazy import
+
+        async def _run_coach():
+            with agent_instances.checkout("roadmap") as (user_proxy, coach):
+                return await run_one_shot(
+                    "roadmap",
+                    user_proxy,
+                    coach,
+                    message=prompt,
+                    max_turns=2,   # turn 1 = proxy sends, turn 2 = coach replies
+                )
 
         try:
-            user_proxy.initiate_chat(
-                coach,
-                message=prompt,
-                max_turns=2,   # turn 1 = proxy sends, turn 2 = coach replies
-            )
+            # Identical concurrent requests share one Career_Coach run
+            completion = await single_flight.do("roadmap", _request_key(target_role, skill_gaps), _run_coach)
+            raw_content = completion.content
         except Exception as exc:
             logger.exception("roadmap: AutoGen chat failed")
             raise HTTPException(status_code=500, detail=f"Agent error: {str(exc)}")
 
-        # ── Extract agent reply ─────────────────────────────────────────────────────
-        try:
-            last_msg = user_proxy.last_message(coach)
-            raw_content = (last_msg.get("content") or "" if last_msg else "").strip()
-        except Exception:
-            # Fallback — scan chat_messages manually
-            messages = user_proxy.chat_messages.get(coach, [])
-            raw_content = next(
-                (m["content"] for m in reversed(messages) if (m.get("content") or "").strip()),
-                "",
-            )
-
         if not raw_content:
             raise HTTPException(status_code=500, detail="Career Coach agent returned no response.")
 
-        logger.info(f"roadmap: agent raw reply length={len(raw_content)} chars")
+        logger.info(f"roadmap: agent raw reply length={len(raw_content)} chars, usage={completion.usage}")
 
         # ── Parse + normalise ───────────────────────────────────────────────────────
         try:
@@ -229,3 +246,57 @@ async def generate_roadmap(body: RoadmapRequest) -> RoadmapResponse:
     except Exception as e:
         logger.error(f"Error in generate_roadmap: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred while generating the roadmap.")
+
+
+# ── POST /roadmap/generate/stream ──────────────────────────────────────────────
+
+@router.post(
+    "/generate/stream",
+    summary="Stream a week-by-week career learning roadmap as Server-Sent Events",
+)
+async def generate_roadmap_stream(body: RoadmapRequest) -> StreamingResponse:
+    """
+    Same input as /roadmap/generate. Events:
+      week  → one normalised RoadmapWeek, emitted as soon as its object closes
+      done  → {"target_role", "week_count"}
+      error → {"detail"}
+    """
+    target_role, skill_gaps = _validate_request(body)
+    prompt = _build_prompt(target_role, skill_gaps)
+    logger.info(f"roadmap/generate/stream: role='{target_role}' | gaps={skill_gaps}")
+
+    from app.agents.executor import stream_one_shot
+    from app.agents.json_stream import JSONStreamParser
+    from app.agents.registry import agent_instances  # lazy import
+
+    async def events():
+        parser = JSONStreamParser()
+        emitted = 0
+        try:
+            with agent_instances.checkout("roadmap") as (_, coach):
+                async for delta in stream_one_shot("roadmap", coach, prompt):
+                    for raw_week in parser.feed(delta):
+                        if not isinstance(raw_week, dict):
+                            continue
+                        week = _normalise_week(raw_week, emitted)
+                        week.week = emitted + 1
+                        emitted += 1
+                        yield sse_event("week", week.model_dump())
+
+            # Not a bare array (e.g. {"weeks": [...]}) — fall back to the full parse
+            if not emitted:
+                for idx, raw_week in enumerate(_parse_agent_json(parser.text)):
+                    week = _normalise_week(raw_week, idx)
+                    week.week = idx + 1
+                    emitted += 1
+                    yield sse_event("week", week.model_dump())
+
+            if not emitted:
+                raise ValueError("Agent returned an empty roadmap.")
+            logger.info(f"roadmap/generate/stream: streamed {emitted}-week roadmap for '{target_role}'")
+            yield sse_event("done", {"target_role": target_role, "week_count": emitted})
+        except Exception as exc:
+            logger.error(f"Error in generate_roadmap_stream: {exc}")
+            yield sse_event("error", {"detail": "An error occurred while generating the roadmap."})
+
+    return sse_response(events())
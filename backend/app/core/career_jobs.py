@@ -0,0 +1,330 @@
+"""
+Career Job Queue — background execution of /career/full-analysis.
+
+A full analysis takes long enough to hit proxy timeouts, so clients can submit
+it as a job instead: the row in `career_analysis_jobs` is the source of truth
+(status, per-stage results, final result), while an in-process asyncio queue
+feeds CAREER_JOB_CONCURRENCY worker tasks.
+
+  - Submissions beyond CAREER_JOB_MAX_QUEUED are rejected (the caller 503s).
+  - Workers claim a job with a conditional UPDATE, so a job is only ever run
+    once even if several processes share the table.
+  - `subscribe(job_id)` yields status updates for SSE clients; everyone else
+    polls the row. A job run by another process never notifies this one, so
+    subscribers also re-read the row every CAREER_JOB_STREAM_POLL_SECONDS and
+    give up after CAREER_JOB_STREAM_TIMEOUT with a "timeout" event.
+  - A running job's worker refreshes `heartbeat_at` every lease/3 seconds.
+    Jobs whose heartbeat is older than CAREER_JOB_LEASE_SECONDS belong to a
+    dead process and are marked failed — at startup and periodically after —
+    so a second worker process or a rolling restart never fails a live job.
+  - On startup, jobs left "queued" are re-enqueued.
+"""
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
+
+from loguru import logger
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.models import CareerAnalysisJob
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+class QueueFull(Exception):
+    """Raised by `submit` when CAREER_JOB_MAX_QUEUED jobs are already waiting."""
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def job_snapshot(job: CareerAnalysisJob) -> dict:
+    """Public view of a job row (what poll + subscribe return)."""
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "target_role": job.target_role,
+        "location": job.location,
+        "stage_results": job.stage_results or {},
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+    }
+
+
+class CareerJobQueue:
+    """DB-backed job table + in-process worker tasks with bounded concurrency."""
+
+    def __init__(
+        self,
+        concurrency: int,
+        max_queued: int,
+        lease_seconds: int = 60,
+        poll_seconds: float = 5.0,
+        stream_timeout: float = 1800.0,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.max_queued = max_queued
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.stream_timeout = stream_timeout
+        self._queue: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+        self._reaper: asyncio.Task | None = None
+        self._subscribers: dict[str, list[asyncio.Queue]] = {}
+        self._lock = threading.Lock()
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "orphaned": 0}
+        self._running = 0
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    def _ensure_workers(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(i), name=f"career-job-worker-{i}")
+                for i in range(self.concurrency)
+            ]
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_periodically(), name="career-job-reaper")
+        return self._queue
+
+    # ── Submission ────────────────────────────────────────────────────────────
+    async def submit(self, *, user_id: str, target_role: str, location: str, resume_text: str) -> CareerAnalysisJob:
+        """Persist a new job and enqueue it. Raises QueueFull when the backlog is at its cap."""
+        queue = self._ensure_workers()
+        if queue.qsize() >= self.max_queued:
+            self._count("rejected")
+            raise QueueFull(f"{queue.qsize()} career analyses already queued")
+
+        job = CareerAnalysisJob(
+            user_id=user_id,
+            target_role=target_role,
+            location=location,
+            resume_text=resume_text,
+            status="queued",
+            stage_results={},
+        )
+        async with AsyncSessionLocal() as db:
+            db.add(job)
+            await db.commit()
+        self._count("submitted")
+        queue.put_nowait(job.id)
+        return job
+
+    async def get(self, job_id: str) -> CareerAnalysisJob | None:
+        async with AsyncSessionLocal() as db:
+            return await db.get(CareerAnalysisJob, job_id)
+
+    # ── Subscriptions ─────────────────────────────────────────────────────────
+    def _publish(self, job_id: str, event: dict) -> None:
+        for q in self._subscribers.get(job_id, []):
+            q.put_nowait(event)
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[dict]:
+        """
+        Yield the job's current snapshot, then every update until it finishes.
+        Registering before reading the row means no update can slip between them.
+        When no notification arrives for `poll_seconds` (the job may be running
+        in another process) the row is re-read and a fresh snapshot yielded if
+        it changed; after `stream_timeout` a final "timeout" event ends the stream.
+        """
+        q: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, []).append(q)
+        try:
+            job = await self.get(job_id)
+            if job is None:
+                return
+            yield job_snapshot(job)
+            status, stages = job.status, set(job.stage_results or {})
+            deadline = asyncio.get_running_loop().time() + self.stream_timeout
+            while status not in TERMINAL_STATUSES:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    yield {"job_id": job_id, "status": "timeout"}
+                    return
+                try:
+                    event = await asyncio.wait_for(q.get(), timeout=min(self.poll_seconds, remaining))
+                except asyncio.TimeoutError:
+                    job = await self.get(job_id)
+                    if job is None or (job.status == status and set(job.stage_results or {}) == stages):
+                        continue
+                    event = job_snapshot(job)
+                    stages = set(event["stage_results"])
+                status = event.get("status", status)
+                if "stage" in event:
+                    stages.add(event["stage"])
+                yield event
+        finally:
+            subscribers = self._subscribers.get(job_id, [])
+            if q in subscribers:
+                subscribers.remove(q)
+            if not subscribers:
+                self._subscribers.pop(job_id, None)
+
+    # ── Workers ───────────────────────────────────────────────────────────────
+    async def _claim(self, job_id: str) -> CareerAnalysisJob | None:
+        async with AsyncSessionLocal() as db:
+            claimed = await db.execute(
+                update(CareerAnalysisJob)
+                .where(CareerAnalysisJob.id == job_id, CareerAnalysisJob.status == "queued")
+                .values(status="running", started_at=_now(), heartbeat_at=_now())
+            )
+            await db.commit()
+            if claimed.rowcount != 1:
+                return None
+            return await db.get(CareerAnalysisJob, job_id)
+
+    async def _update(self, job_id: str, **values) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(CareerAnalysisJob).where(CareerAnalysisJob.id == job_id).values(**values))
+            await db.commit()
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self._update(job_id, heartbeat_at=_now())
+            except Exception as exc:
+                logger.warning(f"career job {job_id}: heartbeat failed — {exc}")
+
+    async def _run(self, job_id: str) -> None:
+        from app.api.career import run_career_analysis  # lazy — avoids an api ↔ core import cycle
+
+        job = await self._claim(job_id)
+        if job is None:
+            return
+        self._publish(job_id, {"job_id": job_id, "status": "running"})
+        stage_results: dict = {}
+
+        async def on_stage(stage: str, output, ms: float) -> None:
+            if isinstance(output, str):
+                try:
+                    output = json.loads(output.split("```json")[-1].split("```")[0])
+                except json.JSONDecodeError:
+                    pass
+            stage_results[stage] = {"output": output, "ms": ms}
+            await self._update(job_id, stage_results=dict(stage_results))
+            self._publish(job_id, {"job_id": job_id, "status": "running", "stage": stage, **stage_results[stage]})
+
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            response = await run_career_analysis(job.resume_text, job.target_role, job.location, on_stage=on_stage)
+            result = response.model_dump()
+            await self._update(job_id, status="completed", result=result, completed_at=_now())
+            self._count("completed")
+            self._publish(job_id, {"job_id": job_id, "status": "completed", "result": result})
+        except Exception as exc:
+            logger.exception(f"career job {job_id} failed")
+            await self._update(job_id, status="failed", error=str(exc), completed_at=_now())
+            self._count("failed")
+            self._publish(job_id, {"job_id": job_id, "status": "failed", "error": str(exc)})
+        finally:
+            heartbeat.cancel()
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            with self._lock:
+                self._running += 1
+            try:
+                await self._run(job_id)
+            except Exception as exc:
+                # Never let one job take the worker down
+                logger.error(f"career job worker {index}: {job_id} crashed — {exc}")
+            finally:
+                with self._lock:
+                    self._running -= 1
+                self._queue.task_done()
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+    async def fail_orphaned(self) -> int:
+        """Mark failed the running jobs whose heartbeat lapsed (their process died). Returns the count."""
+        cutoff = _now() - timedelta(seconds=self.lease_seconds)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(CareerAnalysisJob)
+                .where(
+                    CareerAnalysisJob.status == "running",
+                    CareerAnalysisJob.heartbeat_at.is_(None) | (CareerAnalysisJob.heartbeat_at < cutoff),
+                )
+                .values(status="failed", error="Interrupted: the worker running it stopped.", completed_at=_now())
+            )
+            await db.commit()
+        orphaned = max(result.rowcount or 0, 0)
+        if orphaned:
+            with self._lock:
+                self._counters["orphaned"] += orphaned
+            logger.warning(f"career jobs: marked {orphaned} orphaned running job(s) failed")
+        return orphaned
+
+    async def _reap_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds)
+            try:
+                await self.fail_orphaned()
+            except Exception as exc:
+                logger.warning(f"career jobs: orphan sweep failed — {exc}")
+
+    async def recover(self) -> None:
+        """Re-enqueue jobs still queued from a previous run; fail running ones whose lease expired."""
+        try:
+            await self.fail_orphaned()
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(CareerAnalysisJob.id)
+                    .where(CareerAnalysisJob.status == "queued")
+                    .order_by(CareerAnalysisJob.created_at)
+                )
+                job_ids = result.scalars().all()
+        except Exception as exc:
+            logger.warning(f"career jobs: recovery skipped — {exc}")
+            return
+        # Workers + the orphan sweep start now, not on first submit — a job
+        # orphaned just before this restart still has a fresh heartbeat
+        queue = self._ensure_workers()
+        if job_ids:
+            for job_id in job_ids:
+                queue.put_nowait(job_id)
+            logger.info(f"career jobs: re-enqueued {len(job_ids)} queued job(s)")
+
+    async def shutdown(self) -> None:
+        tasks = self._workers + ([self._reaper] if self._reaper is not None else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._reaper = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "queued": self._queue.qsize() if self._queue is not None else 0,
+                "running": self._running,
+                "concurrency": self.concurrency,
+                "max_queued": self.max_queued,
+                "lease_s": self.lease_seconds,
+                "stream_poll_s": self.poll_seconds,
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+            }
+
+
+# Single global instance
+career_jobs = CareerJobQueue(
+    concurrency=settings.CAREER_JOB_CONCURRENCY,
+    max_queued=settings.CAREER_JOB_MAX_QUEUED,
+    lease_seconds=settings.CAREER_JOB_LEASE_SECONDS,
+    poll_seconds=settings.CAREER_JOB_STREAM_POLL_SECONDS,
+    stream_timeout=settings.CAREER_JOB_STREAM_TIMEOUT,
+)
@@ -31,14 +31,92 @@ class Settings:
 
     # ── Database ──────────────────────────────────────────────────────────────
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./dev.db")
+    # Optional explicit asyncio URL; derived from DATABASE_URL when empty
+    # (sqlite → sqlite+aiosqlite, postgresql → postgresql+asyncpg)
+    DATABASE_ASYNC_URL: str = os.getenv("DATABASE_ASYNC_URL", "")
 
     # ── Auth ──────────────────────────────────────────────────────────────────
     SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-secret-change-in-prod")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+    # bcrypt cost factor — existing hashes are upgraded on next successful login
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    # Worker processes dedicated to bcrypt hash/verify
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
 
     # ── Bing Search (Day 5 — optional) ───────────────────────────────────────
     BING_SEARCH_API_KEY: str = os.getenv("BING_SEARCH_API_KEY", "")
 
+    # ── Market Search Tool ────────────────────────────────────────────────────
+    # Results per query + how long a normalized query's results are reused (s)
+    SEARCH_MAX_RESULTS: int = int(os.getenv("SEARCH_MAX_RESULTS", "3"))
+    SEARCH_CACHE_TTL: int = int(os.getenv("SEARCH_CACHE_TTL", str(60 * 60)))
+
+    # ── Agent Execution Pool ──────────────────────────────────────────────────
+    # Worker threads for blocking AutoGen chats + per-provider concurrency caps.
+    # AGENT_PROVIDER_LIMITS format: "groq=4,openai=8,azure=8"
+    AGENT_POOL_SIZE: int = int(os.getenv("AGENT_POOL_SIZE", "8"))
+    AGENT_PROVIDER_LIMITS: str = os.getenv("AGENT_PROVIDER_LIMITS", "groq=4,openai=8,azure=8")
+
+    # Execution mode per endpoint: "thread" (AutoGen chat on the worker pool) or
+    # "async" (native asyncio LLM client). Format: "resume=async,market=thread"
+    AGENT_EXECUTION_MODE: str = os.getenv("AGENT_EXECUTION_MODE", "thread")
+    AGENT_EXECUTION_MODES: str = os.getenv("AGENT_EXECUTION_MODES", "")
+
+    # /career/full-analysis: "groupchat" (sequential AutoGen GroupChat) or "dag" (resume ∥ market → coach)
+    CAREER_PIPELINE: str = os.getenv("CAREER_PIPELINE", "groupchat")
+
+    # Background /career/full-analysis/jobs: worker tasks and max waiting jobs
+    CAREER_JOB_CONCURRENCY: int = int(os.getenv("CAREER_JOB_CONCURRENCY", "2"))
+    CAREER_JOB_MAX_QUEUED: int = int(os.getenv("CAREER_JOB_MAX_QUEUED", "100"))
+    # A running job whose heartbeat is older than this is treated as orphaned (its process died)
+    CAREER_JOB_LEASE_SECONDS: int = int(os.getenv("CAREER_JOB_LEASE_SECONDS", "60"))
+    # SSE subscribers re-read the job row this often (jobs run by another process
+    # never notify this one) and stop with a "timeout" event after the timeout
+    CAREER_JOB_STREAM_POLL_SECONDS: float = float(os.getenv("CAREER_JOB_STREAM_POLL_SECONDS", "5"))
+    CAREER_JOB_STREAM_TIMEOUT: float = float(os.getenv("CAREER_JOB_STREAM_TIMEOUT", "1800"))
+
+    # Idle pre-built agents kept per type (resume, roadmap, market, linkedin)
+    AGENT_INSTANCE_POOL_SIZE: int = int(os.getenv("AGENT_INSTANCE_POOL_SIZE", "8"))
+
+    # ── Interview Sessions ────────────────────────────────────────────────────
+    # Live interviews kept in memory (LRU beyond the cap, dropped after idle TTL)
+    INTERVIEW_MAX_SESSIONS: int = int(os.getenv("INTERVIEW_MAX_SESSIONS", "500"))
+    INTERVIEW_SESSION_TTL: int = int(os.getenv("INTERVIEW_SESSION_TTL", str(30 * 60)))
+    # "full" transcript, or opt into "compact" (last exchange verbatim + rolling summary with scores)
+    INTERVIEW_CONTEXT_MODE: str = os.getenv("INTERVIEW_CONTEXT_MODE", "full")
+    # Sentences synthesised at once when a client asks for pipelined TTS (?tts=pipelined)
+    TTS_PIPELINE_CONCURRENCY: int = int(os.getenv("TTS_PIPELINE_CONCURRENCY", "3"))
+
+    # ── TTS Cache ─────────────────────────────────────────────────────────────
+    # Clips keyed on (voice, normalized text hash, format); empty dir = memory tier only
+    TTS_CACHE_DIR: str = os.getenv("TTS_CACHE_DIR", "./tts_cache")
+    TTS_CACHE_MEMORY_MB: int = int(os.getenv("TTS_CACHE_MEMORY_MB", "32"))
+    TTS_CACHE_DISK_MB: int = int(os.getenv("TTS_CACHE_DISK_MB", "256"))
+    # Preload the most recently spoken disk clips into memory at startup
+    TTS_CACHE_WARMUP: bool = os.getenv("TTS_CACHE_WARMUP", "false").lower() == "true"
+
+    # ── Resume Condensation ───────────────────────────────────────────────────
+    # Max tokens of resume text sent to an agent (sections kept by priority)
+    RESUME_TOKEN_BUDGET: int = int(os.getenv("RESUME_TOKEN_BUDGET", "1500"))
+
+    # ── LLM Response Cache ────────────────────────────────────────────────────
+    # Opt-in per endpoint, e.g. "resume,linkedin". The interview is never cached.
+    LLM_CACHE_ENDPOINTS: str = os.getenv("LLM_CACHE_ENDPOINTS", "")
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "./llm_cache.db")
+    LLM_CACHE_TTL: int = int(os.getenv("LLM_CACHE_TTL", str(24 * 60 * 60)))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+    # ── Market Trends Cache (stale-while-revalidate) ─────────────────────────
+    # Served directly while fresh; served stale + refreshed in the background until stale window ends
+    MARKET_CACHE_FRESH_SECONDS: int = int(os.getenv("MARKET_CACHE_FRESH_SECONDS", str(6 * 60 * 60)))
+    MARKET_CACHE_STALE_SECONDS: int = int(os.getenv("MARKET_CACHE_STALE_SECONDS", str(3 * 24 * 60 * 60)))
+    MARKET_CACHE_MAX_ENTRIES: int = int(os.getenv("MARKET_CACHE_MAX_ENTRIES", "500"))
+
+    # ── PDF Extraction ────────────────────────────────────────────────────────
+    # Worker processes for pdfplumber page extraction + per-document timeout (s)
+    PDF_EXTRACT_WORKERS: int = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PDF_EXTRACT_TIMEOUT: float = float(os.getenv("PDF_EXTRACT_TIMEOUT", "20"))
+
     # ── App ───────────────────────────────────────────────────────────────────
     APP_ENV: str = os.getenv("APP_ENV", "development")
     DEBUG: bool = APP_ENV == "development"
@@ -89,6 +167,53 @@ class Settings:
                 "cache_seed": None, # Disable caching for diverse outputs
             }
 
+    @property
+    def agent_provider_limits(self) -> dict[str, int]:
+        """Parses AGENT_PROVIDER_LIMITS into {provider: max concurrent chats}."""
+        limits = {}
+        for pair in self.AGENT_PROVIDER_LIMITS.split(","):
+            name, _, value = pair.partition("=")
+            if name.strip() and value.strip().isdigit():
+                limits[name.strip().lower()] = max(1, int(value))
+        return limits
+
+    def execution_mode(self, endpoint: str) -> str:
+        """
+        Returns "thread", "async" or "single" for the given endpoint
+        (resume, roadmap, market, linkedin, career). "single" — one prompt,
+        one completion — only applies to the one-shot agents; elsewhere it
+        falls back to "async". The career GroupChat is always "thread":
+        AutoGen's async group chat still runs each completion on the loop's
+        default executor, outside the agent pool — CAREER_PIPELINE=dag is the
+        async route for it.
+        """
+        if endpoint == "career":
+            return "thread"
+        modes = {}
+        for pair in self.AGENT_EXECUTION_MODES.split(","):
+            name, _, value = pair.partition("=")
+            if name.strip():
+                modes[name.strip().lower()] = value.strip().lower()
+        mode = modes.get(endpoint, self.AGENT_EXECUTION_MODE.lower())
+        if mode == "single" and endpoint not in ("resume", "roadmap", "linkedin"):
+            return "async"
+        return mode if mode in ("thread", "async", "single") else "thread"
+
+    @property
+    def career_pipeline(self) -> str:
+        """Returns "dag" or "groupchat" for /career/full-analysis."""
+        mode = self.CAREER_PIPELINE.strip().lower()
+        return mode if mode in ("dag", "groupchat") else "groupchat"
+
+    @property
+    def llm_cache_endpoints(self) -> set[str]:
+        """Endpoints whose agent replies may be served from the LLM response cache."""
+        return {
+            name.strip().lower()
+            for name in self.LLM_CACHE_ENDPOINTS.split(",")
+            if name.strip() and name.strip().lower() != "interview"
+        }
+
     @property
     def is_configured(self) -> bool:
         """Returns True if the required API key is set."""
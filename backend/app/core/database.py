@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -17,15 +18,41 @@ engine = create_engine(
 # ─── Session ───────────────────────────────────────────────────────────────────
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+# ─── Async Engine ──────────────────────────────────────────────────────────────
+# Same database through an asyncio driver (aiosqlite locally, asyncpg for
+# Postgres) so request handlers never block the event loop on DB round-trips.
+# The sync engine above stays for Alembic and thread-pool work.
+def _async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its asyncio driver."""
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return url.replace(prefix, "postgresql+asyncpg://", 1)
+    return url
+
+
+async_engine = create_async_engine(
+    settings.DATABASE_ASYNC_URL or _async_database_url(settings.DATABASE_URL),
+    echo=settings.DEBUG,
+)
+
+# expire_on_commit=False → attributes stay readable after commit without an
+# implicit (blocking) lazy refresh.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # ─── Base ──────────────────────────────────────────────────────────────────────
 Base = declarative_base()
 
 
 # ─── Dependency (use in FastAPI routes via Depends) ────────────────────────────
-def get_db():
-    """Yield a DB session and ensure it's closed after the request."""
-    db = SessionLocal()
-    try:
+async def get_db():
+    """Yield an AsyncSession and ensure it's closed after the request."""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
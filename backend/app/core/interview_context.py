@@ -0,0 +1,125 @@
+"""
+Interview Context — what the Interviewer sees on each turn.
+
+Sending the whole transcript means every verbose FEEDBACK / IDEAL ANSWER block
+is re-sent on every later turn, so turn 7 costs several times what turn 1 did.
+In "compact" mode (INTERVIEW_CONTEXT_MODE) only the last exchange — the
+interviewer's latest message and the candidate's answer to it — is sent
+verbatim. Every earlier exchange is folded into a one-line rolling summary
+(question, abridged answer, score), which keeps each turn's prompt roughly
+constant while preserving the per-question scores the final evaluation needs.
+
+Summary lines are cached on the session (`session_data["summary"]`), so each
+exchange is summarised once; the numeric scores are kept alongside them
+(`session_data["summary_scores"]`) so the running total never re-parses text
+that quotes the question or the candidate's answer.
+"""
+import re
+
+from app.core.config import settings
+
+_EVAL_LABEL = re.compile(r"^\s*(FEEDBACK|IDEAL ANSWER|SCORE|COMPLEXITY)\s*:", re.IGNORECASE | re.MULTILINE)
+_QUESTION_NUMBER = re.compile(r"^\W*(?:Q|Question)\s*#?\s*(\d+)\b\W*", re.IGNORECASE)
+_SCORE = re.compile(r"SCORE\s*:\s*\[?\s*(\d+(?:\.\d+)?)\s*/\s*10\s*\]?\s*(?:[—-]\s*(.*))?", re.IGNORECASE)
+
+_QUESTION_CHARS = 240
+_ANSWER_CHARS = 200
+
+
+def _abridge(text: str, limit: int) -> str:
+    text = re.sub(r"\s+", " ", text).strip()
+    return text if len(text) <= limit else text[: limit - 1].rstrip() + "…"
+
+
+def _question_part(interviewer_msg: str) -> str:
+    """The new question in an interviewer message, i.e. whatever follows the evaluation block."""
+    labels = list(_EVAL_LABEL.finditer(interviewer_msg))
+    if not labels:
+        return interviewer_msg
+    # Skip past the last labelled line (and its paragraph)
+    rest = interviewer_msg[labels[-1].end():]
+    _, _, after = rest.partition("\n\n")
+    return after or rest.partition("\n")[2] or interviewer_msg
+
+
+def _score(interviewer_msg: str) -> str | None:
+    match = _SCORE.search(interviewer_msg)
+    if not match:
+        return None
+    reason = f" ({_abridge(match.group(2), 80)})" if match.group(2) else ""
+    return f"{match.group(1)}/10{reason}"
+
+
+def question_score(interviewer_msg: str) -> float | None:
+    """The 0-10 score the interviewer gave the previous answer, if the message has one."""
+    match = _SCORE.search(interviewer_msg)
+    return float(match.group(1)) if match else None
+
+
+def _exchanges(history: list[dict]) -> list[tuple[str, list[str]]]:
+    """Group the transcript into (interviewer message, [candidate replies]) exchanges."""
+    exchanges: list[tuple[str, list[str]]] = []
+    for msg in history:
+        if msg["role"] == "interviewer":
+            exchanges.append((msg["content"], []))
+        else:
+            if not exchanges:
+                exchanges.append(("", []))
+            exchanges[-1][1].append(msg["content"])
+    return exchanges
+
+
+def _question_label(question: str) -> tuple[str, str]:
+    """("Q3", rest of text) when the interviewer numbered the question, else ("Follow-up", text) — hints, probes."""
+    match = _QUESTION_NUMBER.match(question)
+    if not match:
+        return "Follow-up", question
+    return f"Q{match.group(1)}", question[match.end():]
+
+
+def _summary_line(exchange: tuple[str, list[str]], evaluation: str) -> str:
+    question, answers = exchange
+    label, text = _question_label(_question_part(question).strip())
+    score = _score(evaluation) or "not scored"
+    return (
+        f"{label}: {_abridge(text, _QUESTION_CHARS)} | "
+        f"Answer: {_abridge(' '.join(answers), _ANSWER_CHARS) or '(none)'} | Score: {score}"
+    )
+
+
+def build_llm_messages(session_data: dict) -> list[dict]:
+    """OpenAI-style messages for the next Interviewer turn, full or compacted per config."""
+    history = session_data["history"]
+    if settings.INTERVIEW_CONTEXT_MODE.lower() != "compact":
+        return [
+            {"role": "assistant" if m["role"] == "interviewer" else "user", "content": m["content"]}
+            for m in history
+        ]
+
+    exchanges = _exchanges(history)
+    summary: list[str] = session_data.setdefault("summary", [])
+    scores: list[float | None] = session_data.setdefault("summary_scores", [])
+    # Exchange j is complete once exchange j+1's interviewer message (its evaluation) exists
+    for j in range(len(summary), len(exchanges) - 1):
+        evaluation = exchanges[j + 1][0]
+        summary.append(_summary_line(exchanges[j], evaluation))
+        scores.append(question_score(evaluation))
+
+    messages = []
+    if summary:
+        # Only scored exchanges count — a hint or follow-up adds nothing to either side
+        scored = [s for s in scores if s is not None]
+        messages.append({
+            "role": "user",
+            "content": (
+                "[Interview so far — earlier questions, abridged answers and the scores you gave]\n"
+                + "\n".join(summary)
+                + f"\nRunning total: {sum(scored):g}/{len(scored) * 10}"
+            ),
+        })
+    if exchanges:
+        question, answers = exchanges[-1]
+        if question:
+            messages.append({"role": "assistant", "content": question})
+        messages.extend({"role": "user", "content": a} for a in answers)
+    return messages
@@ -0,0 +1,128 @@
+"""
+Interview Session Store — bounded in-memory state for live interviews.
+
+Each live interview keeps its Interviewer agent plus the transcript in memory
+between websocket turns. The store caps that at INTERVIEW_MAX_SESSIONS entries
+(least-recently-used first out) and drops sessions idle for longer than
+INTERVIEW_SESSION_TTL seconds, so a long-running worker stays at flat memory.
+An evicted session is simply rebuilt from `interview_messages` on reconnect.
+
+Sessions with a socket attached are never evicted, and each session has an
+asyncio lock so two sockets on one id cannot interleave turns.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from app.core.config import settings
+
+
+@dataclass
+class SessionEntry:
+    data: dict                     # history, seq, question_count, agent, ...
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_used: float = field(default_factory=time.monotonic)
+    connections: int = 0
+
+    @property
+    def approx_bytes(self) -> int:
+        """Rough transcript footprint — the part that grows with the interview."""
+        return sum(len(m.get("content") or "") for m in self.data.get("history", []))
+
+
+class InterviewSessionStore:
+    """LRU + idle-TTL bounded map of session id → SessionEntry."""
+
+    def __init__(self, max_sessions: int, idle_ttl_seconds: int):
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._entries: OrderedDict[str, SessionEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"created": 0, "reused": 0, "evicted_lru": 0, "evicted_idle": 0}
+
+    def _evict(self) -> None:
+        """Drop idle-expired entries, then LRU entries beyond the cap. Attached sessions are kept."""
+        now = time.monotonic()
+        for session_id, entry in list(self._entries.items()):
+            if entry.connections == 0 and now - entry.last_used > self.idle_ttl_seconds:
+                del self._entries[session_id]
+                self._counters["evicted_idle"] += 1
+
+        overflow = len(self._entries) - self.max_sessions
+        for session_id, entry in list(self._entries.items()):
+            if overflow <= 0:
+                break
+            if entry.connections == 0:
+                del self._entries[session_id]
+                self._counters["evicted_lru"] += 1
+                overflow -= 1
+
+    @asynccontextmanager
+    async def attach(self, session_id: str, build: Callable[[], Awaitable[dict]]):
+        """
+        Yield the session's entry for the lifetime of one websocket, building
+        its data with `build()` when it is not (or no longer) in memory.
+        """
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                entry.connections += 1
+                self._counters["reused"] += 1
+
+        if entry is None:
+            data = await build()
+            with self._lock:
+                # Another socket may have built it while we awaited
+                entry = self._entries.get(session_id)
+                if entry is None:
+                    entry = SessionEntry(data=data)
+                    self._entries[session_id] = entry
+                    self._counters["created"] += 1
+                else:
+                    self._counters["reused"] += 1
+                entry.connections += 1
+
+        with self._lock:
+            self._entries.move_to_end(session_id)
+            self._evict()
+        try:
+            yield entry
+        finally:
+            with self._lock:
+                entry.connections -= 1
+                entry.last_used = time.monotonic()
+                self._evict()
+
+    def discard(self, session_id: str) -> None:
+        """Forget a finished session right away."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None and entry.connections == 0:
+                del self._entries[session_id]
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._entries
+
+    def stats(self) -> dict:
+        with self._lock:
+            sizes = [e.approx_bytes for e in self._entries.values()]
+            return {
+                **self._counters,
+                "active": len(self._entries),
+                "attached": sum(1 for e in self._entries.values() if e.connections),
+                "history_bytes": sum(sizes),
+                "max_session_bytes": max(sizes, default=0),
+                "max_sessions": self.max_sessions,
+                "idle_ttl_s": self.idle_ttl_seconds,
+            }
+
+
+# Single global instance
+interview_sessions = InterviewSessionStore(
+    max_sessions=settings.INTERVIEW_MAX_SESSIONS,
+    idle_ttl_seconds=settings.INTERVIEW_SESSION_TTL,
+)
@@ -0,0 +1,51 @@
+"""
+Interview Transcript — append-only message log for interview sessions.
+
+Every candidate answer and interviewer reply is one INSERT into
+`interview_messages` (session_id, seq, role, content, created_at) instead of
+rewriting the whole `interview_sessions.chat_history` JSON blob each turn,
+which made a long interview O(n²) bytes written. Reads page by `seq`.
+"""
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import InterviewMessage
+
+PAGE_SIZE = 200
+
+
+async def append_message(
+    db: AsyncSession, session_id: str, seq: int, role: str, content: str, commit: bool = True
+) -> None:
+    """Insert one message at position `seq` (and commit unless the caller batches it)."""
+    db.add(InterviewMessage(session_id=session_id, seq=seq, role=role, content=content))
+    if commit:
+        await db.commit()
+
+
+async def load_page(db: AsyncSession, session_id: str, after_seq: int = 0, limit: int = PAGE_SIZE) -> list[InterviewMessage]:
+    """Messages with seq > `after_seq`, oldest first, at most `limit` of them."""
+    result = await db.execute(
+        select(InterviewMessage)
+        .where(InterviewMessage.session_id == session_id, InterviewMessage.seq > after_seq)
+        .order_by(InterviewMessage.seq)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def load_history(db: AsyncSession, session_id: str) -> tuple[list[dict], int]:
+    """
+    Full transcript as [{"role", "content"}], read page by page, plus the
+    last seq written (0 for a new session).
+    """
+    history: list[dict] = []
+    last_seq = 0
+    while True:
+        page = await load_page(db, session_id, after_seq=last_seq)
+        history.extend({"role": m.role, "content": m.content} for m in page)
+        if page:
+            last_seq = page[-1].seq
+        if len(page) < PAGE_SIZE:
+            return history, last_seq
+
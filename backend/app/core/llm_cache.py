@@ -0,0 +1,149 @@
+"""
+LLM Response Cache — persistent, opt-in cache for agent replies.
+
+`llm_config` keeps AutoGen's own `cache_seed` disabled (it has no TTL or size
+bound). Instead, endpoints listed in LLM_CACHE_ENDPOINTS get their final agent
+reply cached in a small SQLite file, keyed on
+(agent name, system-message hash, messages hash, model, temperature).
+
+  - Entries older than LLM_CACHE_TTL seconds are treated as misses + dropped.
+  - Beyond LLM_CACHE_MAX_ENTRIES, least-recently-used entries are evicted.
+  - Hit/miss/eviction counters are exposed via `llm_cache.stats()`.
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from loguru import logger
+
+from app.core.config import settings
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_cache_key(agent_name: str, system_message: str, messages: list, model: str, temperature) -> str:
+    """Stable key for one LLM request."""
+    parts = [
+        agent_name,
+        _sha256(system_message or ""),
+        _sha256(json.dumps(messages, sort_keys=True, ensure_ascii=False)),
+        model,
+        str(temperature),
+    ]
+    return _sha256("|".join(parts))
+
+
+class LLMResponseCache:
+    """SQLite-backed TTL + LRU cache. All sqlite access happens off the event loop."""
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0}
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " agent TEXT NOT NULL,"
+                " response TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_access ON llm_cache (last_access)")
+            self._conn.commit()
+        return self._conn
+
+    # ── Sync implementations (run in a worker thread) ────────────────────────
+    def _get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            conn = self._get_conn()
+            row = conn.execute("SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            response, created_at = row
+            if now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                conn.commit()
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return None
+            conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self._counters["hits"] += 1
+            return response
+
+    def _set(self, key: str, agent_name: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, agent, response, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, agent_name, response, now, now),
+            )
+            self._counters["stores"] += 1
+
+            expired = conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)).rowcount
+            self._counters["expired"] += max(expired, 0)
+
+            (count,) = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self._counters["evictions"] += overflow
+            conn.commit()
+
+    # ── Async API ─────────────────────────────────────────────────────────────
+    async def get(self, key: str) -> str | None:
+        try:
+            return await asyncio.to_thread(self._get, key)
+        except sqlite3.Error as exc:
+            logger.warning(f"llm cache: read failed — {exc}")
+            return None
+
+    async def set(self, key: str, agent_name: str, response: str) -> None:
+        try:
+            await asyncio.to_thread(self._set, key, agent_name, response)
+        except sqlite3.Error as exc:
+            logger.warning(f"llm cache: write failed — {exc}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else 0.0,
+                "ttl_s": self.ttl_seconds,
+                "max_entries": self.max_entries,
+                "endpoints": sorted(settings.llm_cache_endpoints),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Single global instance
+llm_cache = LLMResponseCache(
+    path=settings.LLM_CACHE_PATH,
+    ttl_seconds=settings.LLM_CACHE_TTL,
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,137 @@
+"""
+Market Trends Cache — stale-while-revalidate cache for /market/trends.
+
+A Market_Researcher run costs a multi-turn chat plus several web searches,
+yet "Data Scientist / Bangalore" barely changes within a day. Entries are keyed
+on a normalized (role, location):
+
+  - age < MARKET_CACHE_FRESH_SECONDS  → served directly (fresh hit)
+  - age < MARKET_CACHE_STALE_SECONDS  → served immediately (stale hit) while
+                                        one background refresh recomputes it
+  - older / missing                   → computed inline (miss)
+"""
+import asyncio
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+
+from app.core.config import settings
+
+_LOCATION_ALIASES = {
+    "bengaluru": "bangalore",
+    "gurugram": "gurgaon",
+    "bombay": "mumbai",
+    "us": "united states",
+    "usa": "united states",
+    "united states of america": "united states",
+    "uk": "united kingdom",
+}
+
+
+def _normalize(value: str) -> str:
+    value = re.sub(r"[^\w\s+#/.-]", " ", value.lower())
+    return re.sub(r"\s+", " ", value).strip(" .")
+
+
+def normalize_market_key(role: str, location: str) -> tuple[str, str]:
+    """Normalized (role, location) cache key — case, punctuation and city aliases folded."""
+    location = _normalize(location)
+    return _normalize(role), _LOCATION_ALIASES.get(location, location)
+
+
+class MarketTrendsCache:
+    """In-process SWR cache with LRU bound and per-key single background refresh."""
+
+    def __init__(self, fresh_seconds: int, stale_seconds: int, max_entries: int):
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = max(stale_seconds, fresh_seconds)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._refreshing: dict[tuple[str, str], asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._counters = {"fresh_hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    def _put(self, key: tuple[str, str], value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _schedule_refresh(self, key: tuple[str, str], compute: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+
+        async def _refresh():
+            try:
+                self._put(key, await compute())
+                self._count("refreshes")
+            except Exception as exc:
+                self._count("refresh_errors")
+                logger.warning(f"market cache: background refresh failed for {key} — {exc}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(_refresh())
+
+    async def get_or_compute(
+        self, role: str, location: str, compute: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, str]:
+        """
+        Return (value, status) where status is "fresh", "stale" or "miss".
+        `compute` is awaited inline on a miss, or in the background on a stale hit.
+        """
+        key = normalize_market_key(role, location)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None:
+            stored_at, value = entry
+            age = time.monotonic() - stored_at
+            if age < self.fresh_seconds:
+                self._count("fresh_hits")
+                return value, "fresh"
+            if age < self.stale_seconds:
+                self._count("stale_hits")
+                self._schedule_refresh(key, compute)
+                return value, "stale"
+
+        self._count("misses")
+        value = await compute()
+        self._put(key, value)
+        return value, "miss"
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "refreshing": len(self._refreshing),
+                "fresh_s": self.fresh_seconds,
+                "stale_s": self.stale_seconds,
+            }
+
+
+# Single global instance
+market_trends_cache = MarketTrendsCache(
+    fresh_seconds=settings.MARKET_CACHE_FRESH_SECONDS,
+    stale_seconds=settings.MARKET_CACHE_STALE_SECONDS,
+    max_entries=settings.MARKET_CACHE_MAX_ENTRIES,
+)
+
+# The DAG career pipeline's market stage asks a different prompt, so it keeps its own entries
+career_market_cache = MarketTrendsCache(
+    fresh_seconds=settings.MARKET_CACHE_FRESH_SECONDS,
+    stale_seconds=settings.MARKET_CACHE_STALE_SECONDS,
+    max_entries=settings.MARKET_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,160 @@
+"""
+PDF Text Extraction — process-pooled, per-page fan-out.
+
+pdfplumber's layout analysis is pure Python and holds the GIL for seconds on
+multi-page resumes/portfolios. Extraction runs in a dedicated process pool:
+the page count is read first, then contiguous page ranges are extracted in
+parallel and reassembled in page order, all under a per-document timeout.
+
+Tasks carry the PDF bytes and open them in memory (nothing touches disk);
+each task opens and closes its own document, so no worker holds one between
+tasks. A document that hits the timeout gets the pool's processes terminated
+and the pool rebuilt, since cancelling the futures would leave the workers
+parsing.
+"""
+import asyncio
+import io
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pdfplumber
+from loguru import logger
+
+from app.core.config import settings
+
+
+class PDFExtractionTimeout(Exception):
+    """Raised when a document exceeds PDF_EXTRACT_TIMEOUT."""
+
+
+# ── Worker functions (run in child processes) ─────────────────────────────────
+
+def _count_pages(pdf_bytes: bytes) -> int:
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_page_range(pdf_bytes: bytes, start: int, stop: int) -> list[str]:
+    """Extract text for pages [start, stop) — empty pages yield ""."""
+    texts = []
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        for i in range(start, stop):
+            page = pdf.pages[i]
+            texts.append(page.extract_text() or "")
+            page.close()   # drop the page's parsed layout before the next one
+    return texts
+
+
+def _page_ranges(page_count: int, parts: int) -> list[tuple[int, int]]:
+    """Split [0, page_count) into at most `parts` contiguous, near-equal ranges."""
+    parts = max(1, min(parts, page_count))
+    size, extra = divmod(page_count, parts)
+    ranges, start = [], 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+class PDFExtractor:
+    """Runs pdfplumber extraction in a ProcessPoolExecutor."""
+
+    def __init__(self, max_workers: int, timeout: float):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+        # ── Metrics ──────────────────────────────────────────────────────────
+        self._documents = 0
+        self._pages = 0
+        self._timeouts = 0
+        self._recycles = 0
+        self._seconds_total = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        """Kill the pool's workers (still busy with a timed-out document); the next call builds a new pool."""
+        with self._lock:
+            if self._executor is not executor:
+                return   # already recycled by another timeout
+            self._executor = None
+            self._recycles += 1
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _extract(self, executor: ProcessPoolExecutor, pdf_bytes: bytes) -> tuple[str, int]:
+        loop = asyncio.get_running_loop()
+
+        page_count = await loop.run_in_executor(executor, _count_pages, pdf_bytes)
+        if page_count == 0:
+            return "", 0
+
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(executor, _extract_page_range, pdf_bytes, start, stop)
+            for start, stop in _page_ranges(page_count, self.max_workers)
+        ))
+        pages = [text for chunk in chunks for text in chunk]
+        return "\n".join(t for t in pages if t).strip(), page_count
+
+    async def _extract_with_timeout(self, pdf_bytes: bytes) -> tuple[str, int]:
+        executor = self._get_executor()
+        try:
+            return await asyncio.wait_for(self._extract(executor, pdf_bytes), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            logger.warning(f"pdf: extraction exceeded {self.timeout}s — giving up on document, recycling pool")
+            self._recycle(executor)
+            raise PDFExtractionTimeout(f"PDF extraction exceeded {self.timeout}s")
+
+    async def extract_text(self, pdf_bytes: bytes | bytearray) -> str:
+        """Extract plain text from PDF bytes, pages joined in order."""
+        started = time.perf_counter()
+        try:
+            text, page_count = await self._extract_with_timeout(pdf_bytes)
+        except BrokenProcessPool:
+            # Another document's timeout recycled the pool under us — retry once on the new one
+            text, page_count = await self._extract_with_timeout(pdf_bytes)
+
+        with self._lock:
+            self._documents += 1
+            self._pages += page_count
+            self._seconds_total += time.perf_counter() - started
+        return text
+
+    def stats(self) -> dict:
+        """Snapshot of extraction throughput for /metrics."""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "timeout_s": self.timeout,
+                "documents": self._documents,
+                "pages": self._pages,
+                "timeouts": self._timeouts,
+                "pool_recycles": self._recycles,
+                "avg_document_ms": round(self._seconds_total / self._documents * 1000, 2) if self._documents else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            logger.info("Shutting down PDF extraction pool...")
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Single global instance
+pdf_extractor = PDFExtractor(
+    max_workers=settings.PDF_EXTRACT_WORKERS,
+    timeout=settings.PDF_EXTRACT_TIMEOUT,
+)
@@ -0,0 +1,99 @@
+"""
+Resume Cache — content-addressed store for extracted text + analyses.
+
+Keyed on (user, sha256 of the uploaded PDF bytes) and backed by the existing
+`resumes` table: `raw_text` holds the extraction, `parsed_content` the
+Resume_Analyst output. Lookups are scoped to the caller, so one user's upload
+never serves another user's text or analysis. An analysis is only served if
+it was produced under the current RESUME_ANALYST_PROMPT_VERSION, so bumping
+that constant invalidates every cached analysis at once.
+"""
+import threading
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.registry import RESUME_ANALYST_PROMPT_VERSION
+from app.models.models import Resume
+
+
+class ResumeCache:
+    """Lookups/stores against `resumes`, plus hit/miss counters for /metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {"text_hits": 0, "text_misses": 0, "analysis_hits": 0, "analysis_misses": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    async def lookup(self, db: AsyncSession, content_hash: str, user_id: str | None = None) -> Resume | None:
+        """
+        Find the user's cached row for this content, preferring one with a
+        current-version analysis.
+        """
+        if not user_id:
+            return None
+        try:
+            result = await db.execute(
+                select(Resume).where(Resume.content_hash == content_hash, Resume.user_id == user_id)
+            )
+            rows = result.scalars().all()
+        except Exception as exc:
+            logger.warning(f"resume cache: lookup failed — {exc}")
+            return None
+        if not rows:
+            return None
+        return max(rows, key=lambda r: r.analysis_version == RESUME_ANALYST_PROMPT_VERSION and r.parsed_content is not None)
+
+    def cached_text(self, row: Resume | None) -> str | None:
+        text = row.raw_text if row is not None else None
+        self._count("text_hits" if text else "text_misses")
+        return text
+
+    def cached_analysis(self, row: Resume | None) -> dict | None:
+        analysis = None
+        if row is not None and row.analysis_version == RESUME_ANALYST_PROMPT_VERSION:
+            analysis = row.parsed_content
+        self._count("analysis_hits" if analysis else "analysis_misses")
+        return analysis
+
+    async def store(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: str | None,
+        filename: str,
+        content_hash: str,
+        raw_text: str,
+        analysis: dict | None = None,
+    ) -> None:
+        """Upsert the user's row for this content. Failures are logged, never raised."""
+        if not user_id:
+            return
+        try:
+            result = await db.execute(
+                select(Resume).where(Resume.content_hash == content_hash, Resume.user_id == user_id)
+            )
+            row = result.scalars().first()
+            if row is None:
+                row = Resume(user_id=user_id, filename=filename, content_hash=content_hash)
+                db.add(row)
+            row.raw_text = raw_text
+            if analysis is not None:
+                row.parsed_content = analysis
+                row.analysis_version = RESUME_ANALYST_PROMPT_VERSION
+            await db.commit()
+        except Exception as exc:
+            await db.rollback()
+            logger.warning(f"resume cache: store failed — {exc}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "prompt_version": RESUME_ANALYST_PROMPT_VERSION}
+
+
+# Single global instance
+resume_cache = ResumeCache()
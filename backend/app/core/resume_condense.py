@@ -0,0 +1,132 @@
+"""
+Resume Condensation — section-aware trimming of resume text to a token budget.
+
+`resume_text[:6000]` cut long resumes off at the end — exactly where skills
+and certifications tend to live — while spending tokens on blank lines,
+bullet glyphs and "References available upon request". Instead:
+
+  1. Clean: collapse whitespace, normalise bullets, drop page numbers,
+     boilerplate lines and exact duplicate lines.
+  2. Segment on recognised section headings (skills, experience, ...).
+  3. Select whole sections by priority until RESUME_TOKEN_BUDGET is used up;
+     a section that does not fit whole is cut at a line boundary.
+  4. Re-emit the kept sections in their original order.
+
+Token counts use tiktoken when it is installed, else a ~4 chars/token estimate.
+"""
+import re
+from functools import lru_cache
+
+from app.core.config import settings
+
+# Section kind → (priority, heading keywords). Lower priority is kept first.
+_SECTIONS = {
+    "skills":         (0, ("skills", "technical skills", "core competencies", "technologies", "tech stack", "tools")),
+    "experience":     (1, ("experience", "work experience", "professional experience", "employment", "work history", "internships", "internship")),
+    "certifications": (2, ("certifications", "certificates", "licenses", "courses")),
+    "projects":       (3, ("projects", "personal projects", "academic projects", "key projects")),
+    "summary":        (4, ("summary", "professional summary", "profile", "objective", "career objective", "about me")),
+    "education":      (5, ("education", "academic background", "qualifications")),
+    "achievements":   (6, ("achievements", "awards", "honors", "accomplishments")),
+    "publications":   (7, ("publications", "research", "patents")),
+    "other":          (8, ("languages", "volunteering", "volunteer experience", "leadership", "activities", "extracurricular activities")),
+    "low":            (9, ("interests", "hobbies", "references", "declaration", "personal details")),
+}
+_HEADINGS = {kw: kind for kind, (_, kws) in _SECTIONS.items() for kw in kws}
+_HEADER_PRIORITY = 1   # name / title line sits alongside experience
+
+_BOILERPLATE = re.compile(
+    r"^(references?( are)? available (up)?on request|page \d+( of \d+)?|curriculum vitae|resume|cv)\.?$",
+    re.IGNORECASE,
+)
+_BULLET = re.compile(r"^[•▪●◦‣⁃■□➢✓✔*·•▪●◦►➤-]+\s*")
+
+
+@lru_cache(maxsize=1)
+def _encoder():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoder = _encoder()
+    if encoder is not None:
+        return len(encoder.encode(text))
+    return (len(text) + 3) // 4
+
+
+def _clean_lines(text: str) -> list[str]:
+    lines, seen = [], set()
+    for raw in text.splitlines():
+        line = re.sub(r"\s+", " ", raw).strip()
+        if not line or re.fullmatch(r"[\W_]+", line) or _BOILERPLATE.match(line):
+            continue
+        if _BULLET.match(line):
+            line = "- " + _BULLET.sub("", line)
+        key = line.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return lines
+
+
+def _heading_kind(line: str) -> str | None:
+    if len(line) > 40:
+        return None
+    normalized = re.sub(r"[^a-z ]", "", line.lower().replace("&", " ")).strip()
+    normalized = re.sub(r"\s+", " ", normalized)
+    return _HEADINGS.get(normalized)
+
+
+def split_sections(text: str) -> list[tuple[str, str, list[str]]]:
+    """Return [(kind, heading, lines)] in document order; leading lines form a "header" section."""
+    sections: list[tuple[str, str, list[str]]] = [("header", "", [])]
+    for line in _clean_lines(text):
+        kind = _heading_kind(line)
+        if kind is not None:
+            sections.append((kind, line, []))
+        else:
+            sections[-1][2].append(line)
+    return [s for s in sections if s[2] or s[0] != "header"]
+
+
+def condense_resume(text: str, token_budget: int | None = None) -> str:
+    """Condense resume text to at most `token_budget` tokens (default RESUME_TOKEN_BUDGET)."""
+    budget = token_budget or settings.RESUME_TOKEN_BUDGET
+    sections = split_sections(text)
+    rendered = [
+        "\n".join(([heading.upper()] if heading else []) + lines)
+        for _, heading, lines in sections
+    ]
+    if count_tokens("\n\n".join(rendered)) <= budget:
+        return "\n\n".join(rendered)
+
+    def priority(index: int) -> tuple[int, int]:
+        kind = sections[index][0]
+        return (_HEADER_PRIORITY if kind == "header" else _SECTIONS[kind][0], index)
+
+    kept: dict[int, str] = {}
+    remaining = budget
+    for index in sorted(range(len(sections)), key=priority):
+        cost = count_tokens(rendered[index]) + 1
+        if cost <= remaining:
+            kept[index] = rendered[index]
+            remaining -= cost
+            continue
+        # Partially include the section, line by line, while anything still fits
+        partial, spent = [], 0
+        for line in rendered[index].split("\n"):
+            line_cost = count_tokens(line) + 1
+            if spent + line_cost > remaining:
+                break
+            partial.append(line)
+            spent += line_cost
+        if len(partial) > (1 if sections[index][1] else 0):   # more than a bare heading
+            kept[index] = "\n".join(partial)
+            remaining -= spent
+
+    return "\n\n".join(kept[i] for i in sorted(kept))
@@ -0,0 +1,61 @@
+"""
+Single-Flight — coalesce identical concurrent requests into one computation.
+
+When a cohort hits the same `/market/trends` or `/roadmap/generate` inputs at
+once, only the first caller (the leader) starts the agent chat; everyone else
+with the same normalized key awaits that one in-flight task and gets its
+result (or its exception). Nothing is cached once the task finishes — that is
+the job of the caches in front of it.
+
+The computation runs as its own task, so a leader whose client disconnects
+does not cancel the work its followers are waiting on.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Per-namespace in-flight task registry with leader / coalesced counters."""
+
+    def __init__(self):
+        self._in_flight: dict[tuple[str, Hashable], asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[str, int]] = {}
+
+    def _count(self, namespace: str, key: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(namespace, {"leaders": 0, "coalesced": 0})
+            counters[key] += 1
+
+    def _finished(self, flight_key: tuple[str, Hashable], task: asyncio.Task) -> None:
+        self._in_flight.pop(flight_key, None)
+        # Mark the exception retrieved even if every waiter has gone away
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, namespace: str, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Await `compute()` — or the identical call already in flight for (namespace, key)."""
+        flight_key = (namespace, key)
+        task = self._in_flight.get(flight_key)
+        if task is None:
+            task = asyncio.create_task(compute())
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda t: self._finished(flight_key, t))
+            self._count(namespace, "leaders")
+        else:
+            self._count(namespace, "coalesced")
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """`coalesced` is the number of LLM runs saved."""
+        with self._lock:
+            out = {ns: dict(c) for ns, c in self._counters.items()}
+        for namespace, _ in list(self._in_flight):
+            out.setdefault(namespace, {"leaders": 0, "coalesced": 0})
+            out[namespace]["in_flight"] = out[namespace].get("in_flight", 0) + 1
+        return out
+
+
+# Single global instance
+single_flight = SingleFlight()
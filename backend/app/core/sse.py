@@ -0,0 +1,22 @@
+"""
+Server-Sent Events — one framing for every streaming endpoint
+(/resume/analyze/stream, /roadmap/generate/stream, career job events).
+"""
+import json
+from typing import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+
+def sse_event(event: str, data) -> str:
+    """One `event:` / `data:` frame; values JSON can't encode (datetimes) are stringified."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """Stream pre-framed events, unbuffered by proxies (nginx honours X-Accel-Buffering)."""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,252 @@
+"""
+TTS Cache — synthesised speech keyed on (voice, normalized text hash, format).
+
+The interviewer repeats itself a lot: the same openings, transitions and
+sentence-level chunks come back turn after turn and session after session, and
+each one used to cost an Edge-TTS network round-trip. Two tiers:
+
+  - memory: an LRU of MP3 bytes, capped at TTS_CACHE_MEMORY_MB.
+  - disk:   one file per clip under TTS_CACHE_DIR, capped at TTS_CACHE_DISK_MB;
+            least recently accessed clips are deleted first. A disk hit is
+            promoted back into memory. Leave TTS_CACHE_DIR empty for memory only.
+
+With TTS_CACHE_WARMUP, startup preloads the most recently used disk clips
+into memory.
+
+Text is normalized (markdown stripped, whitespace collapsed) before hashing,
+so trivially different renderings of one sentence share an entry.
+Hit/miss counters per tier are exposed via `tts_cache.stats()`.
+"""
+import asyncio
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from loguru import logger
+
+from app.core.config import settings
+
+TTS_FORMAT = "mp3"
+
+
+def normalize_text(text: str) -> str:
+    text = re.sub(r'[*#_~`]', '', text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def make_tts_key(voice: str, text: str, fmt: str = TTS_FORMAT) -> str:
+    text_hash = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{voice}|{fmt}|{text_hash}".encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """In-memory LRU in front of a size-capped directory of clips."""
+
+    def __init__(self, directory: str, memory_max_bytes: int, disk_max_bytes: int):
+        self.directory = directory
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_index: OrderedDict[str, int] | None = None   # scanned on first disk access
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0,
+            "memory_evictions": 0, "disk_evictions": 0, "warmed": 0,
+        }
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[key] += n
+
+    # ── Memory tier ───────────────────────────────────────────────────────────
+    def _memory_get(self, key: str) -> bytes | None:
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+            return audio
+
+    def _memory_put(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.memory_max_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+            self._memory[key] = audio
+            self._memory_bytes += len(audio)
+            while self._memory_bytes > self.memory_max_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+                self._counters["memory_evictions"] += 1
+
+    # ── Disk tier (sync, run in a worker thread) ──────────────────────────────
+    # The directory is scanned once; after that an index of key → size, ordered
+    # by last access, decides hits and eviction victims. The lock only guards
+    # the index and byte count — reads, writes and deletes happen outside it.
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.{TTS_FORMAT}")
+
+    def _load_index(self) -> None:
+        if self._disk_index is not None:
+            return
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(f".{TTS_FORMAT}"):
+                    try:
+                        st = os.stat(os.path.join(root, name))
+                    except OSError:
+                        continue
+                    files.append((st.st_mtime, name[:-len(TTS_FORMAT) - 1], st.st_size))
+        index = OrderedDict((key, size) for _, key, size in sorted(files))
+        with self._lock:
+            if self._disk_index is None:
+                self._disk_index = index
+                self._disk_bytes = sum(index.values())
+
+    def _disk_forget(self, key: str) -> None:
+        with self._lock:
+            size = self._disk_index.pop(key, None)
+            if size is not None:
+                self._disk_bytes -= size
+
+    def _disk_get(self, key: str) -> bytes | None:
+        self._load_index()
+        with self._lock:
+            if key not in self._disk_index:
+                return None
+            self._disk_index.move_to_end(key)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)   # so the access order survives a restart
+            return audio
+        except FileNotFoundError:
+            self._disk_forget(key)
+            return None
+
+    def _disk_put(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.disk_max_bytes:
+            return
+        self._load_index()
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+
+        victims = []
+        with self._lock:
+            self._disk_bytes += len(audio) - self._disk_index.pop(key, 0)
+            self._disk_index[key] = len(audio)
+            while self._disk_bytes > self.disk_max_bytes:
+                old_key, size = self._disk_index.popitem(last=False)
+                self._disk_bytes -= size
+                self._counters["disk_evictions"] += 1
+                victims.append(old_key)
+        for old_key in victims:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+    def _preload(self) -> int:
+        """Read the most recently used disk clips into memory, up to its cap."""
+        self._load_index()
+        with self._lock:
+            recent = list(reversed(self._disk_index.items()))
+        loaded, budget = [], self.memory_max_bytes - self._memory_bytes
+        for key, size in recent:
+            if size > budget:
+                break
+            if self._memory_get(key) is not None:
+                continue
+            try:
+                with open(self._path(key), "rb") as f:
+                    audio = f.read()
+            except FileNotFoundError:
+                self._disk_forget(key)
+                continue
+            self._memory_put(key, audio)
+            budget -= len(audio)
+            loaded.append(key)
+        # loaded newest first, so restore the disk order in the memory LRU
+        with self._lock:
+            for key in reversed(loaded):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+        return len(loaded)
+
+    # ── Async API ─────────────────────────────────────────────────────────────
+    async def get(self, voice: str, text: str, fmt: str = TTS_FORMAT) -> bytes | None:
+        key = make_tts_key(voice, text, fmt)
+        audio = self._memory_get(key)
+        if audio is not None:
+            self._count("memory_hits")
+            return audio
+        if self.directory:
+            try:
+                audio = await asyncio.to_thread(self._disk_get, key)
+            except OSError as exc:
+                logger.warning(f"tts cache: disk read failed — {exc}")
+                audio = None
+            if audio is not None:
+                self._count("disk_hits")
+                self._memory_put(key, audio)
+                return audio
+        self._count("misses")
+        return None
+
+    async def set(self, voice: str, text: str, audio: bytes, fmt: str = TTS_FORMAT) -> None:
+        if not audio:
+            return
+        key = make_tts_key(voice, text, fmt)
+        self._memory_put(key, audio)
+        self._count("stores")
+        if self.directory:
+            try:
+                await asyncio.to_thread(self._disk_put, key, audio)
+            except OSError as exc:
+                logger.warning(f"tts cache: disk write failed — {exc}")
+
+    async def warm_up(self) -> int:
+        """
+        Fill the memory tier from the clips most recently spoken on previous
+        runs (the disk tier), so no text has to be guessed and nothing goes to
+        Edge-TTS. Returns the number of clips loaded.
+        """
+        if not self.directory:
+            return 0
+        loaded = await asyncio.to_thread(self._preload)
+        self._count("warmed", loaded)
+        return loaded
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            lookups = hits + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(hits / lookups, 3) if lookups else None,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "memory_max_bytes": self.memory_max_bytes,
+                "disk_entries": len(self._disk_index or ()),
+                "disk_bytes": self._disk_bytes,
+                "disk_max_bytes": self.disk_max_bytes if self.directory else 0,
+            }
+
+
+# Single global instance
+tts_cache = TTSCache(
+    directory=settings.TTS_CACHE_DIR,
+    memory_max_bytes=settings.TTS_CACHE_MEMORY_MB * 1024 * 1024,
+    disk_max_bytes=settings.TTS_CACHE_DISK_MB * 1024 * 1024,
+)
@@ -1,42 +1,137 @@
-import os
 import base64
 import asyncio
 import edge_tts
-import tempfile
 import re
+from typing import AsyncIterator
 from loguru import logger
 
+from app.core.config import settings
+from app.core.tts_cache import TTS_FORMAT, tts_cache
+
 DEFAULT_TTS_VOICE = "en-GB-ThomasNeural"
 # Clear Indian-English voice that fits interview conversations well.
 INTERVIEW_TTS_VOICE = "en-IN-NeerjaNeural"
 
 
-async def generate_audio_base64(text: str, voice: str = DEFAULT_TTS_VOICE) -> str:
+async def synthesize(text: str, voice: str = DEFAULT_TTS_VOICE) -> bytes:
     """
-    Generates speech audio from text using Edge-TTS and returns it as a Base64 string.
+    Synthesises `text` to MP3 bytes with Edge-TTS, in memory, going through the
+    TTS cache first. Returns b"" on failure.
     """
     # Remove markdown formatting characters like asterisks, hashes, underscores, backticks
-    clean_text = re.sub(r'[*#_~`]', '', text)
-    
+    clean_text = re.sub(r'[*#_~`]', '', text).strip()
+    if not re.search(r'\w', clean_text):
+        return b""
+    cached = await tts_cache.get(voice, clean_text, TTS_FORMAT)
+    if cached is not None:
+        return cached
     try:
-        # Create a temporary file to store the audio
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
-            temp_path = f.name
-        
-        # Initialize communication with Edge-TTS
         communicate = edge_tts.Communicate(clean_text, voice)
-        await communicate.save(temp_path)
-        
-        # Read the audio file and encode to base64
-        with open(temp_path, "rb") as f:
-            audio_bytes = f.read()
-            
-        audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
-        
-        # Clean up the temporary file
-        os.remove(temp_path)
-        
-        return audio_base64
+        audio = bytearray()
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                audio.extend(chunk["data"])
     except Exception as e:
         logger.error(f"Error generating TTS audio: {e}")
-        return ""
+        return b""
+    await tts_cache.set(voice, clean_text, bytes(audio), TTS_FORMAT)
+    return bytes(audio)
+
+
+async def warm_tts_cache() -> None:
+    """Preload recently spoken clips from the disk tier (run in the background at startup)."""
+    try:
+        loaded = await tts_cache.warm_up()
+        logger.info(f"tts cache: warm-up done — {loaded} clip(s) loaded from disk")
+    except Exception as exc:
+        logger.warning(f"tts cache: warm-up skipped — {exc}")
+
+
+async def generate_audio_base64(text: str, voice: str = DEFAULT_TTS_VOICE) -> str:
+    """
+    Generates speech audio from text using Edge-TTS and returns it as a Base64 string.
+    """
+    return base64.b64encode(await synthesize(text, voice)).decode('utf-8')
+
+
+# ── Pipelined synthesis ───────────────────────────────────────────────────────
+# A reply is spoken sentence by sentence: each sentence is synthesised as soon
+# as it is complete (even while the LLM is still writing the rest), at most
+# TTS_PIPELINE_CONCURRENCY at a time, and the clips are released in order.
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+|\n+')
+MIN_SENTENCE_CHARS = 40   # shorter fragments ("SCORE: 7/10") are merged with the next one
+
+
+class SentenceSplitter:
+    """Accumulates streamed text and releases it as whole sentences."""
+
+    def __init__(self, min_chars: int | None = None):
+        self.min_chars = MIN_SENTENCE_CHARS if min_chars is None else min_chars
+        self._buffer = ""
+        self._pending = ""
+
+    def _take(self, sentence: str) -> list[str]:
+        self._pending = f"{self._pending} {sentence}".strip()
+        if len(self._pending) < self.min_chars:
+            return []
+        sentence, self._pending = self._pending, ""
+        return [sentence]
+
+    def feed(self, text: str) -> list[str]:
+        self._buffer += text
+        *complete, self._buffer = _SENTENCE_END.split(self._buffer)
+        return [s for part in complete if part.strip() for s in self._take(part.strip())]
+
+    def flush(self) -> list[str]:
+        rest = f"{self._pending} {self._buffer}".strip()
+        self._buffer = self._pending = ""
+        return [rest] if rest else []
+
+
+def split_sentences(text: str) -> list[str]:
+    splitter = SentenceSplitter()
+    return splitter.feed(text) + splitter.flush()
+
+
+class SpeechPipeline:
+    """
+    Feed text in with `feed()` (whole or as deltas), then `close()`; iterate
+    `chunks()` for (seq, mp3 bytes) in sentence order as each clip is ready.
+    """
+
+    def __init__(self, voice: str = DEFAULT_TTS_VOICE, concurrency: int | None = None):
+        self.voice = voice
+        self._splitter = SentenceSplitter()
+        self._semaphore = asyncio.Semaphore(max(1, concurrency or settings.TTS_PIPELINE_CONCURRENCY))
+        self._tasks: asyncio.Queue = asyncio.Queue()
+        self._started: list[asyncio.Task] = []
+
+    async def _synthesize(self, sentence: str) -> bytes:
+        async with self._semaphore:
+            return await synthesize(sentence, self.voice)
+
+    def _start(self, sentences: list[str]) -> None:
+        for sentence in sentences:
+            task = asyncio.create_task(self._synthesize(sentence))
+            self._started.append(task)
+            self._tasks.put_nowait(task)
+
+    def feed(self, text: str) -> None:
+        self._start(self._splitter.feed(text))
+
+    def close(self) -> None:
+        self._start(self._splitter.flush())
+        self._tasks.put_nowait(None)
+
+    def cancel(self) -> None:
+        for task in self._started:
+            task.cancel()
+
+    async def chunks(self) -> AsyncIterator[tuple[int, bytes]]:
+        seq = 0
+        while (task := await self._tasks.get()) is not None:
+            audio = await task
+            if audio:
+                yield seq, audio
+                seq += 1
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -17,8 +18,28 @@ async def lifespan(app: FastAPI):
     logger.info(f"   API Key  : {'✅ Set' if settings.is_configured else '❌ NOT SET — check .env!'}")
     logger.info(f"   Docs     : http://localhost:8000/docs")
     logger.info("=" * 50)
+    from app.core.career_jobs import career_jobs
+    await career_jobs.recover()
+    tts_warmup = None
+    if settings.TTS_CACHE_WARMUP:
+        from app.core.voice_engine import warm_tts_cache
+        # Background — startup must not wait on Edge-TTS round-trips
+        tts_warmup = asyncio.create_task(warm_tts_cache())
     yield
     # Shutdown
+    if tts_warmup is not None:
+        tts_warmup.cancel()
+    await career_jobs.shutdown()
+    from app.agents.executor import agent_pool
+    from app.core.database import async_engine
+    from app.core.llm_cache import llm_cache
+    from app.core.pdf_extraction import pdf_extractor
+    from app.core.security import password_hasher
+    agent_pool.shutdown()
+    password_hasher.shutdown()
+    pdf_extractor.shutdown()
+    llm_cache.close()
+    await async_engine.dispose()
     logger.info("🛑 AI Career Mentor API shutting down.")
 
 
@@ -128,6 +149,38 @@ async def health():
     }
 
 
+# ── Metrics ───────────────────────────────────────────────────────────────────
+@app.get("/metrics", tags=["Health"])
+async def metrics():
+    from app.agents.executor import agent_pool
+    from app.agents.llm import usage_stats
+    from app.agents.registry import agent_instances
+    from app.core.career_jobs import career_jobs
+    from app.core.interview_sessions import interview_sessions
+    from app.core.llm_cache import llm_cache
+    from app.core.market_cache import career_market_cache, market_trends_cache
+    from app.core.pdf_extraction import pdf_extractor
+    from app.core.resume_cache import resume_cache
+    from app.core.security import password_hasher
+    from app.core.single_flight import single_flight
+    from app.core.tts_cache import tts_cache
+    return {
+        "agent_pool": agent_pool.stats(),
+        "agent_instances": agent_instances.stats(),
+        "llm_usage": usage_stats(),
+        "password_hashing": password_hasher.stats(),
+        "pdf_extraction": pdf_extractor.stats(),
+        "resume_cache": resume_cache.stats(),
+        "llm_cache": llm_cache.stats(),
+        "market_cache": market_trends_cache.stats(),
+        "career_market_cache": career_market_cache.stats(),
+        "career_jobs": career_jobs.stats(),
+        "single_flight": single_flight.stats(),
+        "interview_sessions": interview_sessions.stats(),
+        "tts_cache": tts_cache.stats(),
+    }
+
+
 # ── Root ──────────────────────────────────────────────────────────────────────
 @app.get("/", tags=["Root"])
 async def root():
@@ -6,11 +6,13 @@ Tables:
   - resumes         → Uploaded + parsed resumes
   - career_roadmaps → AI-generated learning roadmaps
   - interview_sessions → Mock interview history + scores
+  - interview_messages → Append-only interview transcript, one row per message
+  - career_analysis_jobs → Queued full career analyses + per-stage results
 """
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, String, Text
+from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -50,7 +52,9 @@ class Resume(Base):
     id              = Column(String, primary_key=True, default=_uuid)
     user_id         = Column(String, ForeignKey("users.id"), nullable=False)
     filename        = Column(String, nullable=False)
+    content_hash    = Column(String, nullable=True, index=True)  # sha256 of the uploaded PDF bytes
     parsed_content  = Column(JSON, nullable=True)   # AI analysis result stored as JSON
+    analysis_version = Column(String, nullable=True)  # analyst prompt version that produced parsed_content
     raw_text        = Column(Text, nullable=True)    # extracted plain text from PDF
     uploaded_at     = Column(DateTime(timezone=True), default=_now)
 
@@ -83,13 +87,57 @@ class InterviewSession(Base):
     id           = Column(String, primary_key=True, default=_uuid)
     user_id      = Column(String, ForeignKey("users.id"), nullable=False)
     target_role  = Column(String, nullable=False)
-    chat_history = Column(JSON, nullable=True)    # list of {role, content} dicts
+    chat_history = Column(JSON, nullable=True)    # legacy transcript blob — superseded by interview_messages
     score        = Column(Float, nullable=True)   # final score out of 100
     status       = Column(String, default="in_progress")  # in_progress | completed
     created_at   = Column(DateTime(timezone=True), default=_now)
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
     user = relationship("User", back_populates="interview_sessions")
+    messages = relationship("InterviewMessage", back_populates="session", cascade="all, delete",
+                            order_by="InterviewMessage.seq")
 
     def __repr__(self):
         return f"<InterviewSession id={self.id} role={self.target_role} score={self.score}>"
+
+
+# ── InterviewMessage ──────────────────────────────────────────────────────────
+class InterviewMessage(Base):
+    __tablename__ = "interview_messages"
+    __table_args__ = (
+        Index("ix_interview_messages_session_seq", "session_id", "seq", unique=True),
+    )
+
+    id         = Column(String, primary_key=True, default=_uuid)
+    session_id = Column(String, ForeignKey("interview_sessions.id"), nullable=False)
+    seq        = Column(Integer, nullable=False)   # 1-based position within the session
+    role       = Column(String, nullable=False)    # interviewer | candidate
+    content    = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=_now)
+
+    session = relationship("InterviewSession", back_populates="messages")
+
+    def __repr__(self):
+        return f"<InterviewMessage session_id={self.session_id} seq={self.seq} role={self.role}>"
+
+
+# ── CareerAnalysisJob ─────────────────────────────────────────────────────────
+class CareerAnalysisJob(Base):
+    __tablename__ = "career_analysis_jobs"
+
+    id            = Column(String, primary_key=True, default=_uuid)
+    user_id       = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    target_role   = Column(String, nullable=False)
+    location      = Column(String, nullable=False)
+    resume_text   = Column(Text, nullable=False)
+    status        = Column(String, default="queued", index=True)  # queued | running | completed | failed
+    stage_results = Column(JSON, nullable=True)   # {stage: {"output", "ms"}} as each stage finishes
+    result        = Column(JSON, nullable=True)   # FullAnalysisResponse once completed
+    error         = Column(Text, nullable=True)
+    created_at    = Column(DateTime(timezone=True), default=_now)
+    started_at    = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at  = Column(DateTime(timezone=True), nullable=True)  # refreshed by the running worker (its lease)
+    completed_at  = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<CareerAnalysisJob id={self.id} status={self.status}>"
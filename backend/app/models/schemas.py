@@ -102,3 +102,4 @@ class FullAnalysisResponse(BaseModel):
     market_trends: Any
     roadmap: Any
     agent_logs: List[dict]
+    stage_timings: Optional[dict] = None   # DAG pipeline only: resume_ms, market_ms, coach_ms, total_ms
@@ -1,24 +1,122 @@
-from duckduckgo_search import DDGS
+"""
+Market Search Tool — async, cached, multi-query web search for the Market Researcher.
 
-def search_job_trends(role: str, location: str) -> str:
+One tool call takes several queries, fans them out concurrently, dedupes the
+results and caches each normalized query for SEARCH_CACHE_TTL seconds. The
+search backend is swappable (`set_search_backend`) so tests can run against
+a local stand-in instead of DuckDuckGo.
+"""
+import asyncio
+import re
+import threading
+import time
+from typing import Annotated, Optional, Protocol
+
+from app.core.config import settings
+
+
+class SearchBackend(Protocol):
+    async def search(self, query: str, max_results: int) -> list[dict]:
+        """Return a list of {"title", "body", "href"} dicts."""
+        ...
+
+
+class DuckDuckGoBackend:
+    """Default backend — DDGS is blocking, so each query runs on a worker thread."""
+
+    async def search(self, query: str, max_results: int) -> list[dict]:
+        from duckduckgo_search import DDGS
+
+        return await asyncio.to_thread(lambda: list(DDGS().text(query, max_results=max_results) or []))
+
+
+_backend: SearchBackend = DuckDuckGoBackend()
+
+# normalized query → (stored_at, results). Plain dict + thread lock: the tool is
+# called from AutoGen worker threads (each with its own event loop) and from
+# the main loop, so asyncio primitives can't be shared here.
+_cache: dict[str, tuple[float, list[dict]]] = {}
+_cache_lock = threading.Lock()
+_CACHE_MAX_ENTRIES = 1000
+
+
+def set_search_backend(backend: SearchBackend) -> None:
+    """Swap the search backend (tests, alternative providers) and drop cached results."""
+    global _backend
+    _backend = backend
+    with _cache_lock:
+        _cache.clear()
+
+
+def _normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", query.lower()).strip()
+
+
+async def _cached_search(query: str, max_results: int) -> list[dict]:
+    key = _normalize_query(query)
+    now = time.monotonic()
+    with _cache_lock:
+        hit = _cache.get(key)
+    if hit and now - hit[0] < settings.SEARCH_CACHE_TTL:
+        return hit[1]
+
+    results = await _backend.search(key, max_results)
+    with _cache_lock:
+        _cache[key] = (now, results)
+        if len(_cache) > _CACHE_MAX_ENTRIES:
+            _cache.pop(next(iter(_cache)))
+    return results
+
+
+def _default_queries(role: str, location: str) -> list[str]:
+    return [
+        f"{role} jobs {location} salary",
+        f"top companies hiring {role} {location}",
+        f"{role} in-demand skills {location} hiring trend",
+    ]
+
+
+async def search_job_trends(
+    role: Annotated[str, "Target job role, e.g. 'Data Scientist'"],
+    location: Annotated[str, "Target location, e.g. 'Bangalore' or 'Remote'"],
+    queries: Annotated[
+        Optional[list[str]],
+        "Several targeted search queries to run in parallel (salary, hiring companies, in-demand skills). "
+        "Defaults to three standard queries for the role and location.",
+    ] = None,
+) -> str:
     """
-    Searches the web for job market trends, salaries, top skills, 
+    Searches the web for job market trends, salaries, top skills,
     and hiring companies for a specific role and location using DuckDuckGo.
+    All queries run concurrently; duplicate results are removed.
     """
-    query = f"{role} job market trends salary top skills hiring companies in {location}"
-    try:
-        results = DDGS().text(query, max_results=3)
-        
-        formatted_results = []
-        for res in results:
+    queries = [q for q in (queries or []) if q and q.strip()] or _default_queries(role, location)
+    # Same query phrased twice → searched once
+    queries = list({_normalize_query(q): q for q in queries}.values())
+    outcomes = await asyncio.gather(
+        *(_cached_search(q, settings.SEARCH_MAX_RESULTS) for q in queries),
+        return_exceptions=True,
+    )
+
+    formatted_results = []
+    errors = []
+    seen = set()
+    for query, outcome in zip(queries, outcomes):
+        if isinstance(outcome, Exception):
+            errors.append(f"{query}: {outcome}")
+            continue
+        for res in outcome:
+            dedupe_key = res.get("href") or (res.get("title"), res.get("body"))
+            if dedupe_key in seen:
+                continue
+            seen.add(dedupe_key)
             formatted_results.append(f"Title: {res.get('title')}\nSnippet: {res.get('body')}")
-            
-        combined = "\n\n".join(formatted_results)
-        
-        # If no results (unlikely) or error didn't throw
-        if not combined:
-            return "No recent search results found. Make an educated guess based on your knowledge."
-            
-        return combined
-    except Exception as e:
-        return f"Error performing web search: {e}. Please use your internal knowledge to provide the JSON."
+
+    combined = "\n\n".join(formatted_results)
+
+    if not combined:
+        if errors:
+            return f"Error performing web search: {'; '.join(errors)}. Please use your internal knowledge to provide the JSON."
+        return "No recent search results found. Make an educated guess based on your knowledge."
+
+    return combined
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core import database
+from app.core.database import AsyncSessionLocal, Base, get_db
+from app.models import models  # noqa: F401 — registers tables on Base
+
+TEST_USER_ID = "test-user"
+
+
+def _enforce_foreign_keys(dbapi_connection, _):
+    dbapi_connection.execute("PRAGMA foreign_keys = ON")
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    """
+    A throwaway SQLite database for one test, with foreign keys enforced and
+    a `test-user` row. AsyncSessionLocal is rebound to it, so get_db and the
+    code that opens its own sessions (resume stream, career jobs) use it too.
+    Yields the session factory.
+    """
+    path = tmp_path / "test.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(sync_engine)
+    with sync_engine.begin() as conn:
+        conn.execute(models.User.__table__.insert().values(
+            id=TEST_USER_ID, email="test-user@example.com", name="Test User", hashed_pw="x",
+        ))
+    sync_engine.dispose()
+
+    # NullPool: TestClient and asyncio.run each bring their own event loop
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    event.listen(async_engine.sync_engine, "connect", _enforce_foreign_keys)
+    AsyncSessionLocal.configure(bind=async_engine)
+
+    async def override_get_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    from app.main import app
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield AsyncSessionLocal
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        AsyncSessionLocal.configure(bind=database.async_engine)
+        asyncio.run(async_engine.dispose())
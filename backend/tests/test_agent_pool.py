@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+
+from app.agents.executor import AgentPool
+
+
+def test_pool_runs_blocking_calls_off_the_event_loop():
+    pool = AgentPool(max_workers=4, provider_limits={"groq": 2})
+    loop_thread = threading.get_ident()
+
+    def blocking_chat():
+        time.sleep(0.05)
+        return threading.get_ident()
+
+    async def main():
+        return await asyncio.gather(*(pool.submit(blocking_chat, provider="groq") for _ in range(4)))
+
+    worker_threads = asyncio.run(main())
+    pool.shutdown()
+
+    assert loop_thread not in worker_threads
+    stats = pool.stats()
+    assert stats["completed"] == 4
+    assert stats["queue_depth"] == 0
+    assert stats["running"] == 0
+
+
+def test_pool_respects_provider_limit():
+    pool = AgentPool(max_workers=8, provider_limits={"groq": 2})
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def chat():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.03)
+        with lock:
+            active -= 1
+
+    async def main():
+        await asyncio.gather(*(pool.submit(chat, provider="groq") for _ in range(6)))
+
+    asyncio.run(main())
+    pool.shutdown()
+
+    assert peak == 2
+    assert pool.stats()["max_wait_ms"] > 0
+
+
+def test_arun_agent_executes_tool_calls_then_returns_answer(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.agents import llm
+
+    def tool_call_message():
+        call = SimpleNamespace(id="call_1", function=SimpleNamespace(name="search", arguments='{"q": "sde"}'))
+        msg = SimpleNamespace(content=None, tool_calls=[call])
+        msg.model_dump = lambda exclude_none=True: {"role": "assistant", "tool_calls": [{"id": "call_1"}]}
+        return msg
+
+    replies = [tool_call_message(), SimpleNamespace(content='{"ok": true}', tool_calls=None)]
+    seen = []
+
+    async def create(**kwargs):
+        seen.append(kwargs["messages"])
+        return SimpleNamespace(choices=[SimpleNamespace(message=replies.pop(0))])
+
+    fake_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(llm, "get_async_client", lambda: fake_client)
+
+    agent = SimpleNamespace(system_message="sys", llm_config={"tools": [{"type": "function"}]})
+    executor = SimpleNamespace(function_map={"search": lambda q: f"results for {q}"})
+
+    reply = asyncio.run(llm.arun_agent(agent, "go", executor=executor))
+
+    assert reply == '{"ok": true}'
+    assert seen[1][-1] == {"role": "tool", "tool_call_id": "call_1", "content": "results for sde"}
+
+
+def test_agent_instances_reuse_pairs_and_discard_on_error(monkeypatch):
+    from app.agents import registry
+
+    class FakeAgent:
+        resets = 0
+
+        def reset(self):
+            self.resets += 1
+
+    monkeypatch.setitem(registry._AGENT_BUILDERS, "linkedin", lambda: (FakeAgent(), FakeAgent()))
+    pool = registry.AgentInstancePool(max_idle=1)
+    with pool.checkout("linkedin") as first:
+        pass
+    with pool.checkout("linkedin") as second:
+        assert second is first
+        assert all(agent.resets == 1 for agent in second)
+
+    try:
+        with pool.checkout("linkedin"):
+            raise RuntimeError("chat failed")
+    except RuntimeError:
+        pass
+
+    stats = pool.stats()["types"]["linkedin"]
+    assert stats["built"] == 1 and stats["reused"] == 2
+    assert stats["discarded"] == 1 and stats["idle"] == 0
+
+
+def test_run_one_shot_single_mode_returns_completion_with_usage(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.agents import executor, llm
+    from app.core.config import settings
+
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(
+            model="test-model",
+            choices=[SimpleNamespace(message=SimpleNamespace(content=' {"ok": true} '))],
+            usage=SimpleNamespace(prompt_tokens=12, completion_tokens=5, total_tokens=17),
+        )
+
+    fake_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(llm, "get_async_client", lambda: fake_client)
+    monkeypatch.setattr(settings, "AGENT_EXECUTION_MODES", "linkedin=single,career=async")
+    monkeypatch.setattr(settings, "LLM_CACHE_ENDPOINTS", "")
+    # The career GroupChat has no async path that stays inside the pool
+    assert settings.execution_mode("career") == "thread"
+
+    agent = SimpleNamespace(name="LinkedIn_Reviewer", system_message="sys")
+    completion = asyncio.run(executor.run_one_shot("linkedin", None, agent, "review", json_mode=True))
+
+    assert completion.content == '{"ok": true}'
+    assert completion.usage == {"prompt_tokens": 12, "completion_tokens": 5, "total_tokens": 17}
+    assert len(calls) == 1 and calls[0]["response_format"] == {"type": "json_object"}
+    assert [m["role"] for m in calls[0]["messages"]] == ["system", "user"]
@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+from app.core.llm_cache import LLMResponseCache, make_cache_key
+
+
+def test_llm_cache_key_depends_on_every_component():
+    base = make_cache_key("Resume_Analyst", "sys", [{"role": "user", "content": "hi"}], "m", 0.8)
+    assert base == make_cache_key("Resume_Analyst", "sys", [{"role": "user", "content": "hi"}], "m", 0.8)
+    assert base != make_cache_key("Resume_Analyst", "sys2", [{"role": "user", "content": "hi"}], "m", 0.8)
+    assert base != make_cache_key("Resume_Analyst", "sys", [{"role": "user", "content": "hi"}], "m", 0.2)
+
+
+def test_llm_cache_ttl_and_lru_eviction(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "cache.db"), ttl_seconds=60, max_entries=2)
+
+    async def main():
+        await cache.set("a", "agent", "A")
+        await cache.set("b", "agent", "B")
+        time.sleep(0.01)
+        assert await cache.get("a") == "A"      # "a" is now most recently used
+        await cache.set("c", "agent", "C")      # evicts "b"
+        return await cache.get("b"), await cache.get("c")
+
+    evicted, kept = asyncio.run(main())
+    assert evicted is None and kept == "C"
+    assert cache.stats()["evictions"] == 1
+
+    cache.ttl_seconds = 0
+    time.sleep(0.01)
+    assert asyncio.run(cache.get("c")) is None
+    assert cache.stats()["expired"] >= 1
+    cache.close()
+
+
+def test_market_cache_serves_stale_then_refreshes_in_background():
+    from app.core.market_cache import MarketTrendsCache, normalize_market_key
+
+    assert normalize_market_key("  Data  Scientist ", "Bengaluru") == normalize_market_key("data scientist", "bangalore")
+
+    cache = MarketTrendsCache(fresh_seconds=0, stale_seconds=60, max_entries=10)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"version": len(calls)}
+
+    async def main():
+        first = await cache.get_or_compute("SDE", "Bangalore", compute)
+        second = await cache.get_or_compute("sde", "bengaluru", compute)
+        await asyncio.sleep(0)        # let the background refresh run
+        await asyncio.sleep(0)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first == ({"version": 1}, "miss")
+    assert second == ({"version": 1}, "stale")
+    assert len(calls) == 2
+    assert cache.stats()["refreshes"] == 1
+
+
+def test_single_flight_coalesces_identical_concurrent_calls():
+    from app.core.single_flight import SingleFlight
+
+    flights = SingleFlight()
+    calls = []
+
+    async def compute(tag):
+        calls.append(tag)
+        await asyncio.sleep(0.05)
+        return {"tag": tag}
+
+    async def scenario():
+        same = [flights.do("market", ("sde", "bangalore"), lambda: compute("a")) for _ in range(5)]
+        other = flights.do("market", ("sde", "pune"), lambda: compute("b"))
+        results = await asyncio.gather(*same, other)
+        # Finished flights are not cached — the next call runs again
+        again = await flights.do("market", ("sde", "bangalore"), lambda: compute("c"))
+        return results, again
+
+    results, again = asyncio.run(scenario())
+
+    assert calls == ["a", "b", "c"]
+    assert all(r is results[0] for r in results[:5]) and results[5] == {"tag": "b"}
+    assert again == {"tag": "c"}
+    assert flights.stats()["market"] == {"leaders": 3, "coalesced": 4}
+
+
+def test_tts_cache_memory_lru_disk_cap_and_warm_up(tmp_path):
+    import os
+
+    from app.core.tts_cache import TTSCache, make_tts_key
+
+    assert make_tts_key("v", "**Next**  question.") == make_tts_key("v", "Next question.")
+    assert make_tts_key("v", "Next question.") != make_tts_key("w", "Next question.")
+
+    cache = TTSCache(str(tmp_path), memory_max_bytes=10, disk_max_bytes=15)
+
+    async def main():
+        await cache.set("v", "one", b"1" * 6)
+        await cache.set("v", "two", b"2" * 6)          # memory holds one 6-byte clip
+        assert await cache.get("v", "one") == b"1" * 6   # disk hit — "one" is now newest on disk
+        await cache.set("v", "three", b"3" * 6)        # disk over 15 bytes → least recent ("two") goes
+        return await cache.get("v", "one"), await cache.get("v", "two")
+
+    one, two = asyncio.run(main())
+    stats = cache.stats()
+
+    assert one == b"1" * 6 and two is None
+    assert stats["memory_hits"] == 0 and stats["disk_hits"] == 2
+    assert stats["disk_evictions"] == 1 and stats["disk_entries"] == 2 and stats["disk_bytes"] == 12
+    assert stats["memory_bytes"] <= 10
+
+    # a fresh process rebuilds the index from file mtimes and warms memory from it
+    os.utime(cache._path(make_tts_key("v", "three")), (1, 1))   # mtimes can tie within a tick
+    restarted = TTSCache(str(tmp_path), memory_max_bytes=10, disk_max_bytes=15)
+    assert asyncio.run(restarted.warm_up()) == 1
+    assert restarted.stats()["disk_bytes"] == 12
+    assert asyncio.run(restarted.get("v", "one")) == b"1" * 6   # most recent clip, from memory
+    assert restarted.stats()["memory_hits"] == 1 and restarted.stats()["warmed"] == 1
@@ -0,0 +1,221 @@
+import asyncio
+import json
+import time
+
+from app.agents import workflow
+
+
+def test_dag_pipeline_runs_resume_and_market_concurrently(monkeypatch):
+    seen = {}
+
+    async def resume_stage(resume_text):
+        await asyncio.sleep(0.2)
+        return json.dumps({"skill_gaps": ["Kubernetes"], "technical_skills": ["Python"]})
+
+    async def market_stage(role, location):
+        await asyncio.sleep(0.2)
+        return {"top_skills": ["Go"], "market_trend": "Growing"}
+
+    async def coach_stage(role, resume_analysis, market):
+        seen["gaps"] = resume_analysis["skill_gaps"]
+        seen["market"] = market
+        return '[{"week": 1, "topic": "Pods"}]'
+
+    monkeypatch.setattr(workflow, "_resume_stage", resume_stage)
+    monkeypatch.setattr(workflow, "_market_stage", market_stage)
+    monkeypatch.setattr(workflow, "_coach_stage", coach_stage)
+
+    started = time.perf_counter()
+    messages, timings = asyncio.run(workflow.arun_career_pipeline("resume", "SRE", "Remote"))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.35  # ≈ max(resume, market), not their sum
+    assert seen == {"gaps": ["Kubernetes"], "market": {"top_skills": ["Go"], "market_trend": "Growing"}}
+    assert [m["name"] for m in messages] == ["Resume_Analyst", "Market_Researcher", "Career_Coach"]
+    assert set(timings) == {"resume_ms", "market_ms", "coach_ms", "total_ms"}
+    assert timings["resume_ms"] >= 200 and timings["market_ms"] >= 200
+
+
+def test_dag_pipeline_tolerates_market_failure(monkeypatch):
+    async def resume_stage(resume_text):
+        return '{"skill_gaps": []}'
+
+    async def market_stage(role, location):
+        raise RuntimeError("search down")
+
+    async def coach_stage(role, resume_analysis, market):
+        assert market == {}
+        return "[]"
+
+    monkeypatch.setattr(workflow, "_resume_stage", resume_stage)
+    monkeypatch.setattr(workflow, "_market_stage", market_stage)
+    monkeypatch.setattr(workflow, "_coach_stage", coach_stage)
+
+    messages, _ = asyncio.run(workflow.arun_career_pipeline("resume", "SRE", "Remote"))
+    assert messages[1]["content"] == ""
+
+
+def test_full_analysis_job_is_queued_then_polled_to_completion(monkeypatch, test_db):
+    from types import SimpleNamespace
+
+    from fastapi.testclient import TestClient
+
+    from app.api import career
+    from app.api.deps import get_current_user
+    from app.core import career_jobs
+    from app.core.config import settings
+    from app.main import app
+    from app.models.schemas import FullAnalysisResponse
+
+    async def fake_analysis(resume_text, target_role, location, on_stage=None):
+        await on_stage("resume", '{"skill_gaps": ["Go"]}', 12.0)
+        return FullAnalysisResponse(
+            resume_analysis={"skill_gaps": ["Go"]}, market_trends={}, roadmap={"weeks": []}, agent_logs=[]
+        )
+
+    monkeypatch.setattr(settings, "TTS_CACHE_WARMUP", False)
+    monkeypatch.setattr(career, "run_career_analysis", fake_analysis)
+    monkeypatch.setattr(career_jobs, "career_jobs", career_jobs.CareerJobQueue(concurrency=1, max_queued=5))
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id="test-user")
+    try:
+        with TestClient(app) as client:
+            submitted = client.post(
+                "/career/full-analysis/jobs",
+                json={"target_role": "SRE", "resume_text": "Python, Linux", "location": "Remote"},
+            )
+            assert submitted.status_code == 202
+            job_id = submitted.json()["job_id"]
+
+            for _ in range(50):
+                job = client.get(f"/career/full-analysis/jobs/{job_id}").json()
+                if job["status"] in ("completed", "failed"):
+                    break
+                time.sleep(0.02)
+
+            assert job["status"] == "completed"
+            assert job["stage_results"]["resume"] == {"output": {"skill_gaps": ["Go"]}, "ms": 12.0}
+            assert job["result"]["resume_analysis"] == {"skill_gaps": ["Go"]}
+
+            events = client.get(f"/career/full-analysis/jobs/{job_id}/events")
+            assert events.text.startswith("event: completed\n")
+            assert client.get("/career/full-analysis/jobs/missing").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_dag_coach_stage_uses_the_groupchat_coach_contract(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.agents import executor, registry
+
+    prompts = []
+
+    async def fake_run_one_shot(endpoint, user_proxy, agent, message, json_mode=False, **kwargs):
+        prompts.append(message)
+        return SimpleNamespace(content="[]")
+
+    monkeypatch.setattr(executor, "run_one_shot", fake_run_one_shot)
+    monkeypatch.setitem(registry._AGENT_BUILDERS, "roadmap", lambda: (object(), object()))
+    # Private pool, so the fake agents are never handed to another test
+    monkeypatch.setattr(registry, "agent_instances", registry.AgentInstancePool(max_idle=1))
+
+    asyncio.run(workflow._coach_stage("SRE", {"skill_gaps": ["Go"]}, {"top_skills": ["K8s"]}))
+
+    assert workflow._COACH_INSTRUCTION in prompts[0]
+    # The keys (incl. skill_gap_addressed, learning_format, success_criteria) come from the coach's system message
+    assert "'week', 'topic'" not in prompts[0]
+
+
+def test_recovery_fails_only_jobs_whose_heartbeat_lapsed(test_db):
+    from datetime import datetime, timedelta, timezone
+
+    from app.core.career_jobs import CareerJobQueue
+    from app.models.models import CareerAnalysisJob
+
+    now = datetime.now(timezone.utc)
+    queue = CareerJobQueue(concurrency=1, max_queued=5, lease_seconds=60)
+
+    async def scenario():
+        async with test_db() as db:
+            for job_id, heartbeat in [("live", now), ("dead", now - timedelta(seconds=120))]:
+                db.add(CareerAnalysisJob(
+                    id=job_id, user_id="test-user", target_role="SRE", location="Remote",
+                    resume_text="x", status="running", heartbeat_at=heartbeat,
+                ))
+            await db.commit()
+        await queue.recover()
+        await queue.shutdown()
+        async with test_db() as db:
+            return (await db.get(CareerAnalysisJob, "live")).status, (await db.get(CareerAnalysisJob, "dead")).status
+
+    assert asyncio.run(scenario()) == ("running", "failed")
+    assert queue.stats()["orphaned"] == 1
+
+
+def test_groupchat_analysis_reports_a_final_stage(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.agents import executor
+    from app.api.career import run_career_analysis
+    from app.core.config import settings
+
+    messages = [
+        {"name": "User_Proxy", "content": "go"},
+        {"name": "Resume_Analyst", "content": '{"skill_gaps": ["Go"]}'},
+        {"name": "Career_Coach", "content": "[]"},
+    ]
+
+    async def submit(fn, *args):
+        return messages
+
+    stages = []
+
+    async def on_stage(stage, output, ms):
+        stages.append((stage, output))
+
+    monkeypatch.setattr(settings, "CAREER_PIPELINE", "groupchat")
+    monkeypatch.setattr(executor, "agent_pool", SimpleNamespace(submit=submit))
+
+    response = asyncio.run(run_career_analysis("Python", "SRE", "Remote", on_stage=on_stage))
+
+    assert response.resume_analysis == {"skill_gaps": ["Go"]}
+    assert stages == [("groupchat", {"agents": ["User_Proxy", "Resume_Analyst", "Career_Coach"], "messages": 3})]
+
+
+def test_subscribe_polls_jobs_run_elsewhere_and_times_out(test_db):
+    from sqlalchemy import update
+
+    from app.core.career_jobs import CareerJobQueue
+    from app.models.models import CareerAnalysisJob
+
+    async def scenario():
+        async with test_db() as db:
+            for job_id in ("elsewhere", "stuck"):
+                db.add(CareerAnalysisJob(
+                    id=job_id, user_id="test-user", target_role="SRE", location="Remote",
+                    resume_text="x", status="running", stage_results={},
+                ))
+            await db.commit()
+
+        # Another process finishes the job — this one is never notified
+        async def finish_elsewhere():
+            await asyncio.sleep(0.05)
+            async with test_db() as db:
+                await db.execute(
+                    update(CareerAnalysisJob).where(CareerAnalysisJob.id == "elsewhere").values(status="completed")
+                )
+                await db.commit()
+
+        queue = CareerJobQueue(concurrency=1, max_queued=5, poll_seconds=0.02, stream_timeout=5)
+        finisher = asyncio.create_task(finish_elsewhere())
+        polled = [event["status"] async for event in queue.subscribe("elsewhere")]
+        await finisher
+
+        queue.stream_timeout = 0.05
+        stuck = [event["status"] async for event in queue.subscribe("stuck")]
+        return polled, stuck
+
+    polled, stuck = asyncio.run(scenario())
+
+    assert polled == ["running", "completed"]
+    assert stuck == ["running", "timeout"]
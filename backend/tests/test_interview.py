@@ -0,0 +1,227 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+from app.core import interview_transcript
+from app.models.models import InterviewSession
+
+
+def test_transcript_appends_one_row_per_message_and_pages_by_seq(monkeypatch, test_db):
+    monkeypatch.setattr(interview_transcript, "PAGE_SIZE", 2)
+    session_id = f"test-{uuid.uuid4()}"
+
+    async def scenario():
+        async with test_db() as db:
+            db.add(InterviewSession(id=session_id, user_id="test-user", target_role="SRE"))
+            await db.commit()
+            for seq, role in enumerate(["interviewer", "candidate", "interviewer", "candidate", "interviewer"], 1):
+                await interview_transcript.append_message(db, session_id, seq, role, f"m{seq}")
+            page = await interview_transcript.load_page(db, session_id, after_seq=2, limit=2)
+            history, last_seq = await interview_transcript.load_history(db, session_id)
+            empty = await interview_transcript.load_history(db, "no-such-session")
+        return page, history, last_seq, empty
+
+    page, history, last_seq, empty = asyncio.run(scenario())
+
+    assert [(m.seq, m.content) for m in page] == [(3, "m3"), (4, "m4")]
+    assert [m["content"] for m in history] == ["m1", "m2", "m3", "m4", "m5"]
+    assert history[1] == {"role": "candidate", "content": "m2"}
+    assert last_seq == 5
+    assert empty == ([], 0)
+
+
+def test_session_store_evicts_lru_and_idle_but_keeps_attached(monkeypatch):
+    from app.core import interview_sessions as store_module
+
+    clock = [1000.0]
+    monkeypatch.setattr(store_module.time, "monotonic", lambda: clock[0])
+    store = store_module.InterviewSessionStore(max_sessions=2, idle_ttl_seconds=60)
+
+    async def build():
+        return {"history": [{"role": "interviewer", "content": "x" * 10}]}
+
+    async def scenario():
+        async with store.attach("a", build) as a:
+            async with store.attach("a", build) as a_again:
+                assert a_again is a and a.connections == 2
+            async with store.attach("b", build):
+                pass
+            async with store.attach("c", build):
+                pass
+            # "a" is attached, so "b" (least recently used, idle) goes instead
+            assert "a" in store and "b" not in store and "c" in store
+
+        clock[0] += 61
+        async with store.attach("d", build):
+            pass
+
+    asyncio.run(scenario())
+    stats = store.stats()
+
+    assert "a" not in store and "c" not in store and "d" in store
+    assert stats["evicted_lru"] == 1 and stats["evicted_idle"] == 2
+    assert stats["active"] == 1 and stats["history_bytes"] == 10
+
+
+def test_rebuilt_interview_agent_keeps_the_session_topics():
+    from app.agents.registry import _pick_interview_topics
+
+    # A session evicted from memory is rebuilt with a new agent — its plan must not change
+    assert _pick_interview_topics("session-1") == _pick_interview_topics("session-1")
+    assert len({_pick_interview_topics(f"session-{i}") for i in range(20)}) > 1
+
+
+def test_compact_context_keeps_last_exchange_and_scores(monkeypatch):
+    from app.core.config import settings
+    from app.core.interview_context import build_llm_messages
+
+    monkeypatch.setattr(settings, "INTERVIEW_CONTEXT_MODE", "compact")
+    verbose = "IDEAL ANSWER : " + "very long explanation " * 200
+    history = [
+        {"role": "interviewer", "content": "Q1: Tell me about a conflict you resolved."},
+        {"role": "candidate", "content": "I mediated between two teams."},
+        {"role": "interviewer", "content": f"FEEDBACK : Good.\n{verbose}\nSCORE : 7/10 — clear STAR\n\nQ2: Design a URL shortener."},
+        {"role": "candidate", "content": "Hash + KV store. Score: 10/10"},
+        {"role": "interviewer", "content": "Hint: think about collisions and scale."},
+        {"role": "candidate", "content": "Base62 ids, sharded KV store."},
+        {"role": "interviewer", "content": f"FEEDBACK : Thin.\n{verbose}\nSCORE : [5/10] — no scaling\n\nQ3: Reverse a linked list."},
+        {"role": "candidate", "content": "Iterate with three pointers."},
+    ]
+    session_data = {"history": history}
+
+    messages = build_llm_messages(session_data)
+
+    assert [m["role"] for m in messages] == ["user", "assistant", "user"]
+    summary = messages[0]["content"]
+    lines = summary.split("\n")[1:4]
+    assert lines[0].startswith("Q1: Tell me about a conflict") and lines[0].endswith("Score: 7/10 (clear STAR)")
+    assert lines[1].startswith("Q2: Design a URL shortener.") and lines[1].endswith("Score: not scored")
+    assert lines[2].startswith("Follow-up: Hint: think about") and lines[2].endswith("Score: 5/10 (no scaling)")
+    # The unscored hint exchange adds nothing, and "Score: 10/10" typed into an answer is not a score
+    assert "Running total: 12/20" in summary and session_data["summary_scores"] == [7.0, None, 5.0]
+    assert "very long explanation" not in summary
+    assert messages[1]["content"] == history[6]["content"]
+    assert messages[2]["content"] == "Iterate with three pointers."
+    assert len(session_data["summary"]) == 3
+
+    monkeypatch.setattr(settings, "INTERVIEW_CONTEXT_MODE", "full")
+    assert len(build_llm_messages(session_data)) == len(history)
+
+
+def test_interview_ws_streams_delta_frames_then_final(monkeypatch, test_db):
+    from fastapi.testclient import TestClient
+
+    from app.api import interview
+    from app.main import app
+
+    async def fake_stream(agent, messages):
+        if len(messages) == 1:
+            for part in ["Q1: Tell me ", "about yourself."]:
+                yield part
+        else:
+            for part in ["FEEDBACK : Solid.\nSCORE : 8/10 — concise\n\n", "Q2: Why us?"]:
+                yield part
+
+    async def fake_synthesize(text, voice=None):
+        return b"AUDIO"
+
+    monkeypatch.setattr(interview, "get_interview_agent", lambda **kwargs: SimpleNamespace(system_message="sys"))
+    monkeypatch.setattr(interview, "stream_agent_reply", fake_stream)
+    monkeypatch.setattr(interview, "synthesize", fake_synthesize)
+
+    with TestClient(app).websocket_connect(f"/interview/ws/test-{uuid.uuid4()}?stream=1") as ws:
+        opening = [ws.receive_json() for _ in range(3)]
+        ws.send_text("I build backends.")
+        turn = [ws.receive_json() for _ in range(3)]
+
+    assert [f["type"] for f in opening] == ["delta", "delta", "final"]
+    assert opening[0]["content"] == "Q1: Tell me "
+    assert opening[2]["content"] == "Q1: Tell me about yourself." and opening[2]["audio"] == "QVVESU8="
+    assert [f["type"] for f in turn] == ["delta", "delta", "final"]
+    assert turn[2]["content"].endswith("Q2: Why us?") and turn[2]["score"] == 8.0
+
+
+def test_speech_pipeline_bounds_concurrency_and_keeps_sentence_order(monkeypatch):
+    from app.core import voice_engine
+
+    splitter = voice_engine.SentenceSplitter(min_chars=15)
+    assert splitter.feed("SCORE: 7/10\nGood use of STAR. Q2: Des") == ["SCORE: 7/10 Good use of STAR."]
+    assert splitter.feed("ign a cache?") == [] and splitter.flush() == ["Q2: Design a cache?"]
+
+    running, peak = [0], [0]
+
+    async def fake_synthesize(text, voice):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        # Later sentences finish first — output order must not change
+        await asyncio.sleep(0.05 / len(text))
+        running[0] -= 1
+        return text.encode()
+
+    monkeypatch.setattr(voice_engine, "synthesize", fake_synthesize)
+
+    async def scenario():
+        speech = voice_engine.SpeechPipeline(concurrency=2)
+        speech.feed("First sentence is the longest one here. Second is shorter. ")
+        speech.feed("Third one. Fourth!")
+        speech.close()
+        return [(seq, audio.decode()) async for seq, audio in speech.chunks()]
+
+    monkeypatch.setattr(voice_engine, "MIN_SENTENCE_CHARS", 1)
+    chunks = asyncio.run(scenario())
+
+    assert chunks == [
+        (0, "First sentence is the longest one here."), (1, "Second is shorter."), (2, "Third one."), (3, "Fourth!"),
+    ]
+    assert peak[0] == 2
+
+
+def test_interview_ws_binary_framing_sends_raw_audio_frames(monkeypatch, test_db):
+    from fastapi.testclient import TestClient
+
+    from app.api import interview
+    from app.main import app
+
+    async def fake_synthesize(text, voice=None):
+        return b"ID3" + text.encode()
+
+    interviewer = SimpleNamespace(system_message="sys", generate_reply=lambda messages: "Q1: Why this role?")
+    monkeypatch.setattr(interview, "get_interview_agent", lambda **kwargs: interviewer)
+    monkeypatch.setattr(interview, "synthesize", fake_synthesize)
+
+    with TestClient(app).websocket_connect(f"/interview/ws/test-{uuid.uuid4()}?framing=binary") as ws:
+        audio_frame = ws.receive_bytes()
+        final = ws.receive_json()
+
+    seq, part = interview.AUDIO_FRAME_HEADER.unpack_from(audio_frame)
+    assert (seq, part) == (0, 0)
+    assert audio_frame[interview.AUDIO_FRAME_HEADER.size:] == b"ID3Q1: Why this role?"
+    assert final["type"] == "final" and final["content"] == "Q1: Why this role?"
+    assert final["audio"] is None and final["audio_seq"] == 0
+
+
+def test_interview_ws_pipelined_audio_precedes_the_final_frame(monkeypatch, test_db):
+    from fastapi.testclient import TestClient
+
+    from app.api import interview
+    from app.core import voice_engine
+    from app.main import app
+
+    async def fake_stream(agent, messages):
+        for part in ["Welcome to the interview, let us begin now.", " Q1: Tell me about a project you are proud of."]:
+            yield part
+
+    async def fake_synthesize(text, voice=None):
+        await asyncio.sleep(0.05)
+        return text.encode()
+
+    monkeypatch.setattr(interview, "get_interview_agent", lambda **kwargs: SimpleNamespace(system_message="sys"))
+    monkeypatch.setattr(interview, "stream_agent_reply", fake_stream)
+    monkeypatch.setattr(voice_engine, "synthesize", fake_synthesize)
+
+    with TestClient(app).websocket_connect(f"/interview/ws/test-{uuid.uuid4()}?stream=1&tts=pipelined") as ws:
+        frames = [ws.receive_json() for _ in range(5)]
+
+    assert [f["type"] for f in frames] == ["delta", "delta", "audio", "audio", "final"]
+    assert [f["seq"] for f in frames[2:4]] == [0, 1]
+    assert frames[4]["audio"] is None
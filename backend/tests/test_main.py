@@ -28,3 +28,10 @@ def test_market_trends_without_auth():
     response = client.get("/market/trends?role=Developer&location=Remote")
     assert response.status_code == 401
     assert response.json()["detail"] == "Not authenticated"
+
+def test_metrics_exposes_agent_pool():
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    pool = response.json()["agent_pool"]
+    assert "queue_depth" in pool
+    assert "avg_wait_ms" in pool
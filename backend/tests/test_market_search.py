@@ -0,0 +1,30 @@
+import asyncio
+
+from app.tools import market_search
+
+
+class StubBackend:
+    def __init__(self):
+        self.queries = []
+
+    async def search(self, query, max_results):
+        self.queries.append(query)
+        return [
+            {"title": "Shared posting", "body": "Python, SQL", "href": "https://jobs.example/1"},
+            {"title": f"Result for {query}", "body": "...", "href": f"https://jobs.example/{query}"},
+        ]
+
+
+def test_search_fans_out_dedupes_and_caches():
+    backend = StubBackend()
+    market_search.set_search_backend(backend)
+    try:
+        result = asyncio.run(market_search.search_job_trends("SDE", "Pune", queries=["sde salary pune", "SDE  Salary Pune", "sde skills"]))
+        again = asyncio.run(market_search.search_job_trends("SDE", "Pune", queries=["sde skills"]))
+    finally:
+        market_search.set_search_backend(market_search.DuckDuckGoBackend())
+
+    assert result.count("Shared posting") == 1
+    assert "Result for sde skills" in again
+    # duplicate normalized query + the repeated call are served from cache
+    assert sorted(backend.queries) == ["sde salary pune", "sde skills"]
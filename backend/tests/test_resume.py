@@ -0,0 +1,144 @@
+import asyncio
+import hashlib
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_current_user
+from app.main import app
+
+SAMPLE_PDF = Path(__file__).resolve().parent.parent / "sample_resume.pdf"
+
+
+@pytest.fixture
+def client(test_db):
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id="test-user")
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_upload_extracts_text_and_hashes_content(client):
+    pdf_bytes = SAMPLE_PDF.read_bytes()
+    response = client.post("/resume/upload", files={"file": ("resume.pdf", pdf_bytes, "application/pdf")})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["content_hash"] == hashlib.sha256(pdf_bytes).hexdigest()
+    assert data["char_count"] > 0
+
+
+def test_upload_rejects_oversized_file(client):
+    oversized = b"%PDF-1.4\n" + b"0" * (5 * 1024 * 1024)
+    response = client.post("/resume/upload", files={"file": ("big.pdf", oversized, "application/pdf")})
+    assert response.status_code == 400
+    assert "too large" in response.json()["detail"]
+
+
+def test_page_ranges_split_contiguously_in_order():
+    from app.core.pdf_extraction import _page_ranges
+
+    assert _page_ranges(1, 4) == [(0, 1)]
+    assert _page_ranges(7, 3) == [(0, 3), (3, 5), (5, 7)]
+
+
+def test_reupload_is_served_from_content_hash_cache(client):
+    from app.core.resume_cache import resume_cache
+
+    pdf_bytes = SAMPLE_PDF.read_bytes() + b"\n% cache-test"
+    first = client.post("/resume/upload", files={"file": ("resume.pdf", pdf_bytes, "application/pdf")})
+    hits_before = resume_cache.stats()["text_hits"]
+    second = client.post("/resume/upload", files={"file": ("resume.pdf", pdf_bytes, "application/pdf")})
+
+    assert second.json()["full_text"] == first.json()["full_text"]
+    assert resume_cache.stats()["text_hits"] == hits_before + 1
+
+
+def test_analyze_stream_sends_stats_then_fields(client, monkeypatch):
+    import json
+
+    from app.agents import executor, registry
+
+    async def fake_stream(endpoint, agent, message, json_mode=False):
+        for chunk in ['{"technical_skills": ["Python", "SQL"], "ats_', 'score": 71, "skill_gaps": ["K8s"]}']:
+            yield chunk
+
+    monkeypatch.setattr(executor, "stream_one_shot", fake_stream)
+    monkeypatch.setitem(registry._AGENT_BUILDERS, "resume", lambda: (object(), object()))
+
+    pdf_bytes = SAMPLE_PDF.read_bytes() + b"\n% stream-test"
+    response = client.post("/resume/analyze/stream", files={"file": ("resume.pdf", pdf_bytes, "application/pdf")})
+
+    assert response.status_code == 200
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    names = [lines[0].removeprefix("event: ") for lines in events]
+    payloads = [json.loads(lines[1].removeprefix("data: ")) for lines in events]
+
+    assert names == ["stats", "field", "field", "field", "done"]
+    assert payloads[0]["char_count"] > 0 and payloads[0]["cached"] is False
+    assert [p["key"] for p in payloads[1:4]] == ["technical_skills", "ats_score", "skill_gaps"]
+    assert payloads[2]["value"] == 71
+    assert payloads[4] == {"field_count": 3}
+
+
+def test_condense_resume_keeps_priority_sections_within_budget():
+    from app.core.resume_condense import condense_resume, count_tokens
+
+    filler = "\n".join(f"•   Volunteered   at community event number {i}" for i in range(300))
+    text = (
+        "Jane Roe\nPage 1 of 3\n\n"
+        "SUMMARY\nBackend engineer.\n\n"
+        f"Volunteering\n{filler}\n\n"
+        "Experience\n▪ Built payment APIs\n▪ Built payment APIs\n\n"
+        "Certifications\nAWS Solutions Architect\n\n"
+        "References available upon request\n"
+        "Skills:\nGo, Kafka, PostgreSQL\n"
+    )
+
+    condensed = condense_resume(text, token_budget=200)
+
+    assert count_tokens(condensed) <= 200
+    # Skills + certifications sat at the very end, after the filler — still kept
+    assert "SKILLS:\nGo, Kafka, PostgreSQL" in condensed
+    assert "AWS Solutions Architect" in condensed
+    assert condensed.count("- Built payment APIs") == 1
+    assert "Page 1 of 3" not in condensed and "References available" not in condensed
+    # Sections keep their document order
+    assert condensed.index("EXPERIENCE") < condensed.index("CERTIFICATIONS") < condensed.index("SKILLS")
+
+
+def test_extraction_timeout_recycles_the_process_pool():
+    from app.core.pdf_extraction import PDFExtractionTimeout, PDFExtractor
+
+    extractor = PDFExtractor(max_workers=1, timeout=0.001)
+    pdf_bytes = SAMPLE_PDF.read_bytes()
+
+    with pytest.raises(PDFExtractionTimeout):
+        asyncio.run(extractor.extract_text(pdf_bytes))
+    assert extractor.stats()["pool_recycles"] == 1 and extractor._executor is None
+
+    extractor.timeout = 30
+    try:
+        assert asyncio.run(extractor.extract_text(pdf_bytes))
+    finally:
+        extractor.shutdown()
+
+
+def test_resume_cache_lookup_is_scoped_to_the_user(test_db):
+    from app.core.resume_cache import resume_cache
+    from app.models.models import User
+
+    async def scenario():
+        async with test_db() as db:
+            db.add(User(id="other-user", email="other@example.com", name="Other", hashed_pw="x"))
+            await db.commit()
+            await resume_cache.store(db, user_id="other-user", filename="r.pdf", content_hash="h1", raw_text="secret")
+            return (
+                await resume_cache.lookup(db, "h1", "test-user"),
+                await resume_cache.lookup(db, "h1", "other-user"),
+            )
+
+    mine, theirs = asyncio.run(scenario())
+
+    assert mine is None
+    assert theirs.raw_text == "secret"
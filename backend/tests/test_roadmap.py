@@ -0,0 +1,70 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.agents.json_stream import JSONStreamParser
+from app.api.deps import get_current_user
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id="test-user")
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_json_stream_parser_emits_items_as_they_close():
+    parser = JSONStreamParser()
+    reply = 'Sure!\n```json\n[{"week": 1, "topic": "a, [b]"}, {"week": 2, "topic": "c \\"d\\""}]\n```'
+
+    emitted = []
+    for i in range(0, len(reply), 7):
+        emitted.append(parser.feed(reply[i:i + 7]))
+
+    items = [item for chunk in emitted for item in chunk]
+    assert items == [{"week": 1, "topic": "a, [b]"}, {"week": 2, "topic": 'c "d"'}]
+    # The first week is available before the second one has streamed in
+    first_chunk = next(i for i, chunk in enumerate(emitted) if chunk)
+    assert first_chunk < len(emitted) - 3
+    assert parser.done and parser.kind == "array"
+
+
+def test_json_stream_parser_yields_object_fields():
+    parser = JSONStreamParser()
+    items = parser.feed('{"ats_score": 72, "skills": ["sql", "go"], "gaps": {"k8s": 1}, "ok": true}')
+    assert items == [("ats_score", 72), ("skills", ["sql", "go"]), ("gaps", {"k8s": 1}), ("ok", True)]
+
+
+def test_roadmap_stream_emits_normalised_weeks(client, monkeypatch):
+    from app.agents import executor
+
+    async def fake_stream(endpoint, agent, message, json_mode=False):
+        for chunk in ['[{"week": 3, "title": "Joins", "hours": "10 hrs"},', ' {"topic": "Indexes"}]']:
+            yield chunk
+
+    monkeypatch.setattr(executor, "stream_one_shot", fake_stream)
+    from app.agents import registry
+    monkeypatch.setitem(registry._AGENT_BUILDERS, "roadmap", lambda: (object(), object()))
+
+    response = client.post(
+        "/roadmap/generate/stream", json={"target_role": "DBA", "skill_gaps": ["SQL"]}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    names = [lines[0].removeprefix("event: ") for lines in events]
+    payloads = [json.loads(lines[1].removeprefix("data: ")) for lines in events]
+
+    assert names == ["week", "week", "done"]
+    assert payloads[0]["week"] == 1 and payloads[0]["topic"] == "Joins" and payloads[0]["estimated_hours"] == 10
+    assert payloads[1]["week"] == 2 and payloads[1]["topic"] == "Indexes"
+    assert payloads[2] == {"target_role": "DBA", "week_count": 2}
+
+
+def test_roadmap_stream_rejects_empty_gaps_before_streaming(client):
+    response = client.post("/roadmap/generate/stream", json={"target_role": "DBA", "skill_gaps": [" "]})
+    assert response.status_code == 400
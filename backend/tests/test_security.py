@@ -0,0 +1,27 @@
+import asyncio
+
+from app.core.security import PasswordHasher, get_password_hash, needs_rehash
+
+
+def test_needs_rehash_detects_cost_change():
+    old_hash = get_password_hash("s3cret", rounds=4)
+    assert needs_rehash(old_hash, rounds=5)
+    assert not needs_rehash(old_hash, rounds=4)
+    assert not needs_rehash("not-a-bcrypt-hash", rounds=4)
+
+
+def test_password_hasher_round_trip_in_process_pool():
+    hasher = PasswordHasher(max_workers=1, rounds=4)
+
+    async def main():
+        hashed = await hasher.hash("s3cret")
+        return hashed, await hasher.verify("s3cret", hashed), await hasher.verify("wrong", hashed)
+
+    hashed, ok, bad = asyncio.run(main())
+    hasher.shutdown()
+
+    assert hashed.startswith("$2b$04$")
+    assert ok and not bad
+    stats = hasher.stats()
+    assert stats["operations"] == 3
+    assert stats["queue_depth"] == 0
@@ -199,7 +199,7 @@ function getCompanyInterviewStyle(companyName: string): string {
 
 export default function InterviewPage() {
     const [sessionId, setSessionId] = useState("");
-    const [messages, setMessages] = useState<{ role: string; content: string }[]>([]);
+    const [messages, setMessages] = useState<{ role: string; content: string; streaming?: boolean }[]>([]);
     const [inputVal, setInputVal] = useState("");
     const [isStarted, setIsStarted] = useState(false);
     const [isEnded, setIsEnded] = useState(false);
@@ -217,28 +217,58 @@ export default function InterviewPage() {
 
     const messagesEndRef = useRef<HTMLDivElement>(null);
     const currentAudioRef = useRef<HTMLAudioElement | null>(null);
+    const audioQueueRef = useRef<string[]>([]);
 
     useEffect(() => {
         messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
     }, [messages]);
 
+    // Binary audio frames are played from object URLs, which must be released
+    const releaseAudioSrc = (src: string) => {
+        if (src.startsWith("blob:")) {
+            URL.revokeObjectURL(src);
+        }
+    };
+
     const stopCurrentAudio = () => {
+        audioQueueRef.current.forEach(releaseAudioSrc);
+        audioQueueRef.current = [];
         const activeAudio = currentAudioRef.current;
         if (!activeAudio) return;
 
         activeAudio.pause();
         activeAudio.currentTime = 0;
+        releaseAudioSrc(activeAudio.src);
         activeAudio.src = "";
         currentAudioRef.current = null;
     };
 
-    const playIncomingAudio = async (audioBase64: string) => {
-        stopCurrentAudio();
+    const playNextQueuedAudio = () => {
+        const next = audioQueueRef.current.shift();
+        if (next) {
+            void playIncomingAudio(next, true);
+        }
+    };
+
+    // Sentence chunks of one reply arrive in order; play them back to back
+    const enqueueAudio = (src: string) => {
+        audioQueueRef.current.push(src);
+        if (!currentAudioRef.current) {
+            playNextQueuedAudio();
+        }
+    };
+
+    const playIncomingAudio = async (src: string, fromQueue = false) => {
+        if (!fromQueue) {
+            stopCurrentAudio();
+        }
 
-        const audio = new Audio(`data:audio/mp3;base64,${audioBase64}`);
+        const audio = new Audio(src);
         audio.onended = () => {
+            releaseAudioSrc(src);
             if (currentAudioRef.current === audio) {
                 currentAudioRef.current = null;
+                playNextQueuedAudio();
             }
         };
         currentAudioRef.current = audio;
@@ -250,6 +280,10 @@ export default function InterviewPage() {
                 return;
             }
             console.error("Audio play failed:", error);
+            if (currentAudioRef.current === audio) {
+                currentAudioRef.current = null;
+                playNextQueuedAudio();
+            }
         }
     };
 
@@ -274,9 +308,19 @@ export default function InterviewPage() {
         // Connect to WebSocket
         const apiUrl = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
         const wsUrl = apiUrl.replace("http://", "ws://").replace("https://", "wss://");
-        const socket = new WebSocket(`${wsUrl}/interview/ws/${id}?role=${encodeURIComponent(targetRole)}&company=${encodeURIComponent(targetCompany)}`);
+        const socket = new WebSocket(`${wsUrl}/interview/ws/${id}?role=${encodeURIComponent(targetRole)}&company=${encodeURIComponent(targetCompany)}&stream=1&tts=pipelined&framing=binary`);
+        socket.binaryType = "arraybuffer";
 
         socket.onmessage = (event) => {
+            if (event.data instanceof ArrayBuffer) {
+                // Binary audio frame: uint32 frame seq, uint16 clip index within the reply, then MP3 bytes
+                const part = new DataView(event.data).getUint16(4);
+                if (part === 0) {
+                    stopCurrentAudio();
+                }
+                enqueueAudio(URL.createObjectURL(new Blob([event.data.slice(6)], { type: "audio/mpeg" })));
+                return;
+            }
             const data = JSON.parse(event.data);
             if (data.role === "system" && data.content === "Interview Completed.") {
                 if (data.score !== undefined) {
@@ -286,10 +330,31 @@ export default function InterviewPage() {
                 setIsEnded(true);
                 return;
             }
+            if (data.type === "audio") {
+                if (data.seq === 0) {
+                    stopCurrentAudio();
+                }
+                enqueueAudio(`data:audio/mp3;base64,${data.audio}`);
+                return;
+            }
+            if (data.type === "delta") {
+                // Grow the in-progress interviewer message as tokens arrive
+                setMessages((prev) => {
+                    const last = prev[prev.length - 1];
+                    if (last?.streaming) {
+                        return [...prev.slice(0, -1), { ...last, content: last.content + data.content }];
+                    }
+                    return [...prev, { role: data.role, content: data.content, streaming: true }];
+                });
+                return;
+            }
             if (data.audio) {
-                void playIncomingAudio(data.audio);
+                void playIncomingAudio(`data:audio/mp3;base64,${data.audio}`);
             }
-            setMessages((prev) => [...prev, data]);
+            const message = { role: data.role, content: data.content };
+            setMessages((prev) =>
+                prev[prev.length - 1]?.streaming ? [...prev.slice(0, -1), message] : [...prev, message]
+            );
         };
 
         socket.onclose = () => {